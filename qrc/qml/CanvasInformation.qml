@@ -8,7 +8,7 @@ Item {
      property double radio: 0.8
      id: root
      width: 230*radio; height: 150*radio
-     visible: canvasInfomationVisible
+     visible: canvasInfo.infoVisible
      signal resetSignal()
 
      Rectangle{
@@ -20,8 +20,8 @@ Item {
         radius: 5
         Text {
             id: titleText
-            text: language?"画布信息":"Information"
-            font.pixelSize: language?22*radio:15*radio
+            text: canvasInfo.language?"画布信息":"Information"
+            font.pixelSize: canvasInfo.language?22*radio:15*radio
             font.bold: true
             anchors.top: parent.top
             anchors.topMargin: 15*radio
@@ -33,7 +33,7 @@ Item {
             width: 80*radio
             height: 30*radio
             anchors.left: titleText.right
-            anchors.leftMargin: language?30*radio:30*radio
+            anchors.leftMargin: canvasInfo.language?30*radio:30*radio
             anchors.top: parent.top
             anchors.topMargin: 8*radio
             border.color: Qt.rgba(0,0,0,0.01)
@@ -60,12 +60,12 @@ Item {
 
             Text{
                 id: resetText
-                font.pixelSize: language?20*radio:15*radio
+                font.pixelSize: canvasInfo.language?20*radio:15*radio
                 anchors.left: resetImage.right
                 anchors.leftMargin: 5*radio
                 anchors.top: parent.top
                 anchors.topMargin: 5*radio
-                text: language?"重置":"Reset"
+                text: canvasInfo.language?"重置":"Reset"
             }
 
             MouseArea{
@@ -100,7 +100,7 @@ Item {
 
         Text {
             id: posXText
-            text: canvas_posX+","+canvas_posY
+            text: canvasInfo.posX+","+canvasInfo.posY
             font.pixelSize: 20*radio
             font.bold: true
             anchors.top: posImage.top
@@ -121,7 +121,7 @@ Item {
 
         Text {
             id: angleText
-            text: canvas_rotate+"°"
+            text: canvasInfo.rotate+"°"
             font.pixelSize: 20*radio
             font.bold: true
             anchors.top: angleImage.top
@@ -143,7 +143,7 @@ Item {
 
         Text {
             id: scaleText
-            text: canvas_scale+"x"
+            text: canvasInfo.scale+"x"
             font.pixelSize: 20*radio
             font.bold: true
             anchors.top: scaleImage.top
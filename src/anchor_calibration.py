@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnchorCalibration - 基站自标定
+在采集窗口内累计基站之间的测距，用经典MDS求初始坐标，
+再用加权SMACOF（应力最小化）做最小二乘细化，并给出每对基站的残差。
+坐标按约定对齐：基站0在原点，基站1在+X轴上，基站2在+Y一侧
+"""
+
+import numpy as np
+
+MAX_ANCHORS = 64  # 支持的基站数量
+
+
+class RangeCollector:
+    """累计基站之间的测距，每次更新O(1)"""
+
+    def __init__(self, maxAnchors=MAX_ANCHORS):
+        self._sum = np.zeros((maxAnchors, maxAnchors))
+        self._sumSq = np.zeros((maxAnchors, maxAnchors))
+        self._count = np.zeros((maxAnchors, maxAnchors), dtype=np.int64)
+        self._anchorCount = 0
+
+    def addRange(self, i, j, r):
+        """加入基站i和j之间的一次测距（米）"""
+        n = len(self._count)
+        if i == j or not (0 <= i < n and 0 <= j < n) or not np.isfinite(r) or r <= 0:
+            return
+        a, b = min(i, j), max(i, j)
+        self._sum[a, b] += r
+        self._sumSq[a, b] += r * r
+        self._count[a, b] += 1
+        self._anchorCount = max(self._anchorCount, b + 1)
+
+    def anchorCount(self):
+        """出现过的基站数量（最大下标+1）"""
+        return self._anchorCount
+
+    def samples(self):
+        """测距总次数"""
+        return int(self._count.sum())
+
+    def matrices(self):
+        """返回 (平均测距矩阵, 权重矩阵)，没有测距的基站对距离为NaN、权重为0"""
+        n = self._anchorCount
+        count = self._count[:n, :n]
+        count = count + count.T
+        total = self._sum[:n, :n] + self._sum[:n, :n].T
+        totalSq = self._sumSq[:n, :n] + self._sumSq[:n, :n].T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            var = totalSq / count - mean * mean
+        mean[count == 0] = np.nan
+        # 测距次数越多、抖动越小的基站对权重越大
+        weights = np.where(count > 0, count / (np.maximum(var, 0) + 1e-4), 0.0)
+        if weights.max() > 0:
+            weights = weights / weights.max()
+        np.fill_diagonal(mean, 0.0)
+        np.fill_diagonal(weights, 0.0)
+        return mean, weights
+
+
+class CalibrationResult:
+    """自标定结果"""
+    def __init__(self):
+        self.success = False
+        self.message = ""
+        self.positions = None  # (N, 3) 基站坐标
+        self.residuals = None  # (N, N) 测距残差（米），没有测距的基站对为NaN
+        self.rms = float("nan")  # 全部基站对残差的均方根
+        self.anchorRms = None  # (N,) 每个基站的残差均方根
+
+
+def _shortestPaths(D):
+    """用Floyd-Warshall补全缺失的距离，作为MDS的输入"""
+    n = len(D)
+    G = np.where(np.isfinite(D), D, np.inf)
+    np.fill_diagonal(G, 0.0)
+    for k in range(n):
+        G = np.minimum(G, G[:, k:k + 1] + G[k:k + 1, :])
+    return G
+
+
+def classicalMds(D, dims=2):
+    """经典MDS：对双中心化的平方距离矩阵做特征分解"""
+    n = len(D)
+    J = np.eye(n) - np.ones((n, n)) / n
+    B = -0.5 * J @ (D * D) @ J
+    values, vectors = np.linalg.eigh(B)
+    order = np.argsort(values)[::-1][:dims]
+    return vectors[:, order] * np.sqrt(np.maximum(values[order], 0.0))
+
+
+def smacof(X, D, W, iterations=300, tolerance=1e-9):
+    """加权SMACOF：最小化 sum w_ij (|x_i - x_j| - d_ij)^2"""
+    n = len(X)
+    D = np.where(W > 0, D, 0.0)
+    V = -W.copy()
+    np.fill_diagonal(V, W.sum(axis=1))
+    Vinv = np.linalg.pinv(V)
+
+    def stress(X):
+        dist = np.sqrt(((X[:, None, :] - X[None, :, :]) ** 2).sum(-1))
+        return float((W * (dist - D) ** 2).sum() / 2), dist
+
+    s, dist = stress(X)
+    for _ in range(iterations):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.where(dist > 1e-12, W * D / dist, 0.0)
+        B = -ratio
+        np.fill_diagonal(B, ratio.sum(axis=1) - np.diag(ratio))
+        X = Vinv @ B @ X
+        sNew, dist = stress(X)
+        if s - sNew < tolerance * max(s, 1e-12):
+            s = sNew
+            break
+        s = sNew
+    return X
+
+
+def _align(X):
+    """对齐坐标：基站0在原点，基站1在+X轴，基站2在+Y一侧"""
+    X = X - X[0]
+    if len(X) > 1:
+        angle = np.arctan2(X[1, 1], X[1, 0])
+        c, s = np.cos(-angle), np.sin(-angle)
+        X = X @ np.array([[c, s], [-s, c]])
+    if len(X) > 2 and X[2, 1] < 0:
+        X[:, 1] = -X[:, 1]
+    return X
+
+
+def calibrateAnchors(ranges, weights=None, heights=None):
+    """
+    由基站之间的测距求解基站坐标
+    ranges: (N, N) 测距矩阵，NaN表示缺失；weights: (N, N) 权重
+    heights: (N,) 已知的基站高度，用于把斜距换算为水平距离，默认全部相同
+    """
+    result = CalibrationResult()
+    D = np.array(ranges, dtype=float)
+    n = len(D)
+    if n < 3:
+        result.message = "need at least 3 anchors"
+        return result
+
+    W = np.where(np.isfinite(D), 1.0, 0.0) if weights is None else np.array(weights, dtype=float)
+    np.fill_diagonal(W, 0.0)
+    z = np.zeros(n) if heights is None else np.asarray(heights, dtype=float)
+
+    # 斜距换算为水平距离
+    dz = z[:, None] - z[None, :]
+    with np.errstate(invalid="ignore"):
+        H = np.sqrt(np.maximum(D * D - dz * dz, 0.0))
+    H[~np.isfinite(D)] = np.nan
+
+    # 连通性检查：每个基站至少与两个基站有测距
+    links = (W > 0).sum(axis=1)
+    if np.any(links < 2):
+        missing = np.flatnonzero(links < 2).tolist()
+        result.message = f"anchors {missing} have fewer than 2 ranges"
+        return result
+
+    full = _shortestPaths(H)
+    if not np.all(np.isfinite(full)):
+        result.message = "anchor range graph is not connected"
+        return result
+
+    X = classicalMds(full, 2)
+    X = smacof(X, np.nan_to_num(H), W)
+    X = _align(X)
+
+    dist = np.sqrt(((X[:, None, :] - X[None, :, :]) ** 2).sum(-1) + dz * dz)
+    residuals = np.where(W > 0, dist - D, np.nan)
+    with np.errstate(invalid="ignore"):
+        anchorRms = np.sqrt(np.nanmean(residuals ** 2, axis=1))
+
+    result.positions = np.column_stack([X, z])
+    result.residuals = residuals
+    result.anchorRms = anchorRms
+    result.rms = float(np.sqrt(np.nanmean(residuals[np.triu_indices(n, 1)] ** 2)))
+    result.success = True
+    return result
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AnchorHealthMonitor - 基站健康监测
+按基站和基站-标签对流式统计上报速率、接收功率和残差的EWMA及分位数（定长直方图）、
+测距相对解算位置的残差以及距上次上报的时间。
+所有统计量保存在预先分配的定长数组中，每次上报的更新为O(1)
+"""
+
+import time
+
+import numpy as np
+
+MAX_ANCHORS = 64  # 支持的基站数量
+MAX_TAGS = 256  # 同时统计的标签数量
+
+RX_MIN_DBM = -120.0  # 接收功率直方图范围
+RX_MAX_DBM = -40.0
+RX_BIN_DBM = 1.0
+PAIR_RX_BIN_DBM = 4.0  # 基站-标签对的接收功率直方图分辨率，对数较多，用较粗的分箱
+PAIR_RESIDUAL_BIN = 0.1  # 基站-标签对的残差绝对值直方图分辨率（米）
+PAIR_RESIDUAL_MAX = 2.0  # 残差绝对值直方图上限（米），更大的值计入最后一格
+
+
+def _histPercentile(hist, lo, width, q):
+    """由直方图估计分位数，没有样本时为NaN"""
+    total = hist.sum()
+    if total == 0:
+        return float("nan")
+    b = int(np.searchsorted(np.cumsum(hist), q * total))
+    return lo + (b + 0.5) * width
+
+
+class AnchorHealth:
+    """单个基站的健康状态快照"""
+    def __init__(self):
+        self.anchorIdx = 0  # 基站下标（基站表格行）
+        self.reports = 0  # 累计上报次数
+        self.rate = 0.0  # 上报速率（次/秒）
+        self.rxPower = 0.0  # 接收功率EWMA（dBm）
+        self.rxP10 = 0.0  # 接收功率10%分位数（dBm）
+        self.rxP50 = 0.0
+        self.residual = 0.0  # 测距残差EWMA（米）
+        self.absResidual = 0.0  # 测距残差绝对值EWMA（米）
+        self.sinceLast = float("inf")  # 距上次上报的时间（秒）
+        self.dropouts = 0  # 上报中断次数
+        self.problems = []  # 异常项："dropout"、"rate"、"rx"、"residual"
+        self.healthy = True
+
+
+class AnchorHealthMonitor:
+    """基站健康监测器"""
+
+    ALPHA = 0.1  # EWMA系数
+    DROPOUT_TIMEOUT = 2.0  # 超过该时间没有上报视为中断（秒）
+    MIN_RATE = 1.0  # 低于该速率视为异常（次/秒）
+    MIN_RX_POWER = -100.0  # 接收功率EWMA低于该值视为异常（dBm）
+    MAX_ABS_RESIDUAL = 0.5  # 残差绝对值EWMA高于该值视为异常（米）
+
+    def __init__(self, maxAnchors=MAX_ANCHORS, maxTags=MAX_TAGS, clock=time.monotonic):
+        self._maxAnchors = maxAnchors
+        self._maxTags = maxTags
+        self._clock = clock
+        self._tagSlots = {}  # tag_id -> 数组下标
+
+        bins = int((RX_MAX_DBM - RX_MIN_DBM) / RX_BIN_DBM)
+        self._rxBins = bins
+
+        # 基站统计
+        self._anchorPos = np.full((maxAnchors, 3), np.nan)
+        self._reports = np.zeros(maxAnchors, dtype=np.int64)
+        self._lastTime = np.full(maxAnchors, np.nan)
+        self._interval = np.full(maxAnchors, np.nan)  # 上报间隔EWMA
+        self._rx = np.full(maxAnchors, np.nan)
+        self._rxHist = np.zeros((maxAnchors, bins), dtype=np.int64)
+        self._residual = np.zeros(maxAnchors)
+        self._absResidual = np.zeros(maxAnchors)
+        self._dropouts = np.zeros(maxAnchors, dtype=np.int64)
+
+        # 基站-标签对统计
+        self._tagPos = np.full((maxTags, 3), np.nan)
+        self._pairReports = np.zeros((maxAnchors, maxTags), dtype=np.int64)
+        self._pairLastTime = np.full((maxAnchors, maxTags), np.nan)
+        self._pairInterval = np.full((maxAnchors, maxTags), np.nan)
+        self._pairRx = np.full((maxAnchors, maxTags), np.nan)
+        self._pairResidual = np.zeros((maxAnchors, maxTags))
+        self._pairRxBins = int((RX_MAX_DBM - RX_MIN_DBM) / PAIR_RX_BIN_DBM)
+        self._pairResBins = int(PAIR_RESIDUAL_MAX / PAIR_RESIDUAL_BIN)
+        self._pairRxHist = np.zeros((maxAnchors, maxTags, self._pairRxBins), dtype=np.int32)
+        self._pairResHist = np.zeros((maxAnchors, maxTags, self._pairResBins), dtype=np.int32)
+
+    # ========== 输入 ==========
+
+    def _tagSlot(self, tag_id):
+        """获取标签的数组下标，标签数超出上限时返回None"""
+        slot = self._tagSlots.get(tag_id)
+        if slot is None and len(self._tagSlots) < self._maxTags:
+            slot = len(self._tagSlots)
+            self._tagSlots[tag_id] = slot
+        return slot
+
+    def setAnchorPosition(self, anc_idx, x, y, z):
+        """设置基站位置"""
+        if 0 <= anc_idx < self._maxAnchors:
+            self._anchorPos[anc_idx] = (x, y, z)
+
+    def setTagPosition(self, tag_id, x, y, z):
+        """设置标签解算位置，用于计算测距残差"""
+        slot = self._tagSlot(tag_id)
+        if slot is not None:
+            self._tagPos[slot] = (x, y, z)
+
+    def reportRange(self, anc_idx, tag_id, range_val, rx_power, t=None):
+        """记录一次测距上报"""
+        if not 0 <= anc_idx < self._maxAnchors:
+            return
+        slot = self._tagSlot(tag_id)
+        if t is None:
+            t = self._clock()
+        a = self.ALPHA
+
+        # 上报间隔和中断
+        last = self._lastTime[anc_idx]
+        if not np.isnan(last):
+            dt = t - last
+            if dt > self.DROPOUT_TIMEOUT:
+                self._dropouts[anc_idx] += 1
+            elif dt > 0:
+                prev = self._interval[anc_idx]
+                self._interval[anc_idx] = dt if np.isnan(prev) else prev + a * (dt - prev)
+        self._lastTime[anc_idx] = t
+        self._reports[anc_idx] += 1
+
+        # 接收功率
+        if rx_power is not None and np.isfinite(rx_power):
+            prev = self._rx[anc_idx]
+            self._rx[anc_idx] = rx_power if np.isnan(prev) else prev + a * (rx_power - prev)
+            b = int((rx_power - RX_MIN_DBM) / RX_BIN_DBM)
+            self._rxHist[anc_idx, min(max(b, 0), self._rxBins - 1)] += 1
+
+        # 测距残差
+        residual = np.nan
+        if slot is not None:
+            tp = self._tagPos[slot]
+            ap = self._anchorPos[anc_idx]
+            if not (np.isnan(tp[0]) or np.isnan(ap[0])):
+                dx = tp[0] - ap[0]
+                dy = tp[1] - ap[1]
+                dz = tp[2] - ap[2]
+                residual = range_val - (dx * dx + dy * dy + dz * dz) ** 0.5
+                self._residual[anc_idx] += a * (residual - self._residual[anc_idx])
+                self._absResidual[anc_idx] += a * (abs(residual) - self._absResidual[anc_idx])
+
+        if slot is None:
+            return
+
+        # 基站-标签对
+        last = self._pairLastTime[anc_idx, slot]
+        if not np.isnan(last) and 0 < t - last <= self.DROPOUT_TIMEOUT:
+            dt = t - last
+            prev = self._pairInterval[anc_idx, slot]
+            self._pairInterval[anc_idx, slot] = dt if np.isnan(prev) else prev + a * (dt - prev)
+        self._pairLastTime[anc_idx, slot] = t
+        self._pairReports[anc_idx, slot] += 1
+        if rx_power is not None and np.isfinite(rx_power):
+            prev = self._pairRx[anc_idx, slot]
+            self._pairRx[anc_idx, slot] = rx_power if np.isnan(prev) else prev + a * (rx_power - prev)
+            b = int((rx_power - RX_MIN_DBM) / PAIR_RX_BIN_DBM)
+            self._pairRxHist[anc_idx, slot, min(max(b, 0), self._pairRxBins - 1)] += 1
+        if not np.isnan(residual):
+            self._pairResidual[anc_idx, slot] += a * (residual - self._pairResidual[anc_idx, slot])
+            b = int(abs(residual) / PAIR_RESIDUAL_BIN)
+            self._pairResHist[anc_idx, slot, min(b, self._pairResBins - 1)] += 1
+
+    def reset(self, anc_idx=None):
+        """清除统计（anc_idx为None时清除全部）"""
+        rows = slice(None) if anc_idx is None else anc_idx
+        self._reports[rows] = 0
+        self._lastTime[rows] = np.nan
+        self._interval[rows] = np.nan
+        self._rx[rows] = np.nan
+        self._rxHist[rows] = 0
+        self._residual[rows] = 0.0
+        self._absResidual[rows] = 0.0
+        self._dropouts[rows] = 0
+        self._pairReports[rows] = 0
+        self._pairLastTime[rows] = np.nan
+        self._pairInterval[rows] = np.nan
+        self._pairRx[rows] = np.nan
+        self._pairResidual[rows] = 0.0
+        self._pairRxHist[rows] = 0
+        self._pairResHist[rows] = 0
+
+    # ========== 查询 ==========
+
+    def _rxPercentile(self, anc_idx, q):
+        """由接收功率直方图估计分位数"""
+        return _histPercentile(self._rxHist[anc_idx], RX_MIN_DBM, RX_BIN_DBM, q)
+
+    def anchorHealth(self, anc_idx, now=None):
+        """获取基站健康状态"""
+        if now is None:
+            now = self._clock()
+        h = AnchorHealth()
+        h.anchorIdx = anc_idx
+        h.reports = int(self._reports[anc_idx])
+        interval = self._interval[anc_idx]
+        h.rate = 0.0 if np.isnan(interval) or interval <= 0 else float(1.0 / interval)
+        h.rxPower = float(self._rx[anc_idx])
+        h.rxP10 = self._rxPercentile(anc_idx, 0.1)
+        h.rxP50 = self._rxPercentile(anc_idx, 0.5)
+        h.residual = float(self._residual[anc_idx])
+        h.absResidual = float(self._absResidual[anc_idx])
+        last = self._lastTime[anc_idx]
+        h.sinceLast = float("inf") if np.isnan(last) else float(now - last)
+        h.dropouts = int(self._dropouts[anc_idx])
+        if h.sinceLast > self.DROPOUT_TIMEOUT:
+            h.problems.append("dropout")
+        if h.reports > 1 and h.rate < self.MIN_RATE:
+            h.problems.append("rate")
+        if h.rxPower < self.MIN_RX_POWER:
+            h.problems.append("rx")
+        if h.absResidual > self.MAX_ABS_RESIDUAL:
+            h.problems.append("residual")
+        h.healthy = not h.problems
+        return h
+
+    def activeAnchors(self):
+        """有过上报的基站下标"""
+        return np.flatnonzero(self._reports > 0).tolist()
+
+    def summary(self, now=None):
+        """所有有过上报的基站的健康状态"""
+        if now is None:
+            now = self._clock()
+        return [self.anchorHealth(i, now) for i in self.activeAnchors()]
+
+    def unhealthyAnchors(self, now=None):
+        """异常基站的健康状态"""
+        return [h for h in self.summary(now) if not h.healthy]
+
+    def pairStats(self, anc_idx, tag_id, now=None):
+        """基站-标签对的统计 (上报次数, 速率, 接收功率EWMA, 残差EWMA, 距上次上报的时间)"""
+        slot = self._tagSlots.get(tag_id)
+        if slot is None or not 0 <= anc_idx < self._maxAnchors:
+            return None
+        if now is None:
+            now = self._clock()
+        interval = self._pairInterval[anc_idx, slot]
+        rate = 0.0 if np.isnan(interval) or interval <= 0 else float(1.0 / interval)
+        last = self._pairLastTime[anc_idx, slot]
+        since = float("inf") if np.isnan(last) else float(now - last)
+        return (int(self._pairReports[anc_idx, slot]), rate, float(self._pairRx[anc_idx, slot]),
+                float(self._pairResidual[anc_idx, slot]), since)
+
+    def pairPercentiles(self, anc_idx, tag_id):
+        """基站-标签对的分位数 (接收功率P10, 接收功率P50, 残差绝对值P50, 残差绝对值P95)，没有样本的项为NaN"""
+        slot = self._tagSlots.get(tag_id)
+        if slot is None or not 0 <= anc_idx < self._maxAnchors:
+            return None
+        rxHist = self._pairRxHist[anc_idx, slot]
+        resHist = self._pairResHist[anc_idx, slot]
+        return (_histPercentile(rxHist, RX_MIN_DBM, PAIR_RX_BIN_DBM, 0.1),
+                _histPercentile(rxHist, RX_MIN_DBM, PAIR_RX_BIN_DBM, 0.5),
+                _histPercentile(resHist, 0.0, PAIR_RESIDUAL_BIN, 0.5),
+                _histPercentile(resHist, 0.0, PAIR_RESIDUAL_BIN, 0.95))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AppLogging - 应用程序日志配置
+各线程只把日志记录放入队列（QueueHandler），由QueueListener的后台线程写文件和控制台，
+GUI线程不等待磁盘；日志文件按大小和时间轮转，轮转出的文件可压缩为.gz
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import time
+
+LOG_FILE = os.environ.get("UWB_LOG_FILE", "rtl_display.log")
+LOG_MAX_BYTES = int(os.environ.get("UWB_LOG_MAX_BYTES", str(10 * 1024 * 1024)))  # 单个文件上限，0表示不按大小轮转
+LOG_ROTATE_HOURS = float(os.environ.get("UWB_LOG_ROTATE_HOURS", "24"))  # 轮转周期（小时），0表示不按时间轮转
+LOG_BACKUP_COUNT = int(os.environ.get("UWB_LOG_BACKUPS", "10"))  # 保留的轮转文件数量
+LOG_COMPRESS = os.environ.get("UWB_LOG_COMPRESS", "1") != "0"  # 是否压缩轮转出的文件
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener = None
+_queueHandler = None
+
+
+class RotatingLogFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    按大小和时间轮转的日志文件：超过maxBytes或到达轮转时刻时轮转，
+    轮转文件为 name.1、name.2 ...（压缩时为 name.1.gz ...），数字越大越旧
+    """
+
+    def __init__(self, filename, maxBytes=LOG_MAX_BYTES, rotateHours=LOG_ROTATE_HOURS,
+                 backupCount=LOG_BACKUP_COUNT, compress=LOG_COMPRESS):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding="utf-8", delay=True)
+        self.interval = rotateHours * 3600.0
+        self.rolloverAt = self._nextRollover(time.time())
+        if compress:
+            self.namer = self._gzipName
+            self.rotator = self._gzipRotate
+
+    def _nextRollover(self, now):
+        """下一个轮转时刻：从当天零点起按周期对齐"""
+        if self.interval <= 0:
+            return float("inf")
+        local = time.localtime(now)
+        midnight = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+        periods = int((now - midnight) // self.interval) + 1
+        return midnight + periods * self.interval
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rolloverAt:
+            # 空文件不轮转（例如整个周期没有日志），只推进轮转时刻
+            if not os.path.exists(self.baseFilename) or os.path.getsize(self.baseFilename) == 0:
+                self.rolloverAt = self._nextRollover(time.time())
+                return False
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rolloverAt = self._nextRollover(time.time())
+
+    @staticmethod
+    def _gzipName(name):
+        return name + ".gz"
+
+    @staticmethod
+    def _gzipRotate(source, dest):
+        """压缩轮转出的文件（在日志线程中进行）"""
+        try:
+            with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(source)
+        except OSError as e:
+            print(f"Error compressing log file {source}: {e}")
+
+
+def setupLogging(filename=LOG_FILE, level=logging.INFO, console=True):
+    """
+    配置根日志：根日志只挂QueueHandler，文件和控制台输出在QueueListener线程中进行
+    返回QueueListener，程序退出前调用shutdownLogging()写完队列中的日志
+    """
+    global _listener, _queueHandler
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = []
+    try:
+        fileHandler = RotatingLogFileHandler(filename)
+        fileHandler.setFormatter(formatter)
+        handlers.append(fileHandler)
+    except OSError as e:
+        print(f"Error opening log file {filename}: {e}")
+    if console:
+        consoleHandler = logging.StreamHandler(sys.stdout)
+        consoleHandler.setFormatter(formatter)
+        handlers.append(consoleHandler)
+
+    logQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    _queueHandler = logging.handlers.QueueHandler(logQueue)
+    root.addHandler(_queueHandler)
+
+    _listener = logging.handlers.QueueListener(logQueue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdownLogging():
+    """停止日志线程，写完队列中剩余的日志并关闭文件"""
+    global _listener, _queueHandler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queueHandler)
+    _queueHandler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
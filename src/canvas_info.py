@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CanvasInfo - 画布信息数据对象
+作为单个上下文对象暴露给CanvasInformation.qml，
+数值变化先缓存，每帧最多提交一次，且只有取整后的值真正改变时才发出通知
+
+CanvasInfoPainter - 不使用QtQuick时的画布信息面板，由QPainter直接绘制
+"""
+
+from PyQt5.QtCore import Qt, QObject, QTimer, QPoint, QRect, pyqtSignal, pyqtProperty
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont, QPixmap
+
+
+class CanvasInfo(QObject):
+    """画布信息（位置、旋转、缩放）"""
+
+    # 信号定义
+    posXChanged = pyqtSignal()
+    posYChanged = pyqtSignal()
+    rotateChanged = pyqtSignal()
+    scaleChanged = pyqtSignal()
+    languageChanged = pyqtSignal()
+    infoVisibleChanged = pyqtSignal()
+    changed = pyqtSignal()  # 任一显示值改变
+
+    FRAME_INTERVAL = 16  # 提交间隔（毫秒）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # 已提交（QML可见）的值
+        self._posX = "0"
+        self._posY = "0"
+        self._rotate = 0.0
+        self._scale = "1"
+        self._language = True
+        self._infoVisible = True
+
+        # 等待提交的原始值
+        self._pendingPos = None
+        self._pendingRotate = None
+        self._pendingScale = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    # ========== QML属性 ==========
+
+    @pyqtProperty(str, notify=posXChanged)
+    def posX(self):
+        return self._posX
+
+    @pyqtProperty(str, notify=posYChanged)
+    def posY(self):
+        return self._posY
+
+    @pyqtProperty(float, notify=rotateChanged)
+    def rotate(self):
+        return self._rotate
+
+    @pyqtProperty(str, notify=scaleChanged)
+    def scale(self):
+        return self._scale
+
+    @pyqtProperty(bool, notify=languageChanged)
+    def language(self):
+        return self._language
+
+    @pyqtProperty(bool, notify=infoVisibleChanged)
+    def infoVisible(self):
+        return self._infoVisible
+
+    # ========== 更新接口 ==========
+
+    def setPosition(self, x, y):
+        """设置Origin点屏幕位置"""
+        self._pendingPos = (x, y)
+        self._schedule()
+
+    def setRotate(self, rotate):
+        """设置旋转角度"""
+        self._pendingRotate = rotate
+        self._schedule()
+
+    def setScale(self, scale):
+        """设置缩放"""
+        self._pendingScale = scale
+        self._schedule()
+
+    def setLanguage(self, language):
+        """设置语言（True=中文）"""
+        if self._language != language:
+            self._language = language
+            self.languageChanged.emit()
+            self.changed.emit()
+
+    def setInfoVisible(self, visible):
+        """设置是否显示"""
+        if self._infoVisible != visible:
+            self._infoVisible = visible
+            self.infoVisibleChanged.emit()
+            self.changed.emit()
+
+    def _schedule(self):
+        """安排在下一帧提交"""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """提交缓存的数值，只通知取整后真正改变的属性"""
+        self._timer.stop()
+        changed = False
+
+        if self._pendingPos is not None:
+            x, y = self._pendingPos
+            self._pendingPos = None
+            posX = str(round(x, 2))
+            posY = str(round(y, 2))
+            if posX != self._posX:
+                self._posX = posX
+                self.posXChanged.emit()
+                changed = True
+            if posY != self._posY:
+                self._posY = posY
+                self.posYChanged.emit()
+                changed = True
+
+        if self._pendingRotate is not None:
+            rotate = round(self._pendingRotate, 2)
+            self._pendingRotate = None
+            if rotate != self._rotate:
+                self._rotate = rotate
+                self.rotateChanged.emit()
+                changed = True
+
+        if self._pendingScale is not None:
+            scale = str(round(self._pendingScale, 2))
+            self._pendingScale = None
+            if scale != self._scale:
+                self._scale = scale
+                self.scaleChanged.emit()
+                changed = True
+
+        if changed:
+            self.changed.emit()
+
+
+class CanvasInfoPainter(QObject):
+    """
+    不依赖QtQuick的画布信息面板
+    由GraphicsView.drawForeground在视口坐标下直接绘制，外观与CanvasInformation.qml一致
+    """
+
+    # 信号定义
+    resetSignal = pyqtSignal()
+
+    RADIO = 0.8  # 与QML中radio一致的缩放系数
+
+    def __init__(self, canvasInfo, parent=None):
+        super().__init__(parent)
+        self._info = canvasInfo
+        self._pos = QPoint(10, 360)
+        self._icons = {}
+
+        r = self.RADIO
+        self._panelRect = QRect(0, 0, int(230 * r), int(150 * r)).adjusted(5, 5, -5, -5)
+        self._resetRect = QRect(self._panelRect.right() - int(88 * r), self._panelRect.top() + int(8 * r),
+                                int(80 * r), int(30 * r))
+
+    def move(self, x, y):
+        """设置面板在视口中的位置"""
+        self._pos = QPoint(x, y)
+
+    def isVisible(self):
+        """面板是否显示"""
+        return self._info.infoVisible
+
+    def geometry(self):
+        """面板在视口坐标下的矩形"""
+        return self._panelRect.translated(self._pos)
+
+    def resetButtonRect(self):
+        """重置按钮在视口坐标下的矩形"""
+        return self._resetRect.translated(self._pos)
+
+    def mousePress(self, pos):
+        """视口鼠标按下，点中面板时返回True"""
+        if not self.isVisible() or not self.geometry().contains(pos):
+            return False
+        if self.resetButtonRect().contains(pos):
+            self.resetSignal.emit()
+        return True
+
+    def _icon(self, name):
+        """获取缩放后的图标"""
+        pm = self._icons.get(name)
+        if pm is None:
+            size = int(25 * self.RADIO)
+            pm = QPixmap(f":/icons/{name}.png").scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._icons[name] = pm
+        return pm
+
+    def paint(self, painter):
+        """在视口坐标下绘制面板，调用前painter需已重置为设备坐标"""
+        if not self.isVisible():
+            return
+
+        r = self.RADIO
+        info = self._info
+        panel = self.geometry()
+        left = panel.left()
+        top = panel.top()
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing, True)
+
+        # 背景
+        painter.setPen(QPen(QColor("#C9C9C9")))
+        painter.setBrush(QBrush(Qt.white))
+        painter.drawRoundedRect(panel, 5, 5)
+
+        # 标题
+        font = QFont(painter.font())
+        font.setBold(True)
+        font.setPixelSize(int((22 if info.language else 15) * r))
+        painter.setFont(font)
+        painter.setPen(QPen(Qt.black))
+        titleRect = QRect(left + int(10 * r), top + int(10 * r), int(130 * r), int(30 * r))
+        painter.drawText(titleRect, Qt.AlignLeft | Qt.AlignVCenter, "画布信息" if info.language else "Information")
+
+        # 重置按钮
+        button = self.resetButtonRect()
+        painter.setPen(QPen(QColor("#DDDDDD")))
+        painter.setBrush(QBrush(Qt.white))
+        painter.drawRoundedRect(button, 5 * r, 5 * r)
+        painter.drawPixmap(button.left() + int(5 * r), button.top() + int(2.5 * r), self._icon("reset"))
+        font.setBold(False)
+        font.setPixelSize(int((20 if info.language else 15) * r))
+        painter.setFont(font)
+        painter.setPen(QPen(Qt.black))
+        painter.drawText(button.adjusted(int(32 * r), 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter,
+                         "重置" if info.language else "Reset")
+
+        # 分隔线
+        lineY = titleRect.bottom() + int(8 * r)
+        painter.setPen(QPen(QColor("#CCCCCE")))
+        painter.drawLine(titleRect.left(), lineY, button.right(), lineY)
+
+        # 位置、角度、缩放
+        font.setBold(True)
+        font.setPixelSize(int(20 * r))
+        painter.setFont(font)
+        painter.setPen(QPen(Qt.black))
+        iconSize = int(25 * r)
+
+        posTop = top + int(60 * r)
+        painter.drawPixmap(left + int(20 * r), posTop, self._icon("position"))
+        painter.drawText(QRect(left + int(20 * r) + iconSize + int(10 * r), posTop, int(150 * r), iconSize),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"{info.posX},{info.posY}")
+
+        rowTop = top + int(100 * r)
+        painter.drawPixmap(left + int(20 * r), rowTop, self._icon("angle"))
+        painter.drawText(QRect(left + int(20 * r) + iconSize + int(10 * r), rowTop, int(60 * r), iconSize),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"{info.rotate}°")
+
+        scaleLeft = left + int(20 * r) + iconSize + int(70 * r)
+        painter.drawPixmap(scaleLeft, rowTop, self._icon("scale"))
+        painter.drawText(QRect(scaleLeft + iconSize + int(5 * r), rowTop, int(60 * r), iconSize),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"{info.scale}x")
+
+        painter.restore()
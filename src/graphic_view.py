@@ -6,10 +6,12 @@ Enhanced GraphicsView - 增强版图形视图
 """
 
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem
-from PyQt5.QtCore import Qt, QPointF, QRectF, QPoint, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QPointF, QRectF, QPoint, QLineF, pyqtSignal, QObject
 from PyQt5.QtGui import QPainter, QPen, QBrush, QCursor, QTransform, QPixmap, QWheelEvent
 import math
 
+from perf_metrics import instrumented
+
 class AbstractTool(QObject):
     """抽象工具类"""
     done = pyqtSignal()
@@ -185,6 +187,9 @@ class GraphicsView(QGraphicsView):
     SceneMouseContext = 2
     ToolMouseContext = 3
     
+    # 网格十字之间的最小像素间距，小于该值时抽稀网格
+    GRID_MIN_PIXEL_SPACING = 6
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
@@ -211,10 +216,22 @@ class GraphicsView(QGraphicsView):
         # Origin点位置追踪
         self._originPos = QPointF(0.0, 0.0)  # Origin点在场景坐标系中的位置
         self._initialVisibleRect = QRectF(-1, -1, 6, 6)  # 保存初始的可见矩形
+        self._lastOriginScreenPos = None  # 上次发送的Origin点屏幕位置
+        
+        # 视口坐标下绘制的前景面板（不使用QML时的画布信息）
+        self._overlay = None
+        self._overlayPressed = False
+        
+        # 平面图之上绘制的热力图层
+        self._heatmap = None
         
         # 视图设置
         self._viewSettings = ViewSettings()  # 创建默认视图设置
         
+        # 网格线段缓存，视图状态不变时直接复用
+        self._gridCacheKey = None
+        self._gridLines = []
+        
         # 设置
         self.setMouseTracking(False)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -319,8 +336,29 @@ class GraphicsView(QGraphicsView):
         """
         self.setVisibleRect(self._initialVisibleRect)
     
+    def setForegroundOverlay(self, overlay):
+        """设置在视口坐标下绘制的前景面板，需提供paint(painter)、mousePress(pos)和geometry()"""
+        self._overlay = overlay
+        self.viewport().update()
+    
+    def foregroundOverlay(self):
+        """获取前景面板"""
+        return self._overlay
+    
+    def setHeatmap(self, heatmap):
+        """设置在平面图之上、网格之下绘制的热力图层，需提供paint(painter)"""
+        self._heatmap = heatmap
+        self.viewport().update()
+    
+    @instrumented()
     def mousePressEvent(self, event):
         """鼠标按下事件"""
+        # 点中前景面板时不再传给场景和工具
+        if self._overlay and self._overlay.mousePress(event.pos()):
+            self._overlayPressed = True
+            event.accept()
+            return
+        
         event.ignore()
         
         self._mouseContext = self.DefaultMouseContext
@@ -360,8 +398,13 @@ class GraphicsView(QGraphicsView):
         if event.button() == Qt.RightButton:
             self._ignoreContextMenu = event.isAccepted() and (self._mouseContext != self.SceneMouseContext)
     
+    @instrumented()
     def mouseMoveEvent(self, event):
         """鼠标移动事件"""
+        if self._overlayPressed:
+            event.accept()
+            return
+        
         if self._tool and self.scene():
             self.scene().update()  # 工具可能需要重绘
         
@@ -411,14 +454,22 @@ class GraphicsView(QGraphicsView):
                 self.update()
                 self.rotateChanged.emit(self.rotateAngle)
         
-        # 发送Origin点位置信号
+        # Origin点屏幕位置改变时才发送信号
         originPos = self.getOriginScreenPosition()
-        self.originPositionChanged.emit(originPos.x(), originPos.y())
+        if originPos != self._lastOriginScreenPos:
+            self._lastOriginScreenPos = originPos
+            self.originPositionChanged.emit(originPos.x(), originPos.y())
     
+    @instrumented()
     def mouseReleaseEvent(self, event):
         """鼠标释放事件"""
         self.firstMove = True
         
+        if self._overlayPressed:
+            self._overlayPressed = False
+            event.accept()
+            return
+        
         if self._mouseContext == self.ToolMouseContext:
             if self._tool:
                 self._tool.mouseReleaseEvent(self.mapToScene(event.pos()))
@@ -456,6 +507,7 @@ class GraphicsView(QGraphicsView):
             # 这里可以显示自定义的场景菜单
             pass
     
+    @instrumented()
     def wheelEvent(self, event):
         """鼠标滚轮事件"""
         delta = event.angleDelta().y()
@@ -488,36 +540,61 @@ class GraphicsView(QGraphicsView):
         painter.setPen(QPen(QBrush(Qt.blue), 0))
         painter.drawEllipse(p, 0.05, 0.05)
     
+    @instrumented()
     def drawGrid(self, painter, rect):
         """绘制网格"""
-        # 添加一些空间，以防十字中心不在绘图矩形中
-        adjusted = rect.adjusted(-0.025, -0.025, 0.025, 0.025)
-        
         width = self._viewSettings.gridWidth()
         height = self._viewSettings.gridHeight()
-        
-        left = width * math.ceil(adjusted.left() / width)
-        top = height * math.ceil(adjusted.top() / height)
-        
+
+        if width <= 0 or height <= 0:
+            return
+
+        # 十字之间的像素间距过小时按2的幂次抽稀，避免缩小视图时绘制数万个十字
+        pixelsPerMeter = math.hypot(self.transform().m11(), self.transform().m12())
+        step = 1
+        if pixelsPerMeter > 0:
+            spacing = min(width, height) * pixelsPerMeter
+            while spacing * step < self.GRID_MIN_PIXEL_SPACING:
+                step *= 2
+
+        # 以整个视口（而非本次重绘区域）为范围生成网格，便于在平移时复用缓存
+        sceneRect = self.mapToScene(self.viewport().rect()).boundingRect()
+        sceneRect = sceneRect.united(rect).adjusted(-0.025, -0.025, 0.025, 0.025)
+
+        stepWidth = width * step
+        stepHeight = height * step
+        key = (width, height, step,
+               math.ceil(sceneRect.left() / stepWidth),
+               math.ceil(sceneRect.top() / stepHeight),
+               math.ceil(sceneRect.right() / stepWidth),
+               math.ceil(sceneRect.bottom() / stepHeight))
+
+        if key != self._gridCacheKey:
+            self._gridCacheKey = key
+            self._gridLines = self._buildGridLines(stepWidth, stepHeight, *key[3:])
+
         painter.setPen(QPen(QBrush(Qt.red), 0))
-        
-        if width > 0 and height > 0:
-            x = left
-            while x < adjusted.right():
-                y = top
-                while y < adjusted.bottom():
-                    painter.drawLine(QPointF(x, y - 0.025), QPointF(x, y + 0.025))
-                    painter.drawLine(QPointF(x - 0.025, y), QPointF(x + 0.025, y))
-                    y += height
-                x += width
-    
+        painter.drawLines(self._gridLines)
+
+    def _buildGridLines(self, width, height, firstColumn, firstRow, lastColumn, lastRow):
+        """生成网格十字的线段数组，每个交点两条线段"""
+        xs = [column * width for column in range(firstColumn, lastColumn)]
+        ys = [row * height for row in range(firstRow, lastRow)]
+        lines = []
+        for x in xs:
+            lines.extend(QLineF(x, y - 0.025, x, y + 0.025) for y in ys)
+            lines.extend(QLineF(x - 0.025, y, x + 0.025, y) for y in ys)
+        return lines
+    
+    @instrumented()
     def drawFloorplan(self, painter, rect):
         """绘制平面图"""
         pm = self._viewSettings.floorplanPixmap()
         
         if not pm.isNull():
             painter.save()
-            transform = self._viewSettings.floorplanTransform()
+            # 复制一份，避免scale修改ViewSettings中保存的变换
+            transform = QTransform(self._viewSettings.floorplanTransform())
             transform.scale(1, -1)  # 应用垂直翻转
             painter.setTransform(transform, True)
             painter.translate(0, -pm.height())
@@ -532,7 +609,14 @@ class GraphicsView(QGraphicsView):
         
         if self._tool:
             self._tool.draw(painter, rect, self.mapToScene(self.mapFromGlobal(QCursor.pos())))
+        
+        if self._overlay:
+            painter.save()
+            painter.resetTransform()
+            self._overlay.paint(painter)
+            painter.restore()
     
+    @instrumented()
     def drawBackground(self, painter, rect):
         """绘制背景"""
         super().drawBackground(painter, rect)
@@ -540,6 +624,9 @@ class GraphicsView(QGraphicsView):
         if self._viewSettings.getFloorplanShow():
             self.drawFloorplan(painter, rect)
         
+        if self._heatmap:
+            self._heatmap.paint(painter)
+        
         if self._viewSettings.gridShow():
             self.drawGrid(painter, rect)
         
@@ -577,6 +664,7 @@ class GraphicsView(QGraphicsView):
     
     def gridChanged(self):
         """网格改变时调用"""
+        self._gridCacheKey = None
         if self.scene():
             self.scene().update()
     
@@ -629,6 +717,7 @@ class ViewSettings(QObject):
         self._gridHeight = 1.0
         self._floorplanPixmap = QPixmap()
         self._floorplanTransform = QTransform()
+        self._floorplanPath = ""
     
     def getFloorplanShow(self):
         """获取是否显示平面图"""
@@ -690,6 +779,14 @@ class ViewSettings(QObject):
         if self._floorplanShow:
             self.floorplanChanged.emit()
     
+    def floorplanPath(self):
+        """获取平面图文件路径"""
+        return self._floorplanPath
+    
+    def setFloorplanPath(self, path):
+        """设置平面图文件路径"""
+        self._floorplanPath = path
+    
     def floorplanTransform(self):
         """获取平面图变换"""
         return self._floorplanTransform
@@ -15,13 +15,37 @@ from PyQt5.QtWidgets import (QWidget, QGraphicsScene, QTableWidgetItem,
                            QGraphicsLineItem, QGraphicsPixmapItem,
                            QMessageBox, QFileDialog, QDesktopWidget)
 from PyQt5.QtCore import Qt, QPointF, QTimer, pyqtSignal, QRectF
-from PyQt5.QtGui import QBrush, QPen, QColor, QPolygonF, QPixmap
-from PyQt5.QtQuickWidgets import QQuickWidget
+from PyQt5.QtGui import QBrush, QPen, QColor, QPolygonF, QPixmap, QTransform
 from PyQt5.QtCore import QUrl
 import math
-import xml.etree.ElementTree as ET
+import numpy as np
+import os
+import time
 
 from graphic_view import GraphicsView  # 导入GraphicsView类
+from tag_layer import TagLayerItem
+from canvas_info import CanvasInfo, CanvasInfoPainter
+from site_config import (SiteConfig, AnchorConfig, loadSiteConfig, saveSiteConfig,
+                         SECTION_TAG, SECTION_ANCHORS, SECTION_ZONE1, SECTION_ZONE2,
+                         SECTION_GEOFENCING, SECTION_FLOORPLAN, SECTION_VIEW)
+from anchor_health import AnchorHealthMonitor
+from tag_accuracy import TagAccuracy
+from anchor_calibration import RangeCollector, calibrateAnchors
+from range_bias import MAX_CORRECTION_TAGS
+from trajectory_store import TrajectoryStore
+from heatmap_layer import HeatmapLayer
+from perf_metrics import instrumented
+
+# 画布信息面板的实现方式：qml使用QQuickWidget，painter在GraphicsView前景中直接绘制
+CANVAS_OVERLAY_QML = "qml"
+CANVAS_OVERLAY_PAINTER = "painter"
+CANVAS_OVERLAY_BACKEND = os.environ.get("UWB_CANVAS_OVERLAY", CANVAS_OVERLAY_QML)
+
+# 轨迹存储目录，未设置时使用临时目录，程序退出后删除
+TRAJECTORY_DIR = os.environ.get("UWB_TRAJECTORY_DIR")
+
+# 热力图衰减半衰期（秒），未设置时不衰减，累计全部停留时间
+HEATMAP_HALF_LIFE = float(os.environ.get("UWB_HEATMAP_HALF_LIFE", "0")) or None
 
 # 定义结构体
 class Tag:
@@ -29,12 +53,15 @@ class Tag:
         self.id = 0
         self.idx = 0
         self.ridx = 0
+        self.groupId = None  # 最近一次解算结果所属的组
         self.p = [None] * 100  # 历史位置点
         self.avgp = None  # 平均位置点
         self.r95p = None  # R95圆
         self.geop = None  # 地理围栏圆
         self.circle = [None] * 8  # 定位圆
         self.r95Show = False
+        self.r95Cm = -1  # 表格中显示的R95（厘米）
+        self.accuracy = TagAccuracy()  # 静态精度统计
         self.LocatingcircleShow = [False] * 100
         self.tsPrev = 0.0
         self.colourH = 0.0
@@ -77,6 +104,46 @@ class BaseStation:
         self.y = 0.0
         self.z = 0.0
 
+class AnchorChangeSet:
+    """
+    一次handleTableUpdate产生的基站变化
+    added: 新增的行；changed: 行 -> 改变的字段集合（anchorId/groupId/status/ip/mac/position）
+    """
+    def __init__(self):
+        self.added = []
+        self.changed = {}
+        self.stations = {}  # 行 -> BaseStation（只包含新增和改变的行）
+        self.onlineCount = 0
+        self.total = 0
+
+    def isEmpty(self):
+        """是否没有任何变化"""
+        return not self.added and not self.changed
+
+    def rows(self):
+        """新增或改变的行"""
+        return sorted(set(self.added) | set(self.changed))
+
+class StationIndex:
+    """
+    基站列表按属性（mac/ip）建立的哈希索引
+    基站列表被赋值或修改（包括修改基站的mac/ip）后需调用rebuild()
+    """
+    def __init__(self, key):
+        self._key = key
+        self._index = {}
+
+    def rebuild(self, stations):
+        """重建索引，重复的键保留列表中第一项，与原线性查找一致"""
+        index = {}
+        for station in stations:
+            index.setdefault(getattr(station, self._key), station)
+        self._index = index
+
+    def find(self, value):
+        """查找属性等于value的基站，没有则返回None"""
+        return self._index.get(value)
+
 class GraphicsWidget(QWidget):
     # 信号定义
     updateAnchorXYZ = pyqtSignal(int, int, float)  # id, x/y/z, value
@@ -84,16 +151,23 @@ class GraphicsWidget(QWidget):
     centerAt = pyqtSignal(float, float)
     centerRect = pyqtSignal(QRectF)
     updateAnchorList3D = pyqtSignal(int, bool, bool, float, float, float)
+    tagPos3D = pyqtSignal(int, float, float, float)  # tag_id, x, y, z
+    tagsCleared = pyqtSignal()
     setTagHistory = pyqtSignal(int)
     viewSizeChange = pyqtSignal(object)  # QSize
     LoadWidgetVisibleChange = pyqtSignal(bool)
     LoadWidgetIndexChange = pyqtSignal(int)
     updateGroupID = pyqtSignal(str, int)  # ip, GroupNo
     sendTagWarnCommand = pyqtSignal(int, bool)  # tagidA, status
+    anchorsChanged = pyqtSignal(object)  # AnchorChangeSet
+    calibrationFinished = pyqtSignal(object)  # CalibrationResult
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, overlayBackend=None):
         super().__init__(parent)
         
+        # 画布信息面板实现方式
+        self._overlayBackend = overlayBackend or CANVAS_OVERLAY_BACKEND
+        
         # 从UI文件加载
         self.ui = Ui_GraphicsWidget()
         self.ui.setupUi(self)
@@ -104,6 +178,7 @@ class GraphicsWidget(QWidget):
         self._tags = {}  # QMap<quint64, Tag*>
         self._anchors = {}  # QMap<quint64, Anchor*>
         self._tagLabels = {}  # QMap<quint64, QString>
+        self._tagLayer = None  # 所有标签共用的绘制图层
         
         self._historyLength = 20
         self._showHistory = True
@@ -150,8 +225,10 @@ class GraphicsWidget(QWidget):
         self.m_polygon = QPolygonF()
         
         # QML相关
+        self.canvasInfo = None  # 暴露给QML的画布信息对象
         self.m_QQuickWidget = None
         self.m_LoadWidget = None
+        self.m_canvasInfoPainter = None
 
         
         
@@ -174,9 +251,27 @@ class GraphicsWidget(QWidget):
         self.language = True  # True=中文, False=英文
         self.reseveSetok = False
         self.signalTimeOut = False
+        self._calibrationRanges = None  # 自标定期间累计的基站间测距
         self.baseStationList = []
         self.loadStationList = []
         self.statusList = []
+        self._loadStationByMac = StationIndex("mac")
+        self._baseStationByIp = StationIndex("ip")
+        self._anchorSnapshot = []  # 行 -> 上次应用的 (anchorId, groupId, status, ip, mac)
+        self._anchorPositions = []  # 行 -> 上次应用的 (x, y, z)
+        self._anchorKeys = []  # 行 -> (组ID, 基站ID)
+        self._anchorRows = {}  # (组ID, 基站ID) -> 基站表格行，上报中的基站ID只在组内唯一
+        self.anchorHealth = AnchorHealthMonitor()
+        self._solutionSeq = {}  # tag_id -> 已应用的最新解算序号
+        self._view3D = None  # 3D视图控件
+        # 标签轨迹，指定目录中已有存储时接着上次的数据记录
+        if TrajectoryStore.exists(TRAJECTORY_DIR):
+            self.trajectory = TrajectoryStore.open(TRAJECTORY_DIR)
+        else:
+            self.trajectory = TrajectoryStore(TRAJECTORY_DIR)
+        self.heatmap = HeatmapLayer(halfLife=HEATMAP_HALF_LIFE)  # 停留时间热力图
+        self._playback = False  # 回放轨迹时实时位置只记录不显示
+        self._playbackTags = set()  # 当前回放帧中显示的标签
         
         self._init_ui()
         self._connect_signals()
@@ -194,6 +289,15 @@ class GraphicsWidget(QWidget):
         self.ui.graphicsView.scale(1, -1)  # 翻转Y轴
         self.ui.graphicsView.setBaseSize(int(desktopHeight * 0.75), int(desktopWidth * 0.75))
         
+        # 创建标签图层
+        self._tagLayer = TagLayerItem()
+        self._tagLayer.setTagSize(self._tagSize)
+        self._tagLayer.setHistoryLength(self._historyLength)
+        self._scene.addItem(self._tagLayer)
+        
+        # 热力图绘制在平面图之上
+        self.ui.graphicsView.setHeatmap(self.heatmap)
+        
         # 设置标签表格
         self.ui.tagTable.setHorizontalHeaderLabels(self.tableHeader)
         self._setup_tag_table_columns()
@@ -231,8 +335,14 @@ class GraphicsWidget(QWidget):
         # 初始化定时器
         self._init_timers()
         
-        # 初始化QML组件
-        self._init_qml_components()
+        # 初始化画布信息面板
+        self.canvasInfo = CanvasInfo(self)
+        self.canvasInfo.setLanguage(self.language)
+        self.canvasInfo.setInfoVisible(self.canvasInfomationVisible)
+        if self._overlayBackend == CANVAS_OVERLAY_PAINTER:
+            self._init_painter_overlay()
+        else:
+            self._init_qml_components()
         
         self.ui.stackedWidget.hide()
         
@@ -285,16 +395,21 @@ class GraphicsWidget(QWidget):
         self.m_calibrationTimer = QTimer()
         self.m_calibrationTimer.setInterval(8000)  # 8秒超时
         self.m_calibrationTimer.timeout.connect(self._calibration_timeout)
+        
+        # 热力图累加和重绘，低频进行
+        self.m_heatmapTimer = QTimer()
+        self.m_heatmapTimer.setInterval(int(HeatmapLayer.REFRESH_INTERVAL * 1000))
+        self.m_heatmapTimer.timeout.connect(self._heatmap_timeout)
+        self.m_heatmapTimer.start()
     
     def _init_qml_components(self):
         """初始化QML组件"""
+        # 只有使用QML面板时才加载QtQuick
+        from PyQt5.QtQuickWidgets import QQuickWidget
+        
+        # 所有画布信息通过一个对象的属性通知更新，避免逐个设置上下文属性引起全部绑定重新求值
         self.m_QQuickWidget = QQuickWidget(self.ui.graphicsView)
-        self.m_QQuickWidget.rootContext().setContextProperty("canvas_posX", self.canvas_posX)
-        self.m_QQuickWidget.rootContext().setContextProperty("canvas_posY", self.canvas_posY)
-        self.m_QQuickWidget.rootContext().setContextProperty("canvas_rotate", self.canvas_rotate)
-        self.m_QQuickWidget.rootContext().setContextProperty("canvas_scale", self.canvas_scale)
-        self.m_QQuickWidget.rootContext().setContextProperty("language", self.language)
-        self.m_QQuickWidget.rootContext().setContextProperty("canvasInfomationVisible", self.canvasInfomationVisible)
+        self.m_QQuickWidget.rootContext().setContextProperty("canvasInfo", self.canvasInfo)
         
         # 注意：需要确保QML文件路径正确
         self.m_QQuickWidget.setSource(QUrl("qrc:/qml/CanvasInformation.qml"))
@@ -308,6 +423,18 @@ class GraphicsWidget(QWidget):
         if m_item:
             m_item.resetSignal.connect(self.resetButtonClicked)
     
+    def _init_painter_overlay(self):
+        """初始化不依赖QtQuick的画布信息面板"""
+        self.m_canvasInfoPainter = CanvasInfoPainter(self.canvasInfo, self)
+        self.m_canvasInfoPainter.move(10, 360)
+        self.m_canvasInfoPainter.resetSignal.connect(self.resetButtonClicked)
+        self.canvasInfo.changed.connect(self._update_painter_overlay)
+        self.graphicsView().setForegroundOverlay(self.m_canvasInfoPainter)
+    
+    def _update_painter_overlay(self):
+        """画布信息改变，重绘面板区域"""
+        self.graphicsView().viewport().update(self.m_canvasInfoPainter.geometry().adjusted(-2, -2, 2, 2))
+    
     def _connect_signals(self):
         """连接信号"""
         # 表格信号
@@ -318,6 +445,9 @@ class GraphicsWidget(QWidget):
         self.ui.tagTable.itemSelectionChanged.connect(self.itemSelectionChanged)
         self.ui.anchorTable.itemSelectionChanged.connect(self.itemSelectionChangedAnc)
         
+        # 标签图层信号
+        self._tagLayer.tagClicked.connect(self.tagLayerClicked)
+        
         # GraphicsView信号
         self.centerAt.connect(self.graphicsView().centerAt)
         self.centerRect.connect(self.graphicsView().centerRect)
@@ -328,6 +458,7 @@ class GraphicsWidget(QWidget):
         self.graphicsView().visibleRectChanged.connect(self.visibleRectChanged)
         self.graphicsView().scaleChanged.connect(self.scaleChanged)
         self.graphicsView().originPositionChanged.connect(self.onOriginPositionChanged)
+        self.graphicsView()._viewSettings.floorplanChanged.connect(self._heatmap_floorplan_changed)
         
         # 其他信号连接
         # 注意：这些需要在应用程序ready后连接
@@ -336,24 +467,79 @@ class GraphicsWidget(QWidget):
         """获取GraphicsView实例"""
         return self.ui.graphicsView
     
+    def setView3D(self, widget):
+        """把3D视图控件放到2D视图所在位置，默认隐藏"""
+        if widget is None or widget is self._view3D:
+            return
+        self._view3D = widget
+        index = self.ui.verticalLayout.indexOf(self.ui.graphicsView)
+        self.ui.verticalLayout.insertWidget(index + 1, widget)
+        widget.hide()
+    
+    def show3D(self, show):
+        """在2D视图和3D视图之间切换"""
+        if self._view3D is None:
+            return
+        self.ui.graphicsView.setVisible(not show)
+        self._view3D.setVisible(show)
+    
     def loadConfigFile(self, filename):
         """加载配置文件"""
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
+            cfg = loadSiteConfig(filename)
+            # 只应用文件中包含的部分，旧版文件缺少的部分保持当前设置
+            
+            # 标签配置
+            if cfg.hasSection(SECTION_TAG):
+                self._tagSize = cfg.tagSize
+                self._historyLength = cfg.historyLength
+                self._tagLayer.setTagSize(self._tagSize)
+                self._tagLayer.setHistoryLength(self._historyLength)
+            self._tagLabels.update(cfg.tagLabels)
+            
+            # 基站位置，在基站上线时按MAC匹配
+            if cfg.hasSection(SECTION_ANCHORS):
+                stations = []
+                for anchor in cfg.anchors:
+                    station = BaseStation()
+                    station.anchorId = anchor.anchorId
+                    station.groupId = anchor.groupId
+                    station.ip = anchor.ip
+                    station.mac = anchor.mac
+                    station.x = anchor.x
+                    station.y = anchor.y
+                    station.z = anchor.z
+                    stations.append(station)
+                self.setLoadStationList(stations)
+                self._reapplyLoadedPositions()
+            
+            # 区域
+            if cfg.hasSection(SECTION_ZONE1):
+                self.zone(1, cfg.zone1Rad, cfg.zone1Red)
+            if cfg.hasSection(SECTION_ZONE2):
+                self.zone(2, cfg.zone2Rad, cfg.zone2Red)
+            if cfg.hasSection(SECTION_GEOFENCING):
+                self.showGeoFencingMode(cfg.geoFencingMode)
+            
+            # 平面图和视图设置
+            viewSettings = self.graphicsView()._viewSettings
+            if cfg.hasSection(SECTION_VIEW):
+                viewSettings.setGridWidth(cfg.gridWidth)
+                viewSettings.setGridHeight(cfg.gridHeight)
+                viewSettings.setGridShow(cfg.gridShow)
+                viewSettings.setOriginShow(cfg.originShow)
+            if cfg.hasSection(SECTION_FLOORPLAN):
+                viewSettings.setFloorplanTransform(QTransform(*cfg.floorplanTransform))
+                if cfg.floorplanPath:
+                    pm = QPixmap(cfg.floorplanPath)
+                    if not pm.isNull():
+                        viewSettings.setFloorplanPath(cfg.floorplanPath)
+                        viewSettings.setFloorplanPixmap(pm)
+                viewSettings.setFloorplanShow(cfg.floorplanShow and not viewSettings.floorplanPixmap().isNull())
             
-            if root.tag == "config":
-                for child in root:
-                    if child.tag == "tag_cfg":
-                        self._tagSize = float(child.get("size", "0.3"))
-                        self._historyLength = int(child.get("history", "20"))
-                    elif child.tag == "tag":
-                        tag_id = int(child.get("ID"), 16)
-                        label = child.get("label", "")
-                        self._tagLabels[tag_id] = label
-                        
             # 更新UI
             # ViewSettingsWidget.viewsettingswidget.setLinetext(str(self._tagSize))
+            self.setTagHistory.emit(self._historyLength)
             
         except Exception as e:
             print(f"Error loading config file: {e}")
@@ -362,21 +548,55 @@ class GraphicsWidget(QWidget):
     def saveConfigFile(self, filename):
         """保存配置文件"""
         try:
-            root = ET.Element("config")
+            cfg = SiteConfig()
+            
+            # 标签配置
+            cfg.tagSize = self._tagSize
+            cfg.historyLength = self._historyLength
+            cfg.tagLabels = dict(self._tagLabels)
             
-            # 添加标签配置
-            tag_cfg = ET.SubElement(root, "tag_cfg")
-            tag_cfg.set("size", str(self._tagSize))
-            tag_cfg.set("history", str(self._historyLength))
+            # 基站：基站表格中的基站优先，其余保留加载时的配置
+            anchors = {}
+            for station in self.loadStationList:
+                anchor = AnchorConfig()
+                anchor.anchorId = station.anchorId
+                anchor.groupId = station.set_groupId or station.groupId
+                anchor.ip = station.ip
+                anchor.mac = station.mac
+                anchor.x = station.x
+                anchor.y = station.y
+                anchor.z = station.z
+                anchors[station.mac or station.ip] = anchor
+            for row, (anchorId, groupId, status, ip, mac) in enumerate(self._anchorSnapshot):
+                anchor = AnchorConfig()
+                anchor.anchorId = anchorId
+                anchor.groupId = self._anchorKeys[row][0]
+                anchor.ip = ip
+                anchor.mac = mac
+                anchor.x, anchor.y, anchor.z = self._anchorPositions[row]
+                anchors[mac or ip] = anchor
+            cfg.anchors = list(anchors.values())
             
-            # 添加标签信息
-            for tag_id, label in self._tagLabels.items():
-                tag = ET.SubElement(root, "tag")
-                tag.set("ID", hex(tag_id))
-                tag.set("label", label)
+            # 区域
+            cfg.zone1Rad = self._zone1Rad
+            cfg.zone2Rad = self._zone2Rad
+            cfg.zone1Red = self._zone1Red
+            cfg.zone2Red = self._zone2Red
+            cfg.geoFencingMode = self._geoFencingMode
             
-            tree = ET.ElementTree(root)
-            tree.write(filename, encoding="utf-8", xml_declaration=True)
+            # 平面图和视图设置
+            viewSettings = self.graphicsView()._viewSettings
+            t = viewSettings.floorplanTransform()
+            cfg.floorplanPath = viewSettings.floorplanPath()
+            cfg.floorplanShow = viewSettings.getFloorplanShow()
+            cfg.floorplanTransform = (t.m11(), t.m12(), t.m13(), t.m21(), t.m22(), t.m23(),
+                                      t.m31(), t.m32(), t.m33())
+            cfg.gridShow = viewSettings.gridShow()
+            cfg.gridWidth = viewSettings.gridWidth()
+            cfg.gridHeight = viewSettings.gridHeight()
+            cfg.originShow = viewSettings.originShow()
+            
+            saveSiteConfig(filename, cfg)
             
         except Exception as e:
             print(f"Error saving config file: {e}")
@@ -449,6 +669,10 @@ class GraphicsWidget(QWidget):
         
         # 清空表格内容
         self.ui.tagTable.clearContents()
+        
+        # 清空标签图层
+        self._tagLayer.clear()
+        self.tagsCleared.emit()
     
     def checktagwarn(self, state, warnsize):
         """检查标签警告"""
@@ -456,15 +680,42 @@ class GraphicsWidget(QWidget):
         self.warn_distance = warnsize
         self.warn_flag = state
     
+    @instrumented()
     def handleTableUpdate(self, data):
-        """处理表格更新"""
+        """处理表格更新，只改写与上次快照不同的字段，并发出变化集合"""
         row_count = self.ui.anchorTable.rowCount()
         data_size = len(data)
-        load_size = len(self.loadStationList)
-        
-        exist = False
+        changes = AnchorChangeSet()
+        changes.total = data_size
+        # 程序写入表格不当作用户编辑处理
+        ignore = self._ignore
+        self._ignore = True
         
         for row in range(data_size):
+            station = data[row]
+            if station.status:
+                changes.onlineCount += 1
+            
+            current = (station.anchorId, station.groupId, station.status, station.ip, station.mac)
+            if row < len(self._anchorSnapshot):
+                previous = self._anchorSnapshot[row]
+                if previous == current:
+                    # 心跳包，内容未变
+                    station.x, station.y, station.z = self._anchorPositions[row]
+                    continue
+                fields = {name for name, old, new in zip(
+                    ("anchorId", "groupId", "status", "ip", "mac"), previous, current) if old != new}
+                self._anchorSnapshot[row] = current
+                changes.changed[row] = fields
+            else:
+                fields = {"anchorId", "groupId", "status", "ip", "mac"}
+                self._anchorSnapshot.append(current)
+                self._anchorPositions.append((0.0, 0.0, 0.0))
+                self._anchorKeys.append(None)
+                changes.added.append(row)
+            changes.stations[row] = station
+            self._setAnchorKey(row, (station.set_groupId or station.groupId, station.anchorId))
+            
             if row >= row_count:
                 self.ui.anchorTable.insertRow(row)
             
@@ -472,35 +723,121 @@ class GraphicsWidget(QWidget):
             group_id_item = self.ui.anchorTable.item(row, 0)
             if not group_id_item or not group_id_item.text():
                 group_id_item = QTableWidgetItem()
-                if data[row].set_groupId != 0:
-                    group_id_item.setText(str(data[row].set_groupId))
+                if station.set_groupId != 0:
+                    group_id_item.setText(str(station.set_groupId))
                 else:
-                    group_id_item.setText(str(data[row].groupId))
+                    group_id_item.setText(str(station.groupId))
                 self.ui.anchorTable.setItem(row, 0, group_id_item)
             
             # 设置基站ID
-            anchor_id_item = QTableWidgetItem(str(data[row].anchorId))
-            self.ui.anchorTable.setItem(row, 1, anchor_id_item)
+            if "anchorId" in fields:
+                anchor_id_item = QTableWidgetItem(str(station.anchorId))
+                self.ui.anchorTable.setItem(row, 1, anchor_id_item)
             
             # 设置状态
-            status_item = QTableWidgetItem("True" if data[row].status else "False")
-            if data[row].status:
-                status_item.setForeground(QBrush(Qt.green))
-            else:
-                status_item.setForeground(QBrush(Qt.red))
-            self.ui.anchorTable.setItem(row, 2, status_item)
+            if "status" in fields:
+                status_item = QTableWidgetItem("True" if station.status else "False")
+                if station.status:
+                    status_item.setForeground(QBrush(Qt.green))
+                else:
+                    status_item.setForeground(QBrush(Qt.red))
+                self.ui.anchorTable.setItem(row, 2, status_item)
             
             # 设置IP和MAC
-            ip_item = QTableWidgetItem(data[row].ip)
-            self.ui.anchorTable.setItem(row, 6, ip_item)
+            if "ip" in fields:
+                ip_item = QTableWidgetItem(station.ip)
+                self.ui.anchorTable.setItem(row, 6, ip_item)
             
-            mac_item = QTableWidgetItem(data[row].mac)
-            self.ui.anchorTable.setItem(row, 7, mac_item)
+            if "mac" in fields:
+                mac_item = QTableWidgetItem(station.mac)
+                self.ui.anchorTable.setItem(row, 7, mac_item)
             
             # 处理位置信息
-            self._process_anchor_position(row, data[row], load_size)
+            self._process_anchor_position(row, station)
+            position = (station.x, station.y, station.z)
+            if position != self._anchorPositions[row]:
+                self._anchorPositions[row] = position
+                fields.add("position")
+        self._ignore = ignore
+        
+        # 基站数量减少时丢弃多出的行
+        if len(self._anchorSnapshot) > data_size:
+            for key in self._anchorKeys[data_size:]:
+                if self._anchorRows.get(key, -1) >= data_size:
+                    del self._anchorRows[key]
+            del self._anchorSnapshot[data_size:]
+            del self._anchorPositions[data_size:]
+            del self._anchorKeys[data_size:]
+        
+        if not changes.isEmpty():
+            self.anchorsChanged.emit(changes)
+    
+    def _emitPositionChanges(self, rows):
+        """表格编辑或自标定改变了基站坐标，与handleTableUpdate一样发出变化集合"""
+        changes = AnchorChangeSet()
+        changes.total = len(self._anchorSnapshot)
+        changes.onlineCount = sum(1 for snapshot in self._anchorSnapshot if snapshot[2])
+        for row in rows:
+            anchorId, groupId, status, ip, mac = self._anchorSnapshot[row]
+            station = BaseStation()
+            station.anchorId = anchorId
+            station.groupId = groupId
+            station.set_groupId = self._anchorKeys[row][0]
+            station.status = status
+            station.ip = ip
+            station.mac = mac
+            station.x, station.y, station.z = self._anchorPositions[row]
+            changes.changed[row] = {"position"}
+            changes.stations[row] = station
+        if not changes.isEmpty():
+            self.anchorsChanged.emit(changes)
+    
+    def _reapplyLoadedPositions(self):
+        """
+        加载配置后，清除配置中有的基站在表格中的坐标并清空快照，
+        下次handleTableUpdate时所有行重新处理，按MAC应用配置中的坐标
+        """
+        ignore = self._ignore
+        self._ignore = True
+        for row, (anchorId, groupId, status, ip, mac) in enumerate(self._anchorSnapshot):
+            if self._loadStationByMac.find(mac) is not None:
+                for column in (3, 4, 5):
+                    self.ui.anchorTable.takeItem(row, column)
+        self._ignore = ignore
+        self._anchorSnapshot.clear()
+        self._anchorPositions.clear()
+        self._anchorKeys.clear()
+        self._anchorRows.clear()
+    
+    def setLoadStationList(self, stations):
+        """设置配置文件中的基站列表并重建按MAC的索引"""
+        self.loadStationList = stations
+        self._loadStationByMac.rebuild(stations)
+    
+    def setBaseStationList(self, stations):
+        """设置在线基站列表并重建按IP的索引"""
+        self.baseStationList = stations
+        self._baseStationByIp.rebuild(stations)
+    
+    def _setAnchorKey(self, row, key):
+        """更新行的 (组ID, 基站ID)，组内基站ID重复时保留第一行"""
+        old = self._anchorKeys[row]
+        if old == key:
+            return
+        if self._anchorRows.get(old) == row:
+            del self._anchorRows[old]
+        self._anchorKeys[row] = key
+        self._anchorRows.setdefault(key, row)
     
-    def _process_anchor_position(self, row, data, load_size):
+    def anchorRow(self, group_id, anchor_id):
+        """组内基站ID对应的基站表格行，没有则返回None"""
+        return self._anchorRows.get((group_id, anchor_id))
+    
+    def anchorKey(self, row):
+        """基站表格行对应的 (组ID, 基站ID)，没有则返回None"""
+        return self._anchorKeys[row] if 0 <= row < len(self._anchorKeys) else None
+    
+    def _process_anchor_position(self, row, data):
         """处理基站位置信息"""
         x_item = self.ui.anchorTable.item(row, 3)
         y_item = self.ui.anchorTable.item(row, 4)
@@ -520,40 +857,50 @@ class GraphicsWidget(QWidget):
             self.setStationList(row, data.status)
         else:
             # 从加载列表中查找位置
-            exist = False
-            for load_index in range(load_size):
-                if self.loadStationList[load_index].mac == data.mac:
-                    exist = True
-                    x = self.loadStationList[load_index].x
-                    y = self.loadStationList[load_index].y
-                    z = self.loadStationList[load_index].z
-                    
-                    x_item = QTableWidgetItem(f"{x:.2f}")
-                    y_item = QTableWidgetItem(f"{y:.2f}")
-                    z_item = QTableWidgetItem(f"{z:.2f}")
-                    
-                    self.ui.anchorTable.setItem(row, 3, x_item)
-                    self.ui.anchorTable.setItem(row, 4, y_item)
-                    self.ui.anchorTable.setItem(row, 5, z_item)
-                    
-                    self.anchPosG(row, data.anchorId, data.groupId, x, y, z, data.status, False)
-                    self.setStationList(row, data.status)
-                    break
-            
-            if not exist:
+            station = self._loadStationByMac.find(data.mac)
+            if station is not None:
+                x = station.x
+                y = station.y
+                z = station.z
+                data.x = x
+                data.y = y
+                data.z = z
+                
+                x_item = QTableWidgetItem(f"{x:.2f}")
+                y_item = QTableWidgetItem(f"{y:.2f}")
+                z_item = QTableWidgetItem(f"{z:.2f}")
+                
+                self.ui.anchorTable.setItem(row, 3, x_item)
+                self.ui.anchorTable.setItem(row, 4, y_item)
+                self.ui.anchorTable.setItem(row, 5, z_item)
+                
+                self.anchPosG(row, data.anchorId, data.groupId, x, y, z, data.status, False)
+                self.setStationList(row, data.status)
+            else:
+                data.x = 0.0
+                data.y = 0.0
+                data.z = 2.0
                 self.anchPosG(row, data.anchorId, data.groupId, 0, 0, 2, data.status, False)
                 self.setStationList(row, data.status)
     
     def itemSelectionChanged(self):
         """标签表格选择改变"""
         selected_items = self.ui.tagTable.selectedItems()
-        # 处理选择改变
+        
+        # 只为选中的标签绘制定位圆
+        selected_tags = set()
+        for row in {item.row() for item in selected_items}:
+            id_item = self.ui.tagTable.item(row, 16)  # ColumnIDr
+            if id_item and id_item.text():
+                selected_tags.add(int(id_item.text(), 16))
+        self._tagLayer.setSelectedTags(selected_tags)
     
     def itemSelectionChangedAnc(self):
         """基站表格选择改变"""
         selected_items = self.ui.anchorTable.selectedItems()
         # 处理选择改变
     
+    @instrumented()
     def tagTableChanged(self, row, column):
         """标签表格内容改变"""
         if not self._ignore:
@@ -567,8 +914,7 @@ class GraphicsWidget(QWidget):
             if column == 0:  # ColumnID - 标签改变
                 new_label = self.ui.tagTable.item(row, column).text()
                 tag.tagLabelStr = new_label
-                if tag.tagLabel:
-                    tag.tagLabel.setText(new_label)
+                self._tagLayer.setTagLabel(tag_id, new_label)
                 
                 # 更新标签映射
                 self._tagLabels[tag_id] = new_label
@@ -577,16 +923,14 @@ class GraphicsWidget(QWidget):
                 item = self.ui.tagTable.item(row, column)
                 tag.LocatingcircleShow[row] = (item.checkState() == Qt.Checked)
                 self.status[row] = tag.LocatingcircleShow[row]
+                self._tagLayer.setTagRangesVisible(tag_id, tag.LocatingcircleShow[row])
     
     def anchorTableChanged(self, row, column):
-        """基站表格内容改变"""
+        """基站表格内容改变（用户编辑），只处理handleTableUpdate已建立快照的行"""
         if not self._ignore:
-            self._ignore = True
-            
-            anc = self._anchors.get(row)
-            if not anc:
-                self._ignore = False
+            if row >= len(self._anchorKeys):
                 return
+            self._ignore = True
             
             if column == 0:  # AnchorColumnGroup - 组ID改变
                 self._handle_group_change(row)
@@ -610,12 +954,11 @@ class GraphicsWidget(QWidget):
             try:
                 group_no = int(group_item.text())
                 
-                for station in self.baseStationList:
-                    if station.ip == ip:
-                        station.set_groupId = group_no
-                        if group_no != station.groupId:
-                            self.updateGroupID.emit(ip, group_no)
-                        break
+                station = self._baseStationByIp.find(ip)
+                if station is not None:
+                    station.set_groupId = group_no
+                    if group_no != station.groupId:
+                        self.updateGroupID.emit(ip, group_no)
             except ValueError:
                 pass
     
@@ -647,6 +990,9 @@ class GraphicsWidget(QWidget):
             
             # 更新基站位置
             self.anchPos(row, x, y, z, True, False)
+            if row < len(self._anchorPositions):
+                self._anchorPositions[row] = (x, y, z)
+                self._emitPositionChanges([row])
             
         except ValueError:
             pass
@@ -691,14 +1037,26 @@ class GraphicsWidget(QWidget):
         
         if column == 6:  # ColumnR95 - 切换R95显示
             item = self.ui.tagTable.item(row, column)
-            tag.r95Show = (item.checkState() == Qt.Checked)
+            r95Show = (item.checkState() == Qt.Checked)
+            if r95Show and not tag.r95Show:
+                # 重新开始静态精度统计
+                tag.accuracy.reset()
+            tag.r95Show = r95Show
+            self._tagLayer.setTagR95Visible(tag_id, tag.r95Show)
         
         elif column == 0:  # ColumnID - 切换标签显示
             item = self.ui.tagTable.item(row, column)
             tag.showLabel = (item.checkState() == Qt.Checked)
-            
-            if tag.tagLabel:
-                tag.tagLabel.setOpacity(1.0 if tag.showLabel else 0.0)
+            self._tagLayer.setTagLabelVisible(tag_id, tag.showLabel)
+    
+    def tagLayerClicked(self, tag_id):
+        """标签图层中的标签被点击，选中表格对应行"""
+        t = [""]
+        self.tagIDToString(tag_id, t)
+        ridx = self.findTagRowIndex(t[0])
+        if ridx != -1:
+            self.ui.tagTable.selectRow(ridx)
+            self._selectedTagIdx = ridx
     
     def tagIDToString(self, tag_id, t):
         """标签ID转字符串"""
@@ -769,37 +1127,168 @@ class GraphicsWidget(QWidget):
         pass
     
     def anchPos(self, anch_id, x, y, z, show, updatetable):
-        """设置基站位置"""
-        # 这里需要实现基站位置设置逻辑
-        pass
+        """设置基站表格第anch_id行基站的位置，2D、3D和健康监测都在这里更新"""
+        # 定位圆以基站为圆心绘制，健康监测按同一行计算残差
+        self._tagLayer.setAnchorPosition(anch_id, x, y)
+        self.anchorHealth.setAnchorPosition(anch_id, x, y, z)
+        self.updateAnchorList3D.emit(anch_id, show, True, x, y, z)
     
     def anchPosG(self, anch_id, anchindex, groupid, x, y, z, show, update):
         """设置基站位置（带组信息）"""
-        # 这里需要实现基站位置设置逻辑
-        pass
+        self.anchPos(anch_id, x, y, z, show, update)
     
-    def tagPos(self, tag_id, x, y, z):
-        """设置标签位置"""
-        # 这里需要实现标签位置设置逻辑
-        pass
+    def _get_tag(self, tag_id):
+        """获取标签，不存在时创建并加入表格"""
+        tag = self._tags.get(tag_id)
+        if tag is None:
+            tag = Tag()
+            tag.id = tag_id
+            tag.idx = len(self._tags)
+            tag.tagLabelStr = self._tagLabels.get(tag_id, f"Tag {tag_id & 0xFFFF:04X}")
+            tag.colourH = (tag.idx * 0.618033988749895) % 1.0
+            tag.colourS = 0.7
+            tag.colourV = 0.9
+            self._tags[tag_id] = tag
+            
+            self.addNewTag(tag_id)
+            self._tagLayer.setTagLabel(tag_id, tag.tagLabelStr)
+            self._tagLayer.setTagColour(tag_id, QColor.fromHsvF(tag.colourH, tag.colourS, tag.colourV))
+        return tag
+    
+    def tagPos(self, tag_id, x, y, z, quality=float("nan")):
+        """设置标签位置，quality为解算残差（米），未知时为NaN"""
+        tag = self._get_tag(tag_id)
+        self.trajectory.append(time.time(), tag_id, x, y, z, quality)
+        if not self._playback:
+            self._tagLayer.setTagPosition(tag_id, x, y, z)
+        self.anchorHealth.setTagPosition(tag_id, x, y, z)
+        self.heatmap.addPosition(tag_id, x, y)
+        self.tagPos3D.emit(tag_id, x, y, z)
+        
+        # 静态精度统计
+        accuracy = tag.accuracy
+        accuracy.add(x, y, z)
+        mx, my, mz = accuracy.mean
+        self.tagStats(tag_id, mx, my, mz, accuracy.r95())
+    
+    def setPlaybackActive(self, active):
+        """进入/退出轨迹回放，退出后由实时数据重新显示标签"""
+        if self._playback == active:
+            return
+        self._playback = active
+        self._playbackTags.clear()
+        if active:
+            # 回放帧只包含有样本的标签，先隐藏实时显示的标签及其R95圆和定位圆
+            for tag_id in list(self._tagLayer.tags()):
+                self._tagLayer.hideTag(tag_id)
+                self._tagLayer.clearTagRanges(tag_id)
+                self._tagLayer.setTagStats(tag_id, 0.0, 0.0, 0.0)
+        self._tagLayer.clearHistory()
+    
+    def showPlaybackFrame(self, frame):
+        """显示回放帧中的标签位置，隐藏该时刻没有样本的标签"""
+        if not self._playback:
+            return
+        present = set(frame.tagIds)
+        for tag_id in self._playbackTags - present:
+            self._tagLayer.hideTag(tag_id)
+        for i, tag_id in enumerate(frame.tagIds):
+            self._tagLayer.setTagPosition(tag_id, frame.x[i], frame.y[i], frame.z[i])
+        self._playbackTags = present
+    
+    def clearPlaybackHistory(self):
+        """回放跳转后清除历史轨迹，避免连到跳转前的位置"""
+        self._tagLayer.clearHistory()
+    
+    def setHeatmapVisible(self, visible):
+        """显示/隐藏热力图，隐藏时仍继续累计"""
+        self.heatmap.visible = visible
+        self.graphicsView().viewport().update()
+    
+    def clearHeatmap(self):
+        """清除热力图累计数据"""
+        self.heatmap.clear()
+        self.graphicsView().viewport().update()
+    
+    def _heatmap_timeout(self):
+        """整批累加缓存的标签位置，显示时重绘"""
+        if self.heatmap.commit() and self.heatmap.visible:
+            self.graphicsView().viewport().update()
+    
+    def _heatmap_floorplan_changed(self):
+        """平面图改变时让热力图网格与平面图对齐"""
+        viewSettings = self.graphicsView()._viewSettings
+        pm = viewSettings.floorplanPixmap()
+        if viewSettings.getFloorplanShow() and not pm.isNull():
+            self.heatmap.setFloorplan(pm.size(), viewSettings.floorplanTransform())
+    
+    def applySolutions(self, solutions):
+        """应用流水线合并后的解算结果，按序号丢弃过期结果，同一标签只显示最新位置"""
+        latest = {}
+        applied = self._solutionSeq
+        for s in solutions:
+            if s.resultSeq <= applied.get(s.tagId, 0):
+                continue
+            applied[s.tagId] = s.resultSeq
+            tag = self._get_tag(s.tagId)
+            if tag.groupId != s.groupId:
+                # 标签换到其他组，之前的测距对应另一组的基站
+                tag.groupId = s.groupId
+                self._tagLayer.clearTagRanges(s.tagId)
+            for a_id, range_val in s.ranges.items():
+                self.tagRange(s.tagId, a_id, range_val, s.rxPower.get(a_id), s.groupId)
+            latest[s.tagId] = s
+        for s in latest.values():
+            self.tagPos(s.tagId, s.x, s.y, s.z, s.residual)
     
     def tagStats(self, tag_id, x, y, z, r95):
         """设置标签统计信息"""
-        # 这里需要实现标签统计设置逻辑
-        pass
-    
-    def tagRange(self, tag_id, a_id, range_val, rx_power):
-        """设置标签范围"""
-        # 这里需要实现标签范围设置逻辑
-        pass
+        tag = self._get_tag(tag_id)
+        if not self._playback:
+            self._tagLayer.setTagStats(tag_id, x, y, r95)
+        
+        # 只在显示值改变时更新表格
+        r95Cm = int(round(r95 * 100))
+        if r95Cm != tag.r95Cm:
+            tag.r95Cm = r95Cm
+            t = [""]
+            self.tagIDToString(tag_id, t)
+            ridx = tag.ridx
+            item = self.ui.tagTable.item(ridx, 16)  # ColumnIDr
+            if not item or item.text() != t[0]:
+                ridx = self.findTagRowIndex(t[0])
+                tag.ridx = ridx
+            if ridx != -1:
+                r95_item = self.ui.tagTable.item(ridx, 6)  # ColumnR95
+                if r95_item:
+                    ignore = self._ignore
+                    self._ignore = True
+                    r95_item.setText(str(r95Cm))
+                    self._ignore = ignore
+    
+    def tagRange(self, tag_id, a_id, range_val, rx_power, group_id=0):
+        """设置标签到组内第a_id号基站的测距，按基站表格行绘制定位圆"""
+        self._get_tag(tag_id)
+        row = self.anchorRow(group_id, a_id)
+        if row is None:
+            return
+        if not self._playback:
+            self._tagLayer.setTagRange(tag_id, row, range_val)
+        self.anchorHealth.reportRange(row, tag_id, range_val, rx_power)
     
     def setTagSize(self, size):
         """设置标签大小"""
         self._tagSize = size
+        self._tagLayer.setTagSize(size)
     
     def setShowTagHistory(self, show):
         """设置显示标签历史"""
         self._showHistory = show
+        self._tagLayer.setShowHistory(show)
+    
+    def setShowAllLocatingCircles(self, show):
+        """设置是否显示所有标签的定位圆（默认只显示选中标签）"""
+        self._tagLayer.setShowAllRangeCircles(show)
     
     def setShowTagAncTable(self, anchorTable, tagTable, ancTagCorr):
         """设置显示表格"""
@@ -821,6 +1310,7 @@ class GraphicsWidget(QWidget):
     def tagHistoryNumber(self, value):
         """设置标签历史数量"""
         self._historyLength = value
+        self._tagLayer.setHistoryLength(value)
     
     def zone(self, zone, radius, red):
         """设置区域"""
@@ -837,14 +1327,50 @@ class GraphicsWidget(QWidget):
         pass
     
     def ancRanges(self, a01, a02, a12):
-        """设置基站范围"""
-        # 这里需要实现基站范围设置逻辑
-        pass
+        """设置基站范围（前3个基站之间的测距）"""
+        self.anchorRange(0, 1, a01)
+        self.anchorRange(0, 2, a02)
+        self.anchorRange(1, 2, a12)
+    
+    def anchorRange(self, anc_a, anc_b, range_val):
+        """自标定期间收到基站之间的测距"""
+        if self._calibrationRanges is None:
+            return
+        self.reseveSetok = True
+        self._calibrationRanges.addRange(anc_a, anc_b, range_val)
     
     def calibrationButtonClicked(self):
-        """校准按钮点击"""
-        # 这里需要实现校准逻辑
-        pass
+        """校准按钮点击，开始采集基站之间的测距"""
+        self._calibrationRanges = RangeCollector()
+        self.reseveSetok = False
+        self.signalTimeOut = False
+        self.m_calibrationTimer_100ms.start()
+        self.calibrationTimerRestart()
+    
+    def finishCalibration(self):
+        """结束采集并求解基站坐标"""
+        collector = self._calibrationRanges
+        self._calibrationRanges = None
+        self.m_calibrationTimer_100ms.stop()
+        self.calibrationTimerStop()
+        if collector is None:
+            return
+        
+        n = collector.anchorCount()
+        heights = []
+        for row in range(n):
+            z_item = self.ui.anchorTable.item(row, 5)
+            try:
+                heights.append(float(z_item.text()) if z_item and z_item.text() else 2.0)
+            except ValueError:
+                heights.append(2.0)
+        
+        ranges, weights = collector.matrices()
+        result = calibrateAnchors(ranges, weights, heights)
+        if result.success:
+            self.calibrationSuccess(result)
+        else:
+            self.calibrationFailed(result)
     
     def helpBtnReleased(self):
         """帮助按钮释放"""
@@ -859,6 +1385,7 @@ class GraphicsWidget(QWidget):
     def setCanvasInfoVisible(self, visible):
         """设置画布信息可见"""
         self.canvasInfomationVisible = visible
+        self.canvasInfo.setInfoVisible(visible)
         if self.m_QQuickWidget:
             self.m_QQuickWidget.setVisible(visible)
     
@@ -894,13 +1421,13 @@ class GraphicsWidget(QWidget):
     def rotateChanged(self, rotate):
         """旋转改变"""
         self.canvas_rotate = rotate
-        if self.m_QQuickWidget:
-            self.m_QQuickWidget.rootContext().setContextProperty("canvas_rotate", round(rotate,2))
+        self.canvasInfo.setRotate(rotate)
     
-    def visibleRectChanged(self):
+    def visibleRectChanged(self, rect=None):
         """可见矩形改变"""
-        # 这里需要实现可见矩形改变逻辑
-        pass
+        self._tagLayer.setVisibleRect(self.graphicsView().visibleRect())
+        transform = self.graphicsView().transform()
+        self._tagLayer.setPixelsPerMeter(math.hypot(transform.m11(), transform.m12()))
     
     def resetButtonClicked(self):
         """重置按钮点击 - 重置角度和位置"""
@@ -919,8 +1446,7 @@ class GraphicsWidget(QWidget):
     def scaleChanged(self, scale):
         """缩放改变"""
         self.canvas_scale = str(round(scale, 2))
-        if self.m_QQuickWidget:
-            self.m_QQuickWidget.rootContext().setContextProperty("canvas_scale", self.canvas_scale)
+        self.canvasInfo.setScale(scale)
     
     def onOriginPositionChanged(self, x, y):
         """
@@ -929,9 +1455,7 @@ class GraphicsWidget(QWidget):
         """
         self.canvas_posX = str(round(x, 2))
         self.canvas_posY = str(round(y, 2))
-        if self.m_QQuickWidget:
-            self.m_QQuickWidget.rootContext().setContextProperty("canvas_posX", self.canvas_posX)
-            self.m_QQuickWidget.rootContext().setContextProperty("canvas_posY", self.canvas_posY)
+        self.canvasInfo.setPosition(x, y)
     
     def setCanvasFontSize(self, size):
         """设置画布字体大小"""
@@ -973,6 +1497,8 @@ class GraphicsWidget(QWidget):
         """校准超时100ms处理"""
         self.m_calibrationTimer_100ms.stop()
         if not self.reseveSetok:
+            self._calibrationRanges = None
+            self.calibrationTimerStop()
             self.calibrationFailed()
             if self.language:
                 QMessageBox.warning(None, "自标定启动失败", "自标定启动失败，设备不支持该功能或固件版本过低", "我知道了")
@@ -980,9 +1506,10 @@ class GraphicsWidget(QWidget):
                 QMessageBox.warning(None, "Warning", "The device does not support the function or the firmware version is too low.", "OK")
     
     def _calibration_timeout(self):
-        """校准超时处理"""
+        """校准超时处理，采集窗口结束"""
         self.signalTimeOut = True
         # RTLSDisplayApplication.client().timeOutWarning()
+        self.finishCalibration()
     
     def calibrationTimerRestart(self):
         """重启校准定时器"""
@@ -995,15 +1522,57 @@ class GraphicsWidget(QWidget):
         if self.m_calibrationTimer:
             self.m_calibrationTimer.stop()
     
-    def calibrationFailed(self):
+    def calibrationFailed(self, result=None):
         """校准失败"""
-        # 这里需要实现校准失败逻辑
-        pass
+        if result is not None:
+            print(f"Error calibrating anchors: {result.message}")
+            self.calibrationFinished.emit(result)
     
-    def calibrationSuccess(self):
-        """校准成功"""
-        # 这里需要实现校准成功逻辑
-        pass
+    def calibrationSuccess(self, result):
+        """校准成功，把基站坐标写入基站表格"""
+        ignore = self._ignore
+        self._ignore = True
+        rows = []
+        for row, (x, y, z) in enumerate(result.positions):
+            if row >= self.ui.anchorTable.rowCount():
+                break
+            for column, value in ((3, x), (4, y), (5, z)):
+                value = round(float(value), 2) + 0.0  # 避免显示-0.00
+                self.ui.anchorTable.setItem(row, column, QTableWidgetItem(f"{value:.2f}"))
+                self.updateAnchorXYZ.emit(row, column, float(value))
+            self.anchPos(row, x, y, z, True, False)
+            if row < len(self._anchorPositions):
+                self._anchorPositions[row] = (float(x), float(y), float(z))
+                rows.append(row)
+        self._ignore = ignore
+        self._emitPositionChanges(rows)
+        self.calibrationFinished.emit(result)
+    
+    def anchorTablePositions(self):
+        """读取基站表格中的基站坐标，返回 (N, 3) 数组，无法解析的行为NaN"""
+        positions = np.full((self.ui.anchorTable.rowCount(), 3), np.nan)
+        for row in range(len(positions)):
+            for i, column in enumerate((3, 4, 5)):
+                item = self.ui.anchorTable.item(row, column)
+                try:
+                    positions[row, i] = float(item.text())
+                except (AttributeError, ValueError):
+                    pass
+        return positions
+    
+    def applyRangeCorrections(self, result):
+        """把测距偏差估计结果写入基站表格的T0-T7校正列，只写有样本的基站-标签对"""
+        ignore = self._ignore
+        self._ignore = True
+        rows = min(len(result.count), self.ui.anchorTable.rowCount())
+        for row in range(rows):
+            for tag_idx in range(min(result.count.shape[1], MAX_CORRECTION_TAGS)):
+                if result.count[row, tag_idx] == 0:
+                    continue
+                value = result.correctionCm(row, tag_idx)
+                self.ui.anchorTable.setItem(row, 8 + tag_idx, QTableWidgetItem(str(value)))
+                self.updateTagCorrection.emit(row, tag_idx, value)
+        self._ignore = ignore
     
     def event(self, event):
         """事件处理"""
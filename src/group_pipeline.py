@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GroupPipeline - 多组（多网络）数据处理流水线
+按组ID划分上报数据，每个组在独立的工作线程中完成解析、解算和滤波，
+CPU密集的位置解算成批交给SolverService在进程池中完成，
+结果带全局序号，在GUI线程中按帧合并后发出。
+测距数据由接收端（串口/网络连接）调用GroupPipeline.submit()送入，
+本程序中的连接尚未接入，submit()目前只作为接口提供
+"""
+
+import itertools
+import queue
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import solver
+from nlos_filter import NlosFilter
+from solver_service import SolverService
+
+MC_ANCHORS = 4  # mc报文中的测距数量
+
+
+class RangeReport:
+    """一次测距上报"""
+    def __init__(self):
+        self.groupId = 0
+        self.tagId = 0
+        self.seq = 0
+        self.timestamp = 0.0
+        self.ranges = {}  # 基站ID -> 测距（米）
+        self.rxPower = {}  # 基站ID -> 接收功率（dBm）
+
+
+class TagSolution:
+    """一次解算结果"""
+    def __init__(self):
+        self.groupId = 0
+        self.tagId = 0
+        self.seq = 0
+        self.resultSeq = 0  # 流水线分配的全局序号，单调递增
+        self.timestamp = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.z = 0.0
+        self.residual = 0.0  # 测距残差均方根（米）
+        self.outliers = []  # 被判为NLOS而剔除的基站ID
+        self.ranges = {}
+        self.rxPower = {}
+
+
+def parseMcLine(line, groupId=0, timestamp=None):
+    """
+    解析DecaWave格式的mc测距报文，例如
+    mc 0f 00000663 000005a3 00000512 000004cb 095b c0 40424042 a0:0
+    无法解析时返回None
+    """
+    fields = line.split()
+    if len(fields) < 10 or fields[0] != "mc":
+        return None
+    try:
+        mask = int(fields[1], 16)
+        values = [int(v, 16) for v in fields[2:2 + MC_ANCHORS]]
+        seq = int(fields[7], 16)
+        tagId = int(fields[9][1:].split(":")[0])  # aT:A / tT:A，T为标签ID
+    except ValueError:
+        return None
+
+    report = RangeReport()
+    report.groupId = groupId
+    report.tagId = tagId
+    report.seq = seq
+    report.timestamp = time.monotonic() if timestamp is None else timestamp
+    for anc_idx, mm in enumerate(values):
+        if mask & (1 << anc_idx):
+            report.ranges[anc_idx] = mm / 1000.0
+    return report
+
+
+class PositionFilter:
+    """逐标签的指数平滑滤波"""
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self._state = {}  # tag_id -> np.array(3)
+
+    def apply(self, tagId, p):
+        """滤波并返回新的位置"""
+        prev = self._state.get(tagId)
+        if prev is None or self.alpha >= 1.0:
+            out = np.array(p, dtype=float)
+        else:
+            out = prev + self.alpha * (p - prev)
+        self._state[tagId] = out
+        return out
+
+    def last(self, tagId):
+        """上一次的位置，没有则返回None"""
+        return self._state.get(tagId)
+
+    def reset(self):
+        """清除滤波状态"""
+        self._state.clear()
+
+
+class GroupWorker:
+    """单个组的处理线程"""
+
+    BATCH_SIZE = 64  # 每批最多提交的上报数量
+    BATCH_WAIT = 0.005  # 凑批等待时间（秒）
+
+    def __init__(self, groupId, pipeline):
+        self.groupId = groupId
+        self._pipeline = pipeline
+        self._input = queue.Queue()
+        self._anchors = {}  # 基站ID -> (x, y, z)
+        self._anchorsLock = threading.Lock()
+        self.filter = PositionFilter()
+        self.nlos = NlosFilter()
+        self.fixedZ = None
+        self.processed = 0
+        self.dropped = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"group-{groupId}", daemon=True)
+        self._thread.start()
+
+    def setAnchor(self, anchorId, x, y, z):
+        """设置基站坐标"""
+        with self._anchorsLock:
+            self._anchors[anchorId] = (x, y, z)
+
+    def removeAnchor(self, anchorId):
+        """移除基站"""
+        with self._anchorsLock:
+            self._anchors.pop(anchorId, None)
+
+    def put(self, item):
+        """提交原始报文（str）或RangeReport"""
+        self._input.put(item)
+
+    def pending(self):
+        """等待处理的数量"""
+        return self._input.qsize()
+
+    def stop(self):
+        """停止线程"""
+        self._running = False
+        self._input.put(None)
+        self._thread.join(1.0)
+
+    def _nextBatch(self):
+        """取一批数据，第一个阻塞等待，其余最多等待BATCH_WAIT"""
+        item = self._input.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.BATCH_WAIT
+        while len(batch) < self.BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._input.get(timeout=timeout) if timeout > 0 else self._input.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        """线程主循环：解析 -> 解算 -> 滤波"""
+        while self._running:
+            batch = self._nextBatch()
+            if batch is None:
+                break
+            try:
+                self._process(batch)
+            except Exception as e:
+                print(f"Error processing group {self.groupId}: {e}")
+
+    def _process(self, batch):
+        """处理一批数据"""
+        # 解析
+        reports = []
+        for item in batch:
+            report = parseMcLine(item, self.groupId) if isinstance(item, str) else item
+            if report is None or not report.ranges:
+                self.dropped += 1
+                continue
+            reports.append(report)
+        if not reports:
+            return
+
+        with self._anchorsLock:
+            anchorIds = sorted(self._anchors)
+            anchors = np.array([self._anchors[a] for a in anchorIds], dtype=float).reshape(-1, 3)
+        if len(anchorIds) < solver.MIN_ANCHORS:
+            self.dropped += len(reports)
+            return
+        column = {a: i for i, a in enumerate(anchorIds)}
+
+        # 解算输入矩阵，以上一次的滤波结果作为初值
+        ranges = np.full((len(reports), len(anchorIds)), np.nan)
+        rxPower = np.full((len(reports), len(anchorIds)), np.nan)
+        initials = np.full((len(reports), 3), np.nan)
+        for row, report in enumerate(reports):
+            for anchorId, r in report.ranges.items():
+                col = column.get(anchorId)
+                if col is not None:
+                    ranges[row, col] = r
+            for anchorId, p in report.rxPower.items():
+                col = column.get(anchorId)
+                if col is not None:
+                    rxPower[row, col] = p
+            last = self.filter.last(report.tagId)
+            if last is not None:
+                initials[row] = last
+
+        # NLOS剔除：按接收功率和相对上一次位置的残差加权
+        weights = self.nlos.weights(anchors, ranges, rxPower, initials)
+        positions, rms = self._pipeline.solve(anchors, ranges, initials, self.fixedZ, weights)
+
+        # 没有初值的行（新标签）做RANSAC：轮流去掉一个测距解算，取一致性最好的位置
+        fresh = np.flatnonzero(np.isnan(initials[:, 0]) & np.isfinite(positions[:, 0]))
+        if len(fresh):
+            self._ransac(anchors, ranges[fresh], weights[fresh], positions, fresh)
+
+        # 按本次解算结果重新计算权重，权重明显变化的行（没有初值或初值已过期）再解算一次
+        refined = self.nlos.weights(anchors, ranges, rxPower, positions)
+        redo = np.flatnonzero(np.any(np.abs(refined - weights) > 0.1, axis=1)
+                              & np.isfinite(positions[:, 0]))
+        if len(redo):
+            p, r = self._pipeline.solve(anchors, ranges[redo], positions[redo], self.fixedZ, refined[redo])
+            positions[redo] = p
+            rms[redo] = r
+            weights[redo] = refined[redo]
+        self.nlos.record(ranges, weights)
+
+        # 滤波
+        solutions = []
+        for row, report in enumerate(reports):
+            if not np.isfinite(positions[row, 0]):
+                self.dropped += 1
+                continue
+            p = self.filter.apply(report.tagId, positions[row])
+            s = TagSolution()
+            s.groupId = self.groupId
+            s.tagId = report.tagId
+            s.seq = report.seq
+            s.timestamp = report.timestamp
+            s.x, s.y, s.z = float(p[0]), float(p[1]), float(p[2])
+            s.residual = float(rms[row])
+            s.outliers = [anchorIds[col] for col in np.flatnonzero(weights[row] == 0)
+                          if np.isfinite(ranges[row, col])]
+            s.ranges = report.ranges
+            s.rxPower = report.rxPower
+            solutions.append(s)
+        self.processed += len(solutions)
+        self._pipeline._publish(solutions)
+
+    def _ransac(self, anchors, ranges, weights, positions, rows):
+        """对rows行生成去一假设并整批解算，一致性更好时替换positions中的结果"""
+        hypRows, hypWeights = self.nlos.hypotheses(ranges, weights)
+        if not len(hypRows):
+            return
+        hypPositions, _ = self._pipeline.solve(
+            anchors, ranges[hypRows], positions[rows[hypRows]], self.fixedZ, hypWeights)
+        best = self.nlos.consensus(anchors, ranges, positions[rows])
+        scores = self.nlos.consensus(anchors, ranges[hypRows], hypPositions)
+        for k in np.flatnonzero(scores > best[hypRows]):
+            i = hypRows[k]
+            if scores[k] > best[i]:
+                best[i] = scores[k]
+                positions[rows[i]] = hypPositions[k]
+
+
+class GroupPipeline(QObject):
+    """多组处理流水线"""
+
+    # 信号定义
+    solutionsReady = pyqtSignal(object)  # list[TagSolution]，每帧一次
+    groupAdded = pyqtSignal(int)
+
+    FRAME_INTERVAL = 16  # 合并结果的间隔（毫秒）
+
+    def __init__(self, parent=None, processes=None, useProcesses=True):
+        super().__init__(parent)
+        self._workers = {}  # 组ID -> GroupWorker
+        self._anchorKeys = {}  # 基站表格行 -> 当前所在的 (组ID, 基站ID)
+        self._workersLock = threading.Lock()
+        self._output = queue.SimpleQueue()
+        self._outputLock = threading.Lock()
+        self._resultSeq = itertools.count(1)
+        self._solver = SolverService(processes=processes, useProcesses=useProcesses)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    # ========== 输入 ==========
+
+    def worker(self, groupId):
+        """获取组的处理线程，不存在时创建"""
+        w = self._workers.get(groupId)
+        if w is None:
+            with self._workersLock:
+                w = self._workers.get(groupId)
+                if w is None:
+                    w = GroupWorker(groupId, self)
+                    self._workers[groupId] = w
+                    self.groupAdded.emit(groupId)
+        return w
+
+    def workers(self):
+        """所有组的处理线程"""
+        return dict(self._workers)
+
+    def submit(self, groupId, item):
+        """提交一条原始报文或RangeReport（数据入口，由接收端在收到报文时调用）"""
+        self.worker(groupId).put(item)
+
+    def setAnchor(self, groupId, anchorId, x, y, z):
+        """设置组内基站坐标"""
+        self.worker(groupId).setAnchor(anchorId, x, y, z)
+
+    def applyAnchorChanges(self, changes):
+        """根据基站变化集合更新各组的基站坐标，基站换组或改ID时从原来的组中移除"""
+        for row in changes.rows():
+            station = changes.stations[row]
+            groupId = station.set_groupId or station.groupId
+            key = (groupId, station.anchorId)
+            old = self._anchorKeys.get(row)
+            if old is not None and old != key:
+                self.worker(old[0]).removeAnchor(old[1])
+            self._anchorKeys[row] = key
+            self.setAnchor(groupId, station.anchorId, station.x, station.y, station.z)
+
+    # ========== 解算 ==========
+
+    def solverService(self):
+        """获取解算服务"""
+        return self._solver
+
+    def solve(self, anchors, ranges, initials, fixedZ, weights=None):
+        """批量加权解算，进程池不可用时由解算服务在当前线程解算"""
+        return self._solver.solve(anchors, ranges, initials, fixedZ, weights)
+
+    # ========== 输出 ==========
+
+    def _publish(self, solutions):
+        """工作线程提交结果，按提交顺序分配全局序号"""
+        if solutions:
+            with self._outputLock:
+                for s in solutions:
+                    s.resultSeq = next(self._resultSeq)
+                self._output.put(solutions)
+
+    def flush(self):
+        """在GUI线程中合并各组结果并发出"""
+        merged = []
+        while True:
+            try:
+                merged.extend(self._output.get_nowait())
+            except queue.Empty:
+                break
+        if merged:
+            self.solutionsReady.emit(merged)
+
+    def stop(self):
+        """停止所有工作线程和进程池"""
+        self._timer.stop()
+        with self._workersLock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for w in workers:
+            w.stop()
+        self._solver.stop()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HeatmapLayer - 标签停留时间热力图
+把标签的停留时间累加到与平面图对齐的二维直方图网格中：
+位置先在列表中缓存，定时用np.add.at整批累加，可选按半衰期衰减，
+显示时使用缓存的QImage，只在数据改变且到达刷新间隔时重新生成
+"""
+
+import math
+import time
+
+import numpy as np
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage, QTransform
+
+CELL_SIZE = 0.25  # 网格边长（米）
+MAX_DWELL = 2.0  # 单个样本最多计入的停留时间（秒），避免断线后一次计入很长时间
+DEFAULT_AREA = QRectF(-50.0, -50.0, 100.0, 100.0)  # 没有平面图时的统计范围（米）
+
+
+def _colourTable():
+    """256色查找表（ARGB32预乘），从透明的蓝色经绿色、黄色到不透明的红色"""
+    stops = np.array([[0.0, 0, 0, 255, 0], [0.25, 0, 160, 255, 90], [0.5, 0, 220, 60, 140],
+                      [0.75, 255, 220, 0, 180], [1.0, 230, 30, 0, 220]])
+    v = np.linspace(0.0, 1.0, 256)
+    r, g, b, a = (np.interp(v, stops[:, 0], stops[:, k]) for k in range(1, 5))
+    # 预乘alpha
+    r, g, b = (c * a / 255 for c in (r, g, b))
+    table = (a.astype(np.uint32) << 24) | (r.astype(np.uint32) << 16) | (g.astype(np.uint32) << 8) | b.astype(np.uint32)
+    table[0] = 0
+    return table
+
+
+class HeatmapLayer:
+    """停留时间热力图网格"""
+
+    REFRESH_INTERVAL = 1.0  # 重新生成图像的最小间隔（秒）
+
+    def __init__(self, cellSize=CELL_SIZE, halfLife=None):
+        self.cellSize = cellSize
+        self.halfLife = halfLife  # 衰减半衰期（秒），None表示不衰减
+        self.visible = False
+        self.grid = np.zeros((1, 1))
+        self._cellToScene = QTransform()
+        self._sceneToCell = np.eye(3)
+        self._lastSeen = {}  # tag_id -> 上次样本时间
+        self._pending = []  # 待累加的 (x, y, 停留时间)
+        self._lastDecay = None
+        self._image = None
+        self._imageTime = 0.0
+        self._dirty = False
+        self._colours = _colourTable()
+        self.setArea(DEFAULT_AREA)
+
+    # ========== 网格 ==========
+
+    def _setGrid(self, cellToScene, cols, rows):
+        """设置网格到场景的变换和大小，网格改变时清空累计数据"""
+        if cellToScene == self._cellToScene and self.grid.shape == (max(rows, 1), max(cols, 1)):
+            return
+        self._cellToScene = cellToScene
+        inverse, ok = cellToScene.inverted()
+        if not ok:
+            print("Error configuring heatmap grid: transform is not invertible")
+            return
+        self._sceneToCell = np.array([[inverse.m11(), inverse.m21(), inverse.dx()],
+                                      [inverse.m12(), inverse.m22(), inverse.dy()]])
+        self.grid = np.zeros((max(rows, 1), max(cols, 1)))
+        self._image = None
+        self._dirty = True
+
+    def setArea(self, rect):
+        """没有平面图时按场景矩形（米）建立网格"""
+        cols = int(math.ceil(rect.width() / self.cellSize))
+        rows = int(math.ceil(rect.height() / self.cellSize))
+        self._setGrid(QTransform(self.cellSize, 0, 0, self.cellSize, rect.left(), rect.top()), cols, rows)
+
+    def setFloorplan(self, size, floorplanTransform):
+        """
+        按平面图建立网格：网格与平面图图像边缘和方向对齐，覆盖整个图像
+        size: 图像大小（QSize）；floorplanTransform: ViewSettings.floorplanTransform()
+        """
+        # 与GraphicsView.drawFloorplan一致：图像像素 -> 翻转 -> 平面图变换 -> 场景
+        pixelToScene = (QTransform().translate(0, -size.height()) * QTransform().scale(1, -1)
+                        * QTransform(floorplanTransform))
+        metresPerPixel = math.hypot(floorplanTransform.m11(), floorplanTransform.m12())
+        if metresPerPixel <= 0:
+            self.setArea(DEFAULT_AREA)
+            return
+        cellPixels = self.cellSize / metresPerPixel
+        cols = int(math.ceil(size.width() / cellPixels))
+        rows = int(math.ceil(size.height() / cellPixels))
+        self._setGrid(QTransform().scale(cellPixels, cellPixels) * pixelToScene, cols, rows)
+
+    # ========== 累加 ==========
+
+    def addPosition(self, tag_id, x, y, t=None):
+        """记录一个标签位置，停留时间为与该标签上一个样本的间隔"""
+        t = time.monotonic() if t is None else t
+        last = self._lastSeen.get(tag_id)
+        self._lastSeen[tag_id] = t
+        if last is None:
+            return
+        self._pending.append((x, y, min(max(t - last, 0.0), MAX_DWELL)))
+
+    def commit(self, now=None):
+        """把缓存的位置整批累加到网格，返回是否需要重绘（网格改变，或之前的改变到了刷新间隔）"""
+        now = time.monotonic() if now is None else now
+        changed = self._decay(now)
+        if self._pending:
+            samples = np.array(self._pending, dtype=float)
+            self._pending = []
+            cells = self._sceneToCell[:, :2] @ samples[:, :2].T + self._sceneToCell[:, 2:]
+            col = np.floor(cells[0]).astype(np.int64)
+            row = np.floor(cells[1]).astype(np.int64)
+            rows, cols = self.grid.shape
+            inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+            if inside.any():
+                np.add.at(self.grid, (row[inside], col[inside]), samples[inside, 2])
+                changed = True
+        self._dirty |= changed
+        # 刷新间隔内的改变没有重新生成图像，间隔到达后也要求重绘
+        return changed or (self._dirty and now - self._imageTime >= self.REFRESH_INTERVAL)
+
+    def _decay(self, now):
+        """按半衰期衰减累计值"""
+        last = self._lastDecay
+        self._lastDecay = now
+        if not self.halfLife or last is None or now <= last:
+            return False
+        self.grid *= 0.5 ** ((now - last) / self.halfLife)
+        return True
+
+    def clear(self):
+        """清除累计数据"""
+        self.grid[:] = 0.0
+        self._pending = []
+        self._lastSeen.clear()
+        self._image = None  # 下次绘制立即显示清空后的网格
+        self._dirty = True
+
+    # ========== 显示 ==========
+
+    def image(self, now=None):
+        """缓存的热力图图像，数据改变且到达刷新间隔时重新生成"""
+        now = time.monotonic() if now is None else now
+        if self._image is None or (self._dirty and now - self._imageTime >= self.REFRESH_INTERVAL):
+            self._image = self._render()
+            self._imageTime = now
+            self._dirty = False
+        return self._image
+
+    def _render(self):
+        """按最大值归一化（平方根压缩）后查表生成ARGB图像"""
+        peak = self.grid.max()
+        if peak > 0:
+            index = (np.sqrt(self.grid / peak) * 255).astype(np.uint8)
+        else:
+            index = np.zeros(self.grid.shape, dtype=np.uint8)
+        pixels = np.ascontiguousarray(self._colours[index])
+        rows, cols = pixels.shape
+        image = QImage(pixels.data, cols, rows, cols * 4, QImage.Format_ARGB32_Premultiplied)
+        return image.copy()  # 脱离numpy缓冲区
+
+    def paint(self, painter):
+        """在场景坐标下绘制热力图"""
+        if not self.visible:
+            return
+        image = self.image()
+        painter.save()
+        painter.setTransform(self._cellToScene, True)
+        painter.drawImage(0, 0, image)
+        painter.restore()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LogView - 运行日志窗口
+logging.Handler把格式化后的日志放入有界缓冲区（任意线程可写），
+日志窗口定时整批取出追加到QPlainTextEdit，窗口只保留最近的若干行
+"""
+
+import collections
+import logging
+
+from PyQt5.QtWidgets import QPlainTextEdit
+from PyQt5.QtCore import QTimer
+
+MAX_LINES = 5000  # 日志窗口保留的行数
+MAX_PENDING = 10000  # 等待显示的日志条数上限，超过时丢弃最旧的
+FLUSH_INTERVAL = 33  # 追加到窗口的间隔（毫秒）
+
+
+class LogFormatter(logging.Formatter):
+    """显示为 [时:分:秒] 消息，警告及以上级别带级别名"""
+
+    def __init__(self):
+        super().__init__("[%(asctime)s] %(message)s", "%H:%M:%S")
+
+    def format(self, record):
+        text = super().format(record)
+        if record.levelno >= logging.WARNING:
+            text = text.replace("] ", f"] {record.levelname}: ", 1)
+        return text
+
+
+class QueueLogHandler(logging.Handler):
+    """把日志放入有界缓冲区，由GUI线程取出"""
+
+    def __init__(self, maxPending=MAX_PENDING):
+        super().__init__()
+        self.setFormatter(LogFormatter())
+        self._pending = collections.deque(maxlen=maxPending)
+        self.dropped = 0  # 缓冲区满时丢弃的条数（取出后清零）
+
+    def emit(self, record):
+        # Handler.handle()已持有self.lock
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(text)
+
+    def take(self):
+        """取出全部等待显示的日志，返回 (行列表, 丢弃条数)"""
+        with self.lock:
+            lines = list(self._pending)
+            self._pending.clear()
+            dropped = self.dropped
+            self.dropped = 0
+        return lines, dropped
+
+
+class LogView(QPlainTextEdit):
+    """只读日志窗口，定时整批追加，超过MAX_LINES时自动删除最旧的行"""
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self._handler = handler
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(MAX_LINES)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+        self._flushTimer = QTimer(self)
+        self._flushTimer.setInterval(FLUSH_INTERVAL)
+        self._flushTimer.timeout.connect(self.flush)
+        self._flushTimer.start()
+
+    def flush(self):
+        """把等待显示的日志一次追加到窗口"""
+        lines, dropped = self._handler.take()
+        if dropped:
+            lines.insert(0, f"... 丢弃 {dropped} 条日志")
+        if not lines:
+            return
+        # 追加多行时只保留最后MAX_LINES行，避免先插入再删除
+        if len(lines) > MAX_LINES:
+            lines = lines[-MAX_LINES:]
+        self.appendPlainText("\n".join(lines))
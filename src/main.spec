@@ -24,7 +24,6 @@ a = Analysis(
         'matplotlib',
         'scipy',
         'pandas',
-        'numpy',
         'PIL',
     ],
     win_no_prefer_redirects=False,
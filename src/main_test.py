@@ -8,6 +8,7 @@ app_main - RTL Display Application 主入口
 import sys
 import os
 import logging
+import multiprocessing
 from pathlib import Path
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt, QTimer
@@ -22,16 +23,8 @@ compile_qrc_file('resources')
 
 # 导入主窗口
 from mainwindow_test import MainWindow, create_main_window
-
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('rtl_display.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from app_logging import setupLogging, shutdownLogging
+import perf_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -182,9 +175,11 @@ class RTLDisplayApplication:
             pass
             
     def _check_performance(self):
-        """检查性能"""
-        # 这里可以添加性能监控逻辑
-        pass
+        """检查性能：统计开启时把总耗时最多的函数写入日志"""
+        if not perf_metrics.isEnabled():
+            return
+        for line in perf_metrics.summary():
+            logger.info(f"性能: {line}")
         
     def _on_app_ready(self):
         """应用程序就绪处理"""
@@ -271,6 +266,9 @@ class RTLDisplayApplication:
 
 def main():
     """主函数"""
+    # 配置日志：写文件和控制台在日志线程中进行，文件按大小和时间轮转
+    # （放在main中，解算进程池的子进程导入本模块时不会打开日志文件）
+    setupLogging()
     try:
         # 创建应用程序实例
         app_instance = RTLDisplayApplication()
@@ -286,7 +284,12 @@ def main():
     except Exception as e:
         logger.error(f"应用程序启动失败: {e}")
         return 1
+        
+    finally:
+        shutdownLogging()
 
 
 if __name__ == "__main__":
+    # 打包后解算进程池需要
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
@@ -7,11 +7,12 @@ MainWindow - 集成主窗口类
 
 import sys
 import os
+import logging
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QSplitter, QDockWidget, QAction, 
                            QMenuBar, QToolBar, QStatusBar, QMessageBox, 
-                           QFileDialog, QTabWidget, QFrame, QLabel)
+                           QFileDialog, QTabWidget, QFrame, QLabel, QProgressDialog)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread, QUrl
 from PyQt5.QtGui import QIcon, QPixmap, QFont
 
@@ -19,12 +20,23 @@ from PyQt5.QtGui import QIcon, QPixmap, QFont
 from connect_widget import ConnectionWidget
 from graphic_widget import GraphicsWidget
 from view_settings_widget import ViewSettingsWidget
+from group_pipeline import GroupPipeline
+from range_bias import SurveySession, loadSurveySession, estimateRangeBias
+from trajectory_player import TrajectoryPlayer
+from timeline_widget import TimelineWidget
+from trajectory_export import (TrajectoryExporter, exportFormats, formatForPath,
+                               EXPORT_CSV, EXPORT_NDJSON, EXPORT_PARQUET)
+from log_view import LogView, QueueLogHandler
+from perf_metrics import PerfMetricsWidget
 
 
 
 
 import resources_rc  # 导入编译后的资源文件
 
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)  # 未配置logging时窗口日志也能显示
+
 class MainWindow(QMainWindow):
     """主窗口类 - 集成所有组件"""
     
@@ -39,6 +51,10 @@ class MainWindow(QMainWindow):
         self._connection_widget = None
         self._graphics_widget = None
         self._view_settings_widget = None
+        self._player = None
+        self._exporter = None
+        self._export_progress = None
+        self._pipeline = GroupPipeline(self)
         self._is_maximized = False
         self._geometry_saved = False
         
@@ -159,6 +175,12 @@ class MainWindow(QMainWindow):
         # 创建日志停靠窗口
         self._create_log_dock()
         
+        # 创建轨迹回放停靠窗口
+        self._create_timeline_dock()
+        
+        # 创建性能统计停靠窗口
+        self._create_perf_dock()
+        
     def _create_status_dock(self):
         """创建状态信息停靠窗口"""
         # 创建停靠窗口
@@ -182,6 +204,14 @@ class MainWindow(QMainWindow):
         self.connection_status_label = QLabel("连接状态: 未连接")
         status_layout.addWidget(self.connection_status_label)
         
+        # 添加基站状态
+        self.anchor_status_label = QLabel("基站: 0/0 在线")
+        status_layout.addWidget(self.anchor_status_label)
+        
+        # 添加异常基站
+        self.anchor_health_label = QLabel("异常基站: 无")
+        status_layout.addWidget(self.anchor_health_label)
+        
         status_dock.setWidget(status_widget)
         self.addDockWidget(Qt.BottomDockWidgetArea, status_dock)
         
@@ -196,12 +226,12 @@ class MainWindow(QMainWindow):
         log_widget = QWidget()
         log_layout = QVBoxLayout(log_widget)
         
-        # 创建日志文本区域
-        from PyQt5.QtWidgets import QTextEdit
-        self.log_text_edit = QTextEdit()
-        self.log_text_edit.setReadOnly(True)
-        self.log_text_edit.setMaximumHeight(100)
-        log_layout.addWidget(self.log_text_edit)
+        # 创建日志显示区域，接收所有logging日志（包括其他线程）
+        self._log_handler = QueueLogHandler()
+        logging.getLogger().addHandler(self._log_handler)
+        self.log_view = LogView(self._log_handler)
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
         
         log_dock.setWidget(log_widget)
         self.addDockWidget(Qt.BottomDockWidgetArea, log_dock)
@@ -209,6 +239,36 @@ class MainWindow(QMainWindow):
         # 默认隐藏日志窗口
         log_dock.hide()
         
+    def _create_timeline_dock(self):
+        """创建轨迹回放停靠窗口"""
+        timeline_dock = QDockWidget("轨迹回放", self)
+        timeline_dock.setObjectName("TimelineDock")
+        timeline_dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.TopDockWidgetArea)
+        
+        # 回放播放器读取图形组件的轨迹存储
+        self._player = TrajectoryPlayer(self._graphics_widget.trajectory, self)
+        self._player.frameReady.connect(self._graphics_widget.showPlaybackFrame)
+        self._player.activeChanged.connect(self._graphics_widget.setPlaybackActive)
+        self._player.sought.connect(self._graphics_widget.clearPlaybackHistory)
+        self._player.activeChanged.connect(self._on_playback_active_changed)
+        
+        timeline_dock.setWidget(TimelineWidget(self._player))
+        self.addDockWidget(Qt.BottomDockWidgetArea, timeline_dock)
+        
+        # 默认隐藏回放窗口
+        timeline_dock.hide()
+        
+    def _create_perf_dock(self):
+        """创建性能统计停靠窗口"""
+        perf_dock = QDockWidget("性能", self)
+        perf_dock.setObjectName("PerfDock")
+        perf_dock.setAllowedAreas(Qt.BottomDockWidgetArea | Qt.TopDockWidgetArea)
+        perf_dock.setWidget(PerfMetricsWidget())
+        self.addDockWidget(Qt.BottomDockWidgetArea, perf_dock)
+        
+        # 默认隐藏性能窗口
+        perf_dock.hide()
+        
     def _create_menu_bar(self):
         """创建菜单栏"""
         menubar = self.menuBar()
@@ -234,6 +294,11 @@ class MainWindow(QMainWindow):
         save_action.triggered.connect(self._on_save_file)
         file_menu.addAction(save_action)
         
+        # 导出轨迹动作
+        export_action = QAction('导出轨迹(&E)...', self)
+        export_action.triggered.connect(self._on_export_trajectory)
+        file_menu.addAction(export_action)
+        
         file_menu.addSeparator()
         
         # 退出动作
@@ -258,6 +323,31 @@ class MainWindow(QMainWindow):
         show_log_action.triggered.connect(self._toggle_log_dock)
         view_menu.addAction(show_log_action)
         
+        show_timeline_action = QAction('显示回放窗口', self)
+        show_timeline_action.setCheckable(True)
+        show_timeline_action.setChecked(False)
+        show_timeline_action.triggered.connect(self._toggle_timeline_dock)
+        view_menu.addAction(show_timeline_action)
+        
+        show_perf_action = QAction('显示性能窗口', self)
+        show_perf_action.setCheckable(True)
+        show_perf_action.setChecked(False)
+        show_perf_action.triggered.connect(self._toggle_perf_dock)
+        view_menu.addAction(show_perf_action)
+        
+        view_menu.addSeparator()
+        
+        # 热力图
+        heatmap_action = QAction('显示热力图', self)
+        heatmap_action.setCheckable(True)
+        heatmap_action.setChecked(False)
+        heatmap_action.toggled.connect(self._toggle_heatmap)
+        view_menu.addAction(heatmap_action)
+        
+        clear_heatmap_action = QAction('清除热力图', self)
+        clear_heatmap_action.triggered.connect(self._clear_heatmap)
+        view_menu.addAction(clear_heatmap_action)
+        
         view_menu.addSeparator()
         
         # 全屏动作
@@ -286,6 +376,11 @@ class MainWindow(QMainWindow):
         calibrate_action.triggered.connect(self._on_calibrate)
         tools_menu.addAction(calibrate_action)
         
+        # 测距偏差标定动作
+        range_bias_action = QAction('测距偏差标定...', self)
+        range_bias_action.triggered.connect(self._on_range_bias)
+        tools_menu.addAction(range_bias_action)
+        
         # 设置菜单
         settings_menu = menubar.addMenu('设置(&S)')
         
@@ -380,6 +475,22 @@ class MainWindow(QMainWindow):
             # 连接视图大小改变信号
             self._graphics_widget.viewSizeChange.connect(self._on_view_size_changed)
             
+            # 连接基站变化信号
+            self._graphics_widget.anchorsChanged.connect(self._on_anchors_changed)
+            self._graphics_widget.anchorsChanged.connect(self._pipeline.applyAnchorChanges)
+            
+            # 连接自标定结果信号
+            self._graphics_widget.calibrationFinished.connect(self._on_calibration_finished)
+            
+            # 连接多组流水线的解算结果
+            self._pipeline.solutionsReady.connect(self._graphics_widget.applySolutions)
+            if self._view_settings_widget:
+                self._graphics_widget.anchorsChanged.connect(self._view_settings_widget.applyAnchorChanges)
+                self._graphics_widget.updateAnchorList3D.connect(self._view_settings_widget.updateAnchorList3D)
+                self._graphics_widget.tagPos3D.connect(self._view_settings_widget.tag3DPos)
+                self._graphics_widget.tagsCleared.connect(self._view_settings_widget.clearTags3D)
+                self._view_settings_widget.view3DToggled.connect(self._on_view3d_toggled)
+            
         # 连接视图设置组件的信号
         if self._view_settings_widget:
             # 连接保存设置信号
@@ -410,13 +521,60 @@ class MainWindow(QMainWindow):
         
     def _check_system_status(self):
         """检查系统状态"""
-        # 这里可以添加系统状态检查逻辑
-        pass
+        if self._graphics_widget:
+            self._update_anchor_health()
+        
+    def _update_anchor_health(self):
+        """显示异常基站"""
+        unhealthy = self._graphics_widget.anchorHealth.unhealthyAnchors()
+        if not unhealthy:
+            self.anchor_health_label.setText("异常基站: 无")
+            return
+        
+        parts = []
+        for h in unhealthy:
+            problem = h.problems[0]
+            if problem == "dropout":
+                reason = f"{h.sinceLast:.0f}s无上报"
+            elif problem == "rate":
+                reason = f"{h.rate:.1f}Hz"
+            elif problem == "rx":
+                reason = f"{h.rxPower:.0f}dBm"
+            else:
+                reason = f"残差{h.absResidual:.2f}m"
+            key = self._graphics_widget.anchorKey(h.anchorIdx)
+            name = f"G{key[0]}-A{key[1]}" if key else f"#{h.anchorIdx}"
+            parts.append(f"{name}({reason})")
+        self.anchor_health_label.setText("异常基站: " + ", ".join(parts))
         
     def _update_coordinate_display(self, x, y):
         """更新坐标显示"""
         self.coordinate_label.setText(f'X: {x:.2f}, Y: {y:.2f}')
         
+    def _on_anchors_changed(self, changes):
+        """基站变化处理"""
+        self.anchor_status_label.setText(f"基站: {changes.onlineCount}/{changes.total} 在线")
+        for row in changes.added:
+            station = changes.stations[row]
+            self.log_message(f"发现基站 {station.anchorId} ({station.ip})")
+        
+    def _on_calibration_finished(self, result):
+        """自标定结果处理"""
+        if not result.success:
+            self.log_message(f"自标定失败: {result.message}")
+            return
+        self.log_message(f"自标定完成: {len(result.positions)} 个基站, 残差RMS {result.rms * 100:.1f} cm")
+        for i, rms in enumerate(result.anchorRms):
+            self.log_message(f"  基站 {i}: ({result.positions[i][0]:.2f}, {result.positions[i][1]:.2f}), "
+                             f"残差 {rms * 100:.1f} cm")
+        
+    def _on_view3d_toggled(self, checked):
+        """在2D和3D视图之间切换"""
+        if self._graphics_widget:
+            self._graphics_widget.setView3D(self._view_settings_widget.container)
+            self._graphics_widget.show3D(checked)
+        self.log_message("切换到3D视图" if checked else "切换到2D视图")
+        
     def _on_view_size_changed(self, size):
         """视图大小改变处理"""
         # 可以在这里处理视图大小改变的逻辑
@@ -438,6 +596,33 @@ class MainWindow(QMainWindow):
         if dock:
             dock.setVisible(not dock.isVisible())
             
+    def _toggle_timeline_dock(self):
+        """切换回放窗口显示"""
+        dock = self.findChild(QDockWidget, "TimelineDock")
+        if dock:
+            dock.setVisible(not dock.isVisible())
+            
+    def _toggle_perf_dock(self):
+        """切换性能窗口显示"""
+        dock = self.findChild(QDockWidget, "PerfDock")
+        if dock:
+            dock.setVisible(not dock.isVisible())
+            
+    def _on_playback_active_changed(self, active):
+        """进入/退出轨迹回放"""
+        self.log_message("开始轨迹回放" if active else "返回实时显示")
+        
+    def _toggle_heatmap(self, checked):
+        """切换热力图显示"""
+        if self._graphics_widget:
+            self._graphics_widget.setHeatmapVisible(checked)
+            
+    def _clear_heatmap(self):
+        """清除热力图"""
+        if self._graphics_widget:
+            self._graphics_widget.clearHeatmap()
+            self.log_message("热力图已清除")
+            
     def _toggle_fullscreen(self):
         """切换全屏模式"""
         if self.isFullScreen():
@@ -478,6 +663,69 @@ class MainWindow(QMainWindow):
             self._graphics_widget.saveConfigFile(file_path)
             self.log_message(f"已保存配置文件: {file_path}")
             
+    def _on_export_trajectory(self):
+        """导出轨迹处理"""
+        if not self._graphics_widget:
+            return
+        if self._exporter and self._exporter.isRunning():
+            self.log_message("轨迹导出正在进行")
+            return
+        
+        filters = {EXPORT_CSV: "CSV文件 (*.csv)",
+                   EXPORT_NDJSON: "NDJSON文件 (*.ndjson *.jsonl)",
+                   EXPORT_PARQUET: "Parquet文件 (*.parquet)"}
+        formats = exportFormats()
+        file_path, selected = QFileDialog.getSaveFileName(
+            self, "导出轨迹", "", ";;".join(filters[f] for f in formats))
+        if not file_path:
+            return
+        
+        fmt = next((f for f in formats if filters[f] == selected), formatForPath(file_path))
+        if not os.path.splitext(file_path)[1]:
+            file_path += "." + fmt
+        
+        if self._exporter is None:
+            self._exporter = TrajectoryExporter(self._graphics_widget.trajectory, self)
+            self._exporter.progress.connect(self._on_export_progress)
+            self._exporter.finished.connect(self._on_export_finished)
+            self._exporter.failed.connect(self._on_export_failed)
+            self._exporter.cancelled.connect(self._on_export_cancelled)
+        
+        self._export_progress = QProgressDialog("正在导出轨迹...", "取消", 0, 1000, self)
+        self._export_progress.setWindowTitle("导出轨迹")
+        self._export_progress.setWindowModality(Qt.WindowModal)
+        self._export_progress.setMinimumDuration(500)
+        self._export_progress.canceled.connect(self._exporter.cancel)
+        self._exporter.start(file_path, fmt)
+        self.log_message(f"开始导出轨迹: {file_path}")
+        
+    def _on_export_progress(self, done, total):
+        """导出进度"""
+        if self._export_progress and total > 0:
+            self._export_progress.setValue(int(done * 1000 / total))
+        
+    def _close_export_progress(self):
+        if self._export_progress:
+            self._export_progress.canceled.disconnect()
+            self._export_progress.close()
+            self._export_progress = None
+        
+    def _on_export_finished(self, file_path, rows):
+        """导出完成"""
+        self._close_export_progress()
+        self.log_message(f"轨迹导出完成: {rows} 行, {file_path}")
+        
+    def _on_export_failed(self, message):
+        """导出失败"""
+        self._close_export_progress()
+        self.log_message(f"轨迹导出失败: {message}")
+        QMessageBox.warning(self, "导出轨迹", f"导出失败: {message}")
+        
+    def _on_export_cancelled(self):
+        """导出已取消"""
+        self._close_export_progress()
+        self.log_message("轨迹导出已取消")
+        
     def _on_connect_device(self):
         """连接设备处理"""
         # 这里可以实现设备连接逻辑
@@ -498,6 +746,35 @@ class MainWindow(QMainWindow):
             self._graphics_widget.calibrationButtonClicked()
             self.log_message("开始校准")
             
+    def _on_range_bias(self):
+        """由标定录制估计天线延迟和测距偏差，写入基站表格校正列"""
+        if not self._graphics_widget:
+            return
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "打开标定录制", "",
+            "标定录制 (*.csv);;所有文件 (*.*)")
+        if not file_paths:
+            return
+        
+        session = SurveySession()
+        for file_path in file_paths:
+            try:
+                session.extend(loadSurveySession(file_path))
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Error loading survey session {file_path}: {e}")
+        if len(session) == 0:
+            self.log_message("测距偏差标定失败: 没有有效的测距样本")
+            return
+        
+        positions = self._graphics_widget.anchorTablePositions()
+        result = estimateRangeBias(positions, session)
+        self._graphics_widget.applyRangeCorrections(result)
+        self.log_message(f"测距偏差标定完成: {len(session)} 个样本, 误差RMS "
+                         f"{result.rmsBefore * 100:.1f} cm -> {result.rmsAfter * 100:.1f} cm")
+        for i, delay in enumerate(result.antennaDelay):
+            if result.count[i].sum() > 0:
+                self.log_message(f"  基站 {i}: 天线延迟 {delay * 100:.1f} cm")
+        
     def _on_preferences(self):
         """首选项处理"""
         QMessageBox.information(self, "首选项", "首选项设置功能待实现")
@@ -511,10 +788,8 @@ class MainWindow(QMainWindow):
                          "版本: 1.0.0")
         
     def log_message(self, message):
-        """添加日志消息"""
-        if hasattr(self, 'log_text_edit'):
-            timestamp = QTimer().currentTime().toString("HH:mm:ss")
-            self.log_text_edit.append(f"[{timestamp}] {message}")
+        """添加日志消息，经logging送到日志窗口和日志文件，可在任意线程调用"""
+        logger.info(message)
             
     def update_status(self, message):
         """更新状态信息"""
@@ -538,6 +813,10 @@ class MainWindow(QMainWindow):
         """获取连接控制组件"""
         return self._connection_widget
         
+    def get_pipeline(self):
+        """获取多组数据处理流水线"""
+        return self._pipeline
+        
     def get_view_settings_widget(self):
         """获取视图设置组件"""
         return self._view_settings_widget
@@ -553,6 +832,17 @@ class MainWindow(QMainWindow):
             # 保存窗口几何状态
             self._save_geometry()
             
+            # 停止数据处理
+            self._pipeline.stop()
+            if self._player:
+                self._player.close()
+            if self._exporter:
+                self._exporter.cancel()
+                self._exporter.wait()
+            if self._graphics_widget:
+                self._graphics_widget.trajectory.close()
+            logging.getLogger().removeHandler(self._log_handler)
+            
             # 发出窗口关闭信号
             self.windowClosed.emit()
             
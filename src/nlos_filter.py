@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NlosFilter - 非视距（NLOS）测距剔除
+解算前按整帧矩阵计算每个测距的权重：
+接收功率明显低于按距离预期的功率时降权，
+相对上一次解算位置的残差按Huber函数降权，残差过大时直接剔除（权重为0），
+权重交给solver做加权最小二乘
+"""
+
+import numpy as np
+
+import solver
+
+
+class NlosFilter:
+    """按接收功率和残差计算测距权重，所有运算对 (M, N) 矩阵整体进行"""
+
+    RX_REF_DBM = -45.0  # 1米处的视距接收功率（dBm）
+    PATH_LOSS_EXP = 2.0  # 路径损耗指数
+    RX_DEFICIT_DB = 6.0  # 接收功率比预期低超过该值开始降权（dB）
+    HUBER_K = 1.5  # Huber阈值（以残差尺度为单位）
+    REJECT_K = 4.0  # 残差超过该倍数的尺度时剔除
+    MIN_SCALE = 0.1  # 残差尺度下限（米），避免测距很准或标签移动时误剔除
+
+    def __init__(self):
+        self.rejected = 0  # 累计剔除的测距数量
+        self.downweighted = 0  # 累计降权的测距数量
+
+    def rxWeights(self, ranges, rxPower):
+        """
+        接收功率权重：NLOS路径的直达径被遮挡，功率比同距离视距低
+        rxPower: (M, N) 接收功率（dBm），NaN表示没有上报，权重为1
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            expected = self.RX_REF_DBM - 10.0 * self.PATH_LOSS_EXP * np.log10(np.maximum(ranges, 1.0))
+            excess = (expected - rxPower - self.RX_DEFICIT_DB) / self.RX_DEFICIT_DB
+            w = 1.0 / (1.0 + np.maximum(excess, 0.0) ** 2)
+        return np.where(np.isfinite(w), w, 1.0)
+
+    def residualWeights(self, anchors, ranges, positions):
+        """
+        残差权重：以每行残差的MAD为尺度计算Huber权重，超过REJECT_K倍尺度的测距剔除
+        positions: (M, 3) 参考位置，NaN行权重为1
+        """
+        diff = positions[:, None, :] - anchors[None, :, :]
+        predicted = np.sqrt((diff * diff).sum(axis=2))
+        error = ranges - predicted
+        valid = np.isfinite(error)
+
+        # 没有参考位置的行全为NaN，不参与中位数计算
+        median = np.zeros((len(error), 1))
+        mad = np.zeros((len(error), 1))
+        rows = valid.any(axis=1)
+        if rows.any():
+            median[rows] = np.nanmedian(error[rows], axis=1, keepdims=True)
+            mad[rows] = np.nanmedian(np.abs(error[rows] - median[rows]), axis=1, keepdims=True)
+        scale = np.maximum(1.4826 * mad, self.MIN_SCALE)
+        with np.errstate(invalid="ignore"):
+            u = np.abs(error - median) / scale
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            w = np.where(u > self.HUBER_K, self.HUBER_K / u, 1.0)
+        w = np.where(valid, w, 1.0)
+        reject = valid & (u > self.REJECT_K)
+
+        # 剔除后剩余测距不足时只降权不剔除
+        usable = (valid & ~reject).sum(axis=1) >= solver.MIN_ANCHORS
+        reject &= usable[:, None]
+        return np.where(reject, 0.0, w)
+
+    def hypotheses(self, ranges, weights):
+        """
+        RANSAC假设：对没有参考位置的行，每次去掉一个测距构成一组假设
+        返回 (rows, hypothesisWeights)，rows为 (K,) 原始行号，权重为 (K, N)
+        只为测距数量多于MIN_ANCHORS的行生成假设
+        """
+        present = np.isfinite(ranges) & (weights > 0)
+        counts = present.sum(axis=1)
+        rows, cols = np.nonzero(present & (counts > solver.MIN_ANCHORS)[:, None])
+        hypothesisWeights = weights[rows].copy()
+        hypothesisWeights[np.arange(len(rows)), cols] = 0.0
+        return rows, hypothesisWeights
+
+    def consensus(self, anchors, ranges, positions):
+        """
+        一致性评分：与位置的残差在REJECT_K倍MIN_SCALE以内的测距数量，
+        数量相同时残差均方根小者优先，返回 (M,) 分数，越大越好
+        """
+        diff = positions[:, None, :] - anchors[None, :, :]
+        error = ranges - np.sqrt((diff * diff).sum(axis=2))
+        valid = np.isfinite(error)
+        inliers = valid & (np.abs(np.nan_to_num(error)) < self.REJECT_K * self.MIN_SCALE)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rms = np.sqrt((np.where(inliers, error, 0.0) ** 2).sum(axis=1) / inliers.sum(axis=1))
+        score = inliers.sum(axis=1) - np.minimum(np.nan_to_num(rms, nan=1.0), 1.0)
+        return np.where(np.isfinite(positions[:, 0]), score, -np.inf)
+
+    def weights(self, anchors, ranges, rxPower=None, positions=None):
+        """
+        计算整帧测距权重
+        anchors: (N, 3)；ranges: (M, N)，NaN表示缺失；rxPower: (M, N)；positions: (M, 3)
+        返回 (M, N) 权重，0表示剔除
+        """
+        w = np.ones(ranges.shape)
+        if rxPower is not None:
+            w *= self.rxWeights(ranges, rxPower)
+        if positions is not None:
+            w *= self.residualWeights(anchors, ranges, positions)
+        return w
+
+    def record(self, ranges, weights):
+        """统计最终使用的权重"""
+        present = np.isfinite(ranges)
+        self.rejected += int(np.count_nonzero(present & (weights == 0)))
+        self.downweighted += int(np.count_nonzero(present & (weights > 0) & (weights < 1)))
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PerfMetrics - 热点函数性能统计
+@instrumented装饰的函数记录调用次数和耗时直方图（固定对数分桶，每倍程8个子桶，精度约12%），
+统计关闭时装饰器只多一次标志判断；PerfMetricsWidget在停靠窗口中显示统计结果
+"""
+
+import functools
+import os
+import time
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt, QTimer
+
+# 直方图分桶：1µs (2^10 ns) 到约17s (2^34 ns)，每倍程SUB_BUCKETS个子桶，超出范围的计入两端
+MIN_EXP = 10
+MAX_EXP = 34
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = (MAX_EXP - MIN_EXP) * SUB_BUCKETS
+
+_enabled = os.environ.get("UWB_PERF", "0") != "0"  # 是否记录，运行时可切换
+_metrics = {}  # 名称 -> Metric
+
+
+def bucketIndex(ns):
+    """耗时（纳秒）所在的桶"""
+    if ns < (1 << MIN_EXP):
+        return 0
+    exp = ns.bit_length() - 1
+    if exp >= MAX_EXP:
+        return BUCKETS - 1
+    sub = (ns >> (exp - SUB_BITS)) & (SUB_BUCKETS - 1)
+    return (exp - MIN_EXP) * SUB_BUCKETS + sub
+
+
+def bucketUpperBound(index):
+    """桶的上界（纳秒）"""
+    exp = MIN_EXP + index // SUB_BUCKETS
+    sub = index % SUB_BUCKETS
+    return (SUB_BUCKETS + sub + 1) << (exp - SUB_BITS)
+
+
+class Metric:
+    """单个函数的调用次数和耗时直方图（只在GUI线程中更新）"""
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.totalNs = 0
+        self.maxNs = 0
+        self.buckets = [0] * BUCKETS
+
+    def record(self, ns):
+        self.calls += 1
+        self.totalNs += ns
+        if ns > self.maxNs:
+            self.maxNs = ns
+        self.buckets[bucketIndex(ns)] += 1
+
+    def meanNs(self):
+        return self.totalNs / self.calls if self.calls else 0.0
+
+    def percentileNs(self, p):
+        """第p百分位耗时（所在桶的上界，不超过最大值）"""
+        if not self.calls:
+            return 0.0
+        target = self.calls * p / 100.0
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(bucketUpperBound(index), self.maxNs)
+        return self.maxNs
+
+
+def isEnabled():
+    return _enabled
+
+
+def setEnabled(enabled):
+    """打开/关闭统计"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def metric(name):
+    """获取统计项，不存在时创建"""
+    m = _metrics.get(name)
+    if m is None:
+        m = _metrics[name] = Metric(name)
+    return m
+
+
+def metrics():
+    """所有统计项"""
+    return list(_metrics.values())
+
+
+def reset():
+    """清零所有统计"""
+    for m in _metrics.values():
+        m.reset()
+
+
+def summary(limit=5):
+    """按总耗时排序的前limit项，每项一行文字"""
+    lines = []
+    for m in sorted(metrics(), key=lambda m: m.totalNs, reverse=True)[:limit]:
+        if m.calls:
+            lines.append(f"{m.name}: {m.calls} 次, 平均 {m.meanNs() / 1e6:.3f} ms, "
+                         f"P99 {m.percentileNs(99) / 1e6:.3f} ms, 最大 {m.maxNs / 1e6:.3f} ms")
+    return lines
+
+
+def instrumented(name=None):
+    """装饰器：统计开启时记录函数的调用次数和耗时"""
+    def decorate(func):
+        m = metric(name or func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                m.record(time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+class PerfMetricsWidget(QWidget):
+    """性能统计面板，可见时每秒刷新"""
+
+    COLUMNS = ("名称", "调用次数", "次/秒", "平均(ms)", "P50(ms)", "P95(ms)", "P99(ms)", "最大(ms)")
+    REFRESH_INTERVAL = 1000  # 刷新间隔（毫秒）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lastCalls = {}  # 名称 -> 上次刷新时的调用次数
+        self._lastTime = time.monotonic()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        controls = QHBoxLayout()
+        self.enableCheck = QCheckBox("启用统计")
+        self.enableCheck.setChecked(isEnabled())
+        self.enableCheck.toggled.connect(setEnabled)
+        controls.addWidget(self.enableCheck)
+        self.resetButton = QPushButton("清零")
+        self.resetButton.clicked.connect(self._on_reset)
+        controls.addWidget(self.resetButton)
+        controls.addStretch(1)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self._refreshTimer = QTimer(self)
+        self._refreshTimer.setInterval(self.REFRESH_INTERVAL)
+        self._refreshTimer.timeout.connect(self.refresh)
+        self._refreshTimer.start()
+
+    def _on_reset(self):
+        reset()
+        self._lastCalls.clear()
+        self.refresh()
+
+    def refresh(self):
+        """刷新表格（隐藏时跳过）"""
+        now = time.monotonic()
+        elapsed = max(now - self._lastTime, 1e-6)
+        self._lastTime = now
+        if not self.isVisible():
+            self._lastCalls = {m.name: m.calls for m in metrics()}
+            return
+
+        items = sorted(metrics(), key=lambda m: m.name)
+        self.table.setRowCount(len(items))
+        for row, m in enumerate(items):
+            rate = (m.calls - self._lastCalls.get(m.name, 0)) / elapsed
+            self._lastCalls[m.name] = m.calls
+            values = (m.name, str(m.calls), f"{rate:.1f}", f"{m.meanNs() / 1e6:.3f}",
+                      f"{m.percentileNs(50) / 1e6:.3f}", f"{m.percentileNs(95) / 1e6:.3f}",
+                      f"{m.percentileNs(99) / 1e6:.3f}", f"{m.maxNs / 1e6:.3f}")
+            for column, text in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                if item.text() != text:
+                    item.setText(text)
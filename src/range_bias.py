@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RangeBias - 天线延迟和基站-标签测距偏差估计
+由标签放在已测量点位时录制的测距数据，对全部样本做批量最小二乘，
+求每个基站的天线延迟（公共偏差）和每个基站-标签对的剩余偏差，
+结果用于填写基站表格的T0-T7校正列
+"""
+
+import csv
+
+import numpy as np
+
+MAX_CORRECTION_TAGS = 8  # 基站表格中T0-T7校正列的数量
+
+
+class SurveySession:
+    """一次标定录制的数据，每行一个测距样本"""
+    def __init__(self):
+        self.anchors = np.empty(0, dtype=np.int64)  # 基站下标
+        self.tags = np.empty(0, dtype=np.int64)  # 标签下标（对应T0-T7）
+        self.ranges = np.empty(0)  # 测距（米）
+        self.truePos = np.empty((0, 3))  # 标签所在点位的真实坐标
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def extend(self, other):
+        """合并另一段录制"""
+        self.anchors = np.concatenate([self.anchors, other.anchors])
+        self.tags = np.concatenate([self.tags, other.tags])
+        self.ranges = np.concatenate([self.ranges, other.ranges])
+        self.truePos = np.concatenate([self.truePos, other.truePos])
+
+
+class RangeBiasResult:
+    """偏差估计结果（单位：米）"""
+    def __init__(self):
+        self.antennaDelay = None  # (A,) 每个基站的公共偏差
+        self.pairOffset = None  # (A, T) 扣除天线延迟后每个基站-标签对的偏差
+        self.count = None  # (A, T) 每对的样本数量
+        self.std = None  # (A, T) 每对残差的标准差
+        self.rmsBefore = float("nan")  # 校正前测距误差均方根
+        self.rmsAfter = float("nan")  # 校正后测距误差均方根
+
+    def correctionCm(self, anc_idx, tag_idx):
+        """基站表格中的校正值（厘米），与偏差符号相反"""
+        bias = self.antennaDelay[anc_idx] + self.pairOffset[anc_idx, tag_idx]
+        return int(round(-bias * 100))
+
+
+def loadSurveySession(filename):
+    """
+    读取CSV格式的标定录制，列为 anchor,tag,range,x,y,z
+    anchor/tag为下标，range为测距（米），x/y/z为标签所在点位坐标；#开头的行为注释
+    """
+    anchors, tags, ranges, truePos = [], [], [], []
+    with open(filename, "r", encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            try:
+                anchors.append(int(row[0]))
+                tags.append(int(row[1]))
+                ranges.append(float(row[2]))
+                truePos.append((float(row[3]), float(row[4]), float(row[5])))
+            except (ValueError, IndexError):
+                # 表头或格式错误的行
+                continue
+
+    session = SurveySession()
+    session.anchors = np.array(anchors, dtype=np.int64)
+    session.tags = np.array(tags, dtype=np.int64)
+    session.ranges = np.array(ranges, dtype=float)
+    session.truePos = np.array(truePos, dtype=float).reshape(-1, 3)
+    return session
+
+
+def estimateRangeBias(anchorPositions, session, tagCount=MAX_CORRECTION_TAGS):
+    """
+    批量最小二乘估计测距偏差
+    模型：range = |p_true - a| + d_a + b_at + 噪声，约束 sum_t n_at * b_at = 0，
+    即天线延迟d_a取该基站所有样本的平均偏差，b_at为各标签相对该平均的偏差
+    """
+    anchorPositions = np.asarray(anchorPositions, dtype=float)
+    anchorCount = len(anchorPositions)
+
+    valid = ((session.anchors >= 0) & (session.anchors < anchorCount)
+             & (session.tags >= 0) & (session.tags < tagCount)
+             & np.isfinite(session.ranges))
+    # 坐标未知的基站不参与估计
+    known = np.all(np.isfinite(anchorPositions), axis=1)
+    valid[valid] = known[session.anchors[valid]]
+    a = session.anchors[valid]
+    t = session.tags[valid]
+    ranges = session.ranges[valid]
+    truePos = session.truePos[valid]
+
+    # 所有样本的真实距离和误差一次算出
+    trueRange = np.sqrt(((truePos - anchorPositions[a]) ** 2).sum(axis=1))
+    error = ranges - trueRange
+
+    # 按基站-标签对累加：每对的最小二乘解是该对误差的均值
+    pair = a * tagCount + t
+    size = anchorCount * tagCount
+    count = np.bincount(pair, minlength=size).astype(float)
+    total = np.bincount(pair, weights=error, minlength=size)
+    totalSq = np.bincount(pair, weights=error * error, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pairBias = np.where(count > 0, total / count, 0.0)
+        pairVar = np.where(count > 1, (totalSq - count * pairBias ** 2) / (count - 1), np.nan)
+    count = count.reshape(anchorCount, tagCount)
+    pairBias = pairBias.reshape(anchorCount, tagCount)
+
+    # 天线延迟：按样本数加权的平均偏差
+    anchorSamples = count.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delay = np.where(anchorSamples > 0, (pairBias * count).sum(axis=1) / anchorSamples, 0.0)
+    offset = np.where(count > 0, pairBias - delay[:, None], 0.0)
+
+    result = RangeBiasResult()
+    result.antennaDelay = delay
+    result.pairOffset = offset
+    result.count = count.astype(np.int64)
+    result.std = np.sqrt(np.maximum(pairVar, 0.0)).reshape(anchorCount, tagCount)
+    if len(error):
+        corrected = error - (delay[a] + offset[a, t])
+        result.rmsBefore = float(np.sqrt(np.mean(error ** 2)))
+        result.rmsAfter = float(np.sqrt(np.mean(corrected ** 2)))
+    return result
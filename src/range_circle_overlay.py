@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RangeCircleOverlay - 定位圆绘制
+默认只绘制选中标签的定位圆，所有可见定位圆合并为一条QPainterPath，
+每帧最多重建一次；数量超过上限时只绘制位置估计点附近的圆弧，
+圆弧也超过上限时只保留离视图中心最近的部分
+"""
+
+import heapq
+import math
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPainterPath, QPen, QBrush, QColor
+
+
+class RangeCircleOverlay:
+    """定位圆绘制器"""
+
+    MAX_CIRCLES = 96  # 超过该数量时切换为圆弧绘制
+    MAX_ARCS = 384  # 圆弧模式下最多绘制的数量
+    ARC_SPAN = 30.0  # 圆弧模式下每段圆弧的角度（度）
+
+    def __init__(self):
+        self._showAll = False
+        self._selected = set()
+        self._cullRect = QRectF()
+        self._path = QPainterPath()
+        self._dirty = True
+        self._circleCount = 0
+        self._drawnCount = 0
+        self._lod = False
+        self._pen = QPen(QBrush(QColor(0, 120, 215, 160)), 0, Qt.DashLine)
+
+    # ========== 显示设置 ==========
+
+    def setShowAll(self, show):
+        """设置是否绘制所有标签的定位圆（否则只绘制选中的标签）"""
+        if self._showAll != show:
+            self._showAll = show
+            self._dirty = True
+
+    def showAll(self):
+        """是否绘制所有标签的定位圆"""
+        return self._showAll
+
+    def setSelectedTags(self, tag_ids):
+        """设置选中的标签"""
+        selected = set(tag_ids)
+        if selected != self._selected:
+            self._selected = selected
+            self._dirty = True
+
+    def selectedTags(self):
+        """获取选中的标签"""
+        return set(self._selected)
+
+    def setCullRect(self, rect):
+        """设置裁剪矩形（场景坐标），矩形外的定位圆不加入路径"""
+        self._cullRect = QRectF(rect)
+        self._dirty = True
+
+    def isTagShown(self, marker):
+        """标签的定位圆是否需要绘制"""
+        return marker.rangesShow and (self._showAll or marker.id in self._selected)
+
+    def invalidate(self):
+        """测距或基站位置改变，下一帧重建路径"""
+        self._dirty = True
+
+    def isLod(self):
+        """上一次重建是否使用了圆弧模式"""
+        return self._lod
+
+    def circleCount(self):
+        """上一次重建时可见的定位圆数量"""
+        return self._circleCount
+
+    def drawnCount(self):
+        """上一次重建时实际加入路径的圆（弧）数量"""
+        return self._drawnCount
+
+    # ========== 绘制 ==========
+
+    def _visibleCircles(self, markers, anchors):
+        """收集需要绘制的定位圆 (圆心, 半径, 标签位置)"""
+        circles = []
+        cull = not self._cullRect.isNull()
+        for marker in markers:
+            if not marker.valid or not self.isTagShown(marker):
+                continue
+            for anc_idx, r in marker.ranges.items():
+                anchor = anchors.get(anc_idx)
+                if anchor is None or r <= 0:
+                    continue
+                if cull and not self._cullRect.intersects(
+                        QRectF(anchor.x() - r, anchor.y() - r, 2 * r, 2 * r)):
+                    continue
+                circles.append((anchor, r, marker.p))
+        return circles
+
+    def _nearestCircles(self, circles, count):
+        """保留圆周离视图中心最近的count个定位圆"""
+        if self._cullRect.isNull():
+            return circles[:count]
+        centre = self._cullRect.center()
+        cx, cy = centre.x(), centre.y()
+        return heapq.nsmallest(count, circles, key=lambda c: abs(
+            math.hypot(c[0].x() - cx, c[0].y() - cy) - c[1]))
+
+    def _rebuild(self, markers, anchors):
+        """重建定位圆路径"""
+        circles = self._visibleCircles(markers, anchors)
+        self._circleCount = len(circles)
+        self._lod = len(circles) > self.MAX_CIRCLES
+        if len(circles) > self.MAX_ARCS:
+            circles = self._nearestCircles(circles, self.MAX_ARCS)
+        self._drawnCount = len(circles)
+
+        path = QPainterPath()
+        for anchor, r, estimate in circles:
+            rect = QRectF(anchor.x() - r, anchor.y() - r, 2 * r, 2 * r)
+            if self._lod:
+                # 只绘制朝向位置估计点的一段圆弧
+                bearing = math.degrees(math.atan2(-(estimate.y() - anchor.y()),
+                                                  estimate.x() - anchor.x()))
+                start = bearing - self.ARC_SPAN / 2
+                path.arcMoveTo(rect, start)
+                path.arcTo(rect, start, self.ARC_SPAN)
+            else:
+                path.addEllipse(rect)
+
+        self._path = path
+        self._dirty = False
+
+    def paint(self, painter, markers, anchors):
+        """绘制定位圆"""
+        if self._dirty:
+            self._rebuild(markers, anchors)
+        if self._path.isEmpty():
+            return
+        painter.setPen(self._pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self._path)
@@ -2,7 +2,7 @@
 
 # Resource object code
 #
-# Created by: The Resource Compiler for PyQt5 (Qt v5.15.2)
+# Created by: The Resource Compiler for PyQt5 (Qt v5.15.14)
 #
 # WARNING! All changes made in this file will be lost!
 
@@ -14252,77 +14252,76 @@ qt_resource_data = b"\
 \x25\x42\x82\x09\x88\x41\x12\xdc\x5c\x29\x4d\x9f\x80\x18\x44\x9f\
 \xa1\x44\x48\x30\x81\xff\x03\xc5\x65\xe4\x14\x8c\xc3\xc0\xc9\x00\
 \x00\x00\x00\x49\x45\x4e\x44\xae\x42\x60\x82\
-\x00\x00\x04\x43\
+\x00\x00\x04\x3b\
 \x00\
-\x00\x15\x70\x78\x9c\xcd\x58\xcd\x6e\xdc\x36\x10\xbe\x07\xc8\x3b\
-\x10\xea\xc5\xce\x06\xb2\x24\x77\x13\x97\x3d\x14\x85\x1b\x14\x06\
-\x12\x14\x8e\x83\xa2\x39\x05\x5c\x2d\x77\x97\x08\x57\x54\x28\xae\
-\xe3\xa4\xd8\x43\x90\x43\x0f\x45\x6f\x01\x7a\xee\x31\x40\xd0\xf6\
-\x58\xa0\x4d\x0a\xf4\x59\x5a\xbb\x7d\x8b\x92\x94\x28\xad\x28\xea\
-\x27\x89\x6d\x84\x02\x6c\x2d\x67\x38\x1a\x7e\xf3\xcd\x68\x28\xb2\
-\x4c\x19\x17\xe0\x50\x1c\xae\x48\xfc\x10\x44\x7e\x70\xf5\x0a\xb1\
-\xe7\x22\x7b\xce\xdf\x67\x89\xe0\x8c\x66\xd6\x82\x2f\x39\x4a\x17\
-\x24\x46\xf4\xd6\x6c\x86\x63\x91\x81\x50\x89\xd5\x75\x20\xf0\x12\
-\x7c\x7b\xf5\x0a\x50\x23\xe5\x2c\xc5\x5c\x3c\x01\x53\xb6\x9a\x50\
-\x0c\x38\x9a\x12\x06\x41\xe0\xef\x15\x0a\x64\x0a\x01\x67\x4c\x14\
-\x3f\x1f\x93\xa9\x58\x40\x10\xed\x06\xd7\xb4\xea\xa7\x60\x81\xc9\
-\x7c\x21\x20\x08\xc7\xc5\x54\xa1\x79\x4c\x32\x22\x2d\x42\x10\xa3\
-\xe4\x18\x65\x07\xc9\x8c\x2d\x91\x20\x2c\xf9\x3a\x17\x14\x6a\x19\
-\x99\x27\x88\x02\x8e\x33\x2c\x8e\xf4\xfd\xd6\xb6\xf2\x52\x0b\xef\
-\x4a\xcf\x51\x32\xa7\xd8\xb8\x5b\x38\x14\xcb\x3d\x23\x92\x54\x93\
-\x28\x89\x17\x8c\x67\xfe\x8c\x50\x0a\x41\x8a\x38\x4e\x44\x25\x9d\
-\x30\x3e\xc5\xdc\x8f\x19\x65\x1c\x02\x6f\x42\x51\xfc\xd0\x6b\x2e\
-\x5e\x22\x3e\x27\x49\x06\xc1\xb8\xb1\xb4\xd8\x76\x50\x09\xd4\x56\
-\x57\x75\xdd\x7b\xf8\x44\x80\x0d\x4f\x8d\xb7\x82\x08\x8a\x95\xb0\
-\x2e\x12\x72\x06\x02\x2a\xf7\xb7\x42\x73\xfc\x99\x77\xf6\xe2\xf7\
-\x7f\x7e\x7b\xfe\xf7\x9f\x3f\x9d\x3e\xfb\xc5\x83\x9e\x02\x8c\xe7\
-\x88\x79\xf5\x85\x33\xb9\x7b\x3f\x25\x27\x98\x1e\x91\xa7\x78\xc3\
-\x44\x14\xe5\x11\x80\xe1\xb8\x16\x8a\xcd\x75\x13\x46\x95\x4b\x7c\
-\x85\xeb\x42\x03\x82\x60\xa9\x01\x50\xdd\xb7\x2a\xdd\xd1\x60\xa9\
-\xb0\xbb\x1e\x65\x14\x29\x9e\x89\xd2\x9c\xfa\xd1\xae\x56\x1a\x0c\
-\x6c\x83\xeb\xea\xd6\x45\x08\x03\xb3\xa6\x90\x54\xa8\x4b\x8a\xc8\
-\xed\x35\xac\xaa\x61\xb8\xbb\xeb\x94\xd6\x37\x51\x46\xd1\xe7\x6a\
-\x51\xff\x46\xca\xb0\x18\xeb\xb0\xfb\x31\x6f\x8b\xfc\x9e\xcb\x58\
-\x9d\xea\x87\xd2\xd9\xf9\x04\x6d\x05\xd7\xf5\xe5\x07\xe1\xb6\x53\
-\xbd\x00\x29\xac\x0b\x4b\x8a\xbb\x1e\x44\xd1\x13\xb9\x10\x27\x48\
-\xa6\xb2\x93\x50\x85\x82\xae\x3e\x10\x7c\x21\xeb\xcc\xd1\x02\x4d\
-\xd9\x63\x3b\x43\xd4\x30\x99\xf9\xd1\xee\x6e\xa0\x87\xd7\xd4\xc9\
-\xd0\x32\xa5\x58\xba\x13\x46\x4d\xa1\x71\xf5\x63\xc7\xba\x94\x63\
-\x34\x55\x25\xcd\x5a\xb7\x2e\xcb\x4c\x31\x0e\x96\x32\x5a\x2e\xf7\
-\x4a\x76\x69\x8d\xa6\xdc\x14\x45\x27\x50\x6a\x18\x9e\xb5\x6b\x0c\
-\x4c\x18\x5b\xd5\x70\xa1\xd7\x6e\x27\xb9\x2c\x45\x63\x34\xf2\x5b\
-\xcd\x66\x6c\xc5\x63\x59\x7a\xbc\x47\x3c\x86\x3b\x44\xd6\xe3\x6c\
-\x47\x23\xe4\xa7\xc9\xdc\xeb\xc1\x59\x25\x51\x17\xca\xcd\x52\xa9\
-\x46\x7b\xd5\x0b\x3a\xab\x5e\x13\xdd\x2a\x94\xae\x54\xbe\x54\x88\
-\x5b\x8d\xda\x2f\x87\xff\xbe\xfb\xe1\xec\xf5\xcf\xf2\xb5\x70\x57\
-\x39\xdf\x87\xf0\x1d\xb6\xca\xf0\xe7\x92\xf7\x0e\x98\xeb\xaf\x4a\
-\x77\xd1\x54\x83\x25\xfb\x54\xf6\x17\x2a\xb9\x1d\x56\xd4\xb0\xde\
-\xd9\xb6\x78\xdd\xe1\xe4\x80\x92\xae\x86\xa4\x44\x96\x52\x22\x6e\
-\x93\xc4\x91\x76\x65\xe7\xd1\x1d\x93\xaa\x70\x4f\x98\x10\x6c\x39\
-\x28\x30\xe1\x18\x5c\x03\x43\xd8\x54\x59\x1f\x9e\xad\x41\xbb\x9a\
-\x26\x24\x80\x26\x2c\x7d\x04\xd5\xe2\x0e\xb3\x65\x61\xdd\x57\xe3\
-\x96\xe7\x8c\x80\xb3\xee\xa9\x6c\x4c\x59\xe6\xa8\x78\x9d\xd5\xae\
-\xbb\xd2\xb9\xca\x86\x7c\x08\x51\x4d\x8e\xa3\x72\xbc\xeb\x9b\xf1\
-\xc6\x79\xf7\x24\x91\xab\x27\xe9\x6f\xfc\xe4\xd6\xbe\x69\xeb\xfb\
-\xf2\xae\xf8\x81\x52\x19\x79\xd7\xbd\x51\xf5\xfb\x7e\x77\xb7\xd7\
-\xf4\xa5\xd4\x1a\xd6\xdb\x15\x41\x6d\x47\xb2\x00\xc8\xe8\x0d\x6c\
-\x77\x9c\x7d\xdb\x00\x92\xe9\xdc\xbf\x78\x9a\xe9\xc7\x9c\x23\xc7\
-\xc2\xe0\x03\x21\x99\xde\x58\x0f\xcb\x38\x13\x48\xe0\x91\xf7\xd7\
-\xaf\x3d\x47\x89\xf7\x25\x57\x15\xcc\x41\x20\x46\xfd\x10\x6e\x58\
-\xbc\x60\x22\x66\xf2\xb0\x7c\x09\x44\xd4\x8f\xb9\x6c\x22\xbe\x3d\
-\x8a\x37\xdf\x8d\x8d\x7a\x77\x3d\x6c\xd4\x3a\x23\xef\xe4\x82\xb9\
-\x58\xc5\xf3\xbc\xb8\xb8\x61\x71\x20\x8a\x8d\xd0\xac\xf3\x6f\x30\
-\x3b\x3b\x36\x90\xd5\x8c\x81\x32\x4f\xda\x1c\xcb\xba\x34\x47\xf3\
-\x51\x76\x8f\x6f\x79\xa7\x3f\x7e\xff\xef\xeb\x57\xd0\xdb\x1e\xb9\
-\x72\xbd\xbe\xce\x46\x38\x1c\xdb\x1a\xf6\x9b\xa2\xd6\x36\xb5\xaa\
-\x96\xbb\x6d\xd3\x71\x54\xc3\x76\xc5\xaa\x1e\x6e\x6a\xad\x87\xc2\
-\xb6\xc1\xc0\x76\xd4\xce\xfe\x78\x79\xfa\xe2\xcd\x06\x6a\x7a\xd5\
-\x7b\xe2\x55\x05\xec\x03\x82\xcc\xdc\xe9\xff\x5d\xa7\xf0\xfa\xb9\
-\xa0\xf1\x85\x2d\x1f\x52\x83\x3c\x55\x22\xfa\xd5\x6c\x26\x5b\x54\
-\xd8\xe8\x39\x8f\x31\x17\xea\xb3\x63\x9b\xbc\x38\xa9\x8f\xed\xf9\
-\xe2\x98\xde\x38\xa5\x57\x07\xff\xf0\x86\x2d\xa9\xba\xdb\x4f\xf2\
-\xab\xf1\xd9\xa0\x28\xc0\xb5\xdd\x68\x58\xe4\x9f\xff\x01\x74\x61\
-\x8b\x84\
+\x00\x14\xfa\x78\x9c\xcd\x58\xcd\x6f\x14\x37\x14\xbf\xef\x5f\x61\
+\x4d\x2f\x09\x41\x93\x99\x49\x97\x86\xe9\xa1\xaa\x02\x42\x91\x40\
+\x28\x04\x55\xed\xa9\xf2\xce\x7a\x77\x2d\xbc\xe3\xc1\xe3\x0d\x01\
+\xb4\x87\x8a\x03\x07\xc4\x0d\x89\x33\xc7\x4a\x55\xdb\x63\xa5\x96\
+\x56\xe2\x6f\x81\xa4\xfd\x2f\x6a\x7b\x3e\xed\xf1\x7c\x04\x12\xc0\
+\x2b\xed\x87\xdf\xf3\xf3\xf3\xef\xfd\xde\x9b\xe7\xc5\xcb\x84\x32\
+\x0e\x0e\xf8\xc1\x0a\x47\xf7\x40\xe0\x7a\x23\x6c\x4e\x05\xc6\x94\
+\xbb\x47\x63\xce\x28\x49\x75\xf5\x1b\x0c\x26\x0b\x1c\x41\x72\x7d\
+\x36\x43\x11\x4f\x81\x2f\xa4\xa3\xd1\x3e\x47\x4b\xf0\x78\x04\xe4\
+\x48\x18\x4d\x10\xe3\x0f\xc1\x94\xae\x26\x04\x01\x06\xa7\x98\x86\
+\xc0\x73\x77\x33\x39\x9e\x86\x80\x51\xca\xb3\x5f\x0f\xf0\x94\x2f\
+\x42\x10\xec\x78\x97\x94\xe2\xd7\x60\x81\xf0\x7c\xc1\x43\xe0\x8f\
+\xf3\xa9\x4c\xf1\x08\xa7\x58\x98\x0b\x41\x04\xe3\x23\x98\xee\xc7\
+\x33\xea\x62\xf1\xf6\x5d\x36\x9f\x29\xa5\x78\x1e\x43\x02\x18\x4a\
+\x11\x3f\x54\xdf\x37\x36\x47\x99\xe8\x8e\x70\x17\xc6\x73\x82\x72\
+\x37\x73\x4f\x22\x71\x4c\x88\xe3\x72\x0e\xc6\xd1\x82\xb2\xd4\x9d\
+\x61\x42\x42\x90\x40\x86\x62\x5e\x0a\x27\x94\x4d\x11\x73\x23\x4a\
+\x28\x0b\x81\x33\x21\x30\xba\xe7\x34\x96\x2e\x21\x9b\xe3\x38\x0d\
+\xc1\xd8\x5c\x98\x1f\xd6\x2b\xe7\xe5\xf9\x56\x9a\xe6\x5d\x74\xcc\
+\x41\xe5\x62\xe1\x26\xc7\x9c\x20\x29\xd3\x24\x5c\x4c\x68\x80\x10\
+\x71\xc2\x15\x9c\xa3\x6f\x9c\xd3\x17\x7f\xbe\xfb\xe3\xc9\xdb\x7f\
+\x5e\x9d\xfc\xf4\x9b\x13\x3a\x52\xca\x96\x90\x63\x1a\x3b\x9a\x89\
+\x99\x38\xbf\x9b\xe0\x63\x44\x0e\xf1\x23\x64\x37\x16\x04\x59\x20\
+\x42\x7f\x5c\x8f\x48\xdd\xc2\x84\x12\xe9\x25\x5b\x21\x4d\x56\x40\
+\xc2\x69\x52\x80\x29\xbf\xb7\xe9\xdc\x52\xc8\xc9\xd0\x5b\xf6\x29\
+\xf4\x08\x9a\xf1\xd2\x98\xfc\xd1\xaa\x55\x9a\xf3\x0c\x73\xeb\xf2\
+\x9b\x85\x15\x05\xe4\x8a\x44\x42\xae\x09\xf2\x08\xee\x9a\x16\xe5\
+\x28\x88\xbb\x63\x13\xea\xde\x97\xe1\x74\x99\x5c\xd3\x7b\x02\x5b\
+\x54\x8a\x6d\xc2\xce\xfd\xce\x88\xfc\xae\xc5\x94\xce\xfa\x03\xe1\
+\xf3\x7c\x02\x37\xbc\xcb\xea\xe5\x7a\xfe\xa6\x4d\x3b\x07\xca\xd7\
+\x64\x25\xdd\x2d\xbb\x10\xf8\x50\x2c\x43\x31\x14\xc9\x6c\xa3\x52\
+\x2e\x57\x65\x27\x04\xd7\x44\x91\x39\x5c\xc0\x29\x7d\x60\x24\x8b\
+\x1c\x45\x7e\x7e\xb1\xb3\xe3\xa9\xe1\x34\x54\x52\xb8\x4c\x08\x12\
+\xae\xf8\x41\x43\x56\x78\xf9\x65\x73\x55\xc2\x10\x9c\xca\x5a\xa6\
+\xaf\x5a\x8f\xb4\x9f\xfb\x4b\x11\x1f\x8b\x5f\x25\xab\x94\x42\x43\
+\x5c\x94\x42\x1b\x3a\x72\x14\xfc\x6a\x55\x18\x96\x21\xa6\x66\x11\
+\xfa\x3e\xab\x5d\x4c\x32\xf4\x0a\x93\x81\xdb\x66\x34\xa5\x2b\x16\
+\x89\x72\xe3\xdc\x67\x51\xb8\x8d\x45\x15\x4e\xb7\x15\x34\x6e\x12\
+\xcf\x9d\x2e\x70\x65\xd6\x74\x40\xdb\xa8\x91\x72\x0c\x2a\x72\x5e\
+\x57\x91\x6b\xc2\x5b\x05\xd2\x92\xc3\x1f\x11\xe3\x36\x93\x1d\xcf\
+\x86\xff\x9e\x3e\x3f\x7d\xfd\xab\x78\x2a\xdc\x91\x67\xe8\x44\xfb\
+\x16\x5d\xa5\xe8\x5b\xc1\xfa\x26\xe4\xfa\x93\xd2\x5a\x2d\xe5\xa0\
+\xf1\x1e\x11\xfd\x84\xcc\xe9\xa6\x0d\x39\xf4\x87\xb5\x29\x5d\xb7\
+\x79\xd7\x5b\xc3\xe5\x10\xb4\x48\x13\x82\xf9\x4d\x1c\x37\xf3\xad\
+\x6c\x34\x3a\xc3\x51\x95\xea\x09\xe5\x9c\x2e\x87\xc4\xc4\x1f\x83\
+\x4b\x60\x00\x89\x2a\xdb\x83\xb3\xd4\x6b\xd5\x52\x2c\x04\x61\x11\
+\x88\x1e\x56\x2a\x69\xbb\xd1\xb2\x84\xee\xc9\x71\xdd\xb1\xc0\x6e\
+\xab\x72\x32\x0d\x13\x9a\x36\xeb\x5b\x57\x6d\xeb\xac\x6b\xb6\x42\
+\x21\x76\xc0\xb2\x93\x69\xd6\x8a\xf7\x7c\xea\x5d\x39\xdf\x7e\x23\
+\x68\xf6\x1b\x7d\xfd\x9d\x38\xd2\xf7\xfd\xed\x9d\xd4\xda\x72\x2e\
+\x3b\x5b\xfa\xdc\x0f\x9d\x1d\x5d\xc3\x9b\x52\x69\x50\xd3\x96\x47\
+\xb3\x15\xc6\x1c\x9e\x42\x6d\x58\x3f\x63\xe9\xc8\x7a\x79\xa5\x52\
+\xfc\x82\x99\xa5\xf6\x38\x37\x5a\xf9\xde\x27\xe7\x95\x3a\x50\x3f\
+\xb1\x18\xe5\x90\xa3\x2d\xe7\xcd\xef\xdd\xb7\x83\x0f\xe3\x52\x15\
+\xc1\x21\xe8\x05\xbd\xd8\xd5\xec\x5d\x1c\xed\x52\x71\xd9\xbd\x68\
+\xda\xa9\x3d\x3e\x2a\xed\xce\x0c\xdd\x57\x67\xe7\x9e\x3a\x55\x3f\
+\xf7\x94\xda\x96\x73\x7c\x91\xcc\xab\x82\x78\x3e\xcc\xab\xd9\x1b\
+\x06\x9f\x19\x11\x81\xde\x68\x7b\xdb\x00\xb0\x9a\x28\x20\xcc\xf2\
+\x52\x61\xa8\x0b\x33\x14\xef\xa7\x77\xd9\x86\x73\xf2\xf2\xd9\xbf\
+\xaf\x7f\x09\x9d\xcd\xfc\xb1\xf0\x63\x3d\x9b\xf5\x65\x26\xaa\xfe\
+\xd8\x50\x30\x6b\x7f\xbd\xf1\x69\xd5\x2c\x0f\xd9\xa2\xd2\xac\x74\
+\xed\x7a\x55\xad\xab\x29\xad\x07\x81\x55\xf1\xad\x1d\xab\xd3\xbf\
+\x7e\x3e\x79\xf1\x77\x0d\x2b\xb5\xe8\x83\x50\xaa\x62\xf4\x59\x00\
+\x95\x7f\xaa\x8f\x8e\x5b\xb2\xde\xbd\x9b\xff\x82\x65\x43\x28\xe0\
+\x47\x52\x42\x6e\xcf\x66\xa2\xab\x0c\xcd\x3e\xf1\x08\x31\x2e\xff\
+\x0c\x6c\x11\xe7\x17\xe9\xb1\x31\x9d\xdf\xa2\xcd\x4b\x74\x75\x29\
+\xf7\xaf\x18\x82\xaa\x1b\xbd\x9a\xbd\xcc\x0b\x7d\x5e\x54\xeb\xc7\
+\x10\x50\xac\x47\xff\x03\x1a\xa1\x9b\xc4\
 "
 
 qt_resource_name = b"\
@@ -14381,17 +14380,17 @@ qt_resource_struct_v2 = b"\
 \x00\x00\x00\x0c\x00\x02\x00\x00\x00\x05\x00\x00\x00\x03\
 \x00\x00\x00\x00\x00\x00\x00\x00\
 \x00\x00\x00\x1c\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
-\x00\x00\x01\x9a\x0e\xbe\x33\x4b\
+\x00\x00\x01\x9c\x0e\x37\x8a\xd8\
 \x00\x00\x00\x3a\x00\x00\x00\x00\x00\x01\x00\x00\x18\x77\
-\x00\x00\x01\x9a\x0e\xbe\x33\x51\
+\x00\x00\x01\x9c\x0e\x37\x8a\xd8\
 \x00\x00\x00\x52\x00\x00\x00\x00\x00\x01\x00\x00\x3b\xea\
-\x00\x00\x01\x9a\x0e\xbe\x33\x4b\
+\x00\x00\x01\x9c\x0e\x37\x8a\xd8\
 \x00\x00\x00\x6a\x00\x00\x00\x00\x00\x01\x00\x00\x56\x6c\
-\x00\x00\x01\x98\xac\xaa\xd1\xd1\
+\x00\x00\x01\x9c\x0e\x37\x8a\xd8\
 \x00\x00\x00\x7e\x00\x00\x00\x00\x00\x01\x00\x03\x64\x69\
-\x00\x00\x01\x9a\x0e\xbe\x33\x33\
+\x00\x00\x01\x9c\x0e\x37\x8a\xd8\
 \x00\x00\x00\x96\x00\x01\x00\x00\x00\x01\x00\x03\x79\x89\
-\x00\x00\x01\x9a\x0e\xbe\x33\x33\
+\x00\x00\x01\xa1\x54\x2c\xe2\x4f\
 "
 
 qt_version = [int(v) for v in QtCore.qVersion().split('.')]
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SiteConfig - 站点配置文件读写
+保存标签、基站、区域、平面图和视图设置，
+使用iterparse流式读取XML，写入时先写临时文件再替换，
+并在旁边保存按文件修改时间校验的JSON缓存，重复加载时跳过XML解析
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+
+CACHE_SUFFIX = ".cache.json"
+CACHE_VERSION = 2
+
+# 配置文件中的各部分，旧版文件可能只包含其中一部分
+SECTION_TAG = "tag_cfg"
+SECTION_LABELS = "tag"
+SECTION_ANCHORS = "anchor"
+SECTION_ZONE1 = "zone1"
+SECTION_ZONE2 = "zone2"
+SECTION_GEOFENCING = "geofencing"
+SECTION_FLOORPLAN = "floorplan"
+SECTION_VIEW = "view"
+SECTIONS = (SECTION_TAG, SECTION_LABELS, SECTION_ANCHORS, SECTION_ZONE1, SECTION_ZONE2,
+            SECTION_GEOFENCING, SECTION_FLOORPLAN, SECTION_VIEW)
+
+
+class AnchorConfig:
+    """配置文件中的基站"""
+    def __init__(self):
+        self.anchorId = 0
+        self.groupId = 0
+        self.ip = ""
+        self.mac = ""
+        self.x = 0.0
+        self.y = 0.0
+        self.z = 0.0
+
+
+class SiteConfig:
+    """站点配置"""
+    def __init__(self):
+        # 标签
+        self.tagSize = 0.3
+        self.historyLength = 20
+        self.tagLabels = {}  # tag_id -> label
+
+        # 基站
+        self.anchors = []  # AnchorConfig
+
+        # 区域（地理围栏）
+        self.zone1Rad = 0.0
+        self.zone2Rad = 0.0
+        self.zone1Red = False
+        self.zone2Red = False
+        self.geoFencingMode = False
+
+        # 平面图
+        self.floorplanPath = ""
+        self.floorplanShow = False
+        self.floorplanTransform = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)  # m11..m33
+
+        # 视图
+        self.gridShow = True
+        self.gridWidth = 1.0
+        self.gridHeight = 1.0
+        self.originShow = True
+
+        # 加载时文件中实际包含的部分，其余字段为默认值
+        self.sections = set(SECTIONS)
+
+    def hasSection(self, section):
+        """配置文件是否包含该部分"""
+        return section in self.sections
+
+    # ========== JSON缓存 ==========
+
+    def toDict(self):
+        """转换为可写入JSON的字典"""
+        return {
+            "tagSize": self.tagSize,
+            "historyLength": self.historyLength,
+            "tagLabels": {hex(tag_id): label for tag_id, label in self.tagLabels.items()},
+            "anchors": [vars(anchor) for anchor in self.anchors],
+            "zone1Rad": self.zone1Rad,
+            "zone2Rad": self.zone2Rad,
+            "zone1Red": self.zone1Red,
+            "zone2Red": self.zone2Red,
+            "geoFencingMode": self.geoFencingMode,
+            "floorplanPath": self.floorplanPath,
+            "floorplanShow": self.floorplanShow,
+            "floorplanTransform": list(self.floorplanTransform),
+            "gridShow": self.gridShow,
+            "gridWidth": self.gridWidth,
+            "gridHeight": self.gridHeight,
+            "originShow": self.originShow,
+            "sections": sorted(self.sections),
+        }
+
+    @classmethod
+    def fromDict(cls, data):
+        """从toDict()生成的字典恢复"""
+        cfg = cls()
+        for key, value in data.items():
+            if key == "tagLabels":
+                cfg.tagLabels = {int(tag_id, 16): label for tag_id, label in value.items()}
+            elif key == "anchors":
+                for item in value:
+                    anchor = AnchorConfig()
+                    anchor.__dict__.update(item)
+                    cfg.anchors.append(anchor)
+            elif key == "floorplanTransform":
+                cfg.floorplanTransform = tuple(value)
+            elif key == "sections":
+                cfg.sections = set(value)
+            elif hasattr(cfg, key):
+                setattr(cfg, key, value)
+        return cfg
+
+
+def _toBool(text):
+    """XML属性转布尔值"""
+    return str(text).lower() in ("1", "true", "yes")
+
+
+def _parseXml(filename):
+    """流式解析XML配置文件"""
+    cfg = SiteConfig()
+    cfg.sections = set()
+    depth = 0
+
+    for event, elem in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1 and elem.tag != "config":
+                raise ValueError(f"not a config file: <{elem.tag}>")
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        tag = elem.tag
+        get = elem.get
+        if tag in SECTIONS:
+            cfg.sections.add(tag)
+        if tag == "tag_cfg":
+            cfg.tagSize = float(get("size", "0.3"))
+            cfg.historyLength = int(get("history", "20"))
+        elif tag == "tag":
+            cfg.tagLabels[int(get("ID"), 16)] = get("label", "")
+        elif tag == "anchor":
+            anchor = AnchorConfig()
+            anchor.anchorId = int(get("ID", "0"))
+            anchor.groupId = int(get("group", "0"))
+            anchor.ip = get("ip", "")
+            anchor.mac = get("mac", "")
+            anchor.x = float(get("x", "0"))
+            anchor.y = float(get("y", "0"))
+            anchor.z = float(get("z", "0"))
+            cfg.anchors.append(anchor)
+        elif tag == "zone":
+            if get("id") in ("1", "2"):
+                cfg.sections.add("zone" + get("id"))
+            if get("id") == "1":
+                cfg.zone1Rad = float(get("radius", "0"))
+                cfg.zone1Red = _toBool(get("red", "false"))
+            elif get("id") == "2":
+                cfg.zone2Rad = float(get("radius", "0"))
+                cfg.zone2Red = _toBool(get("red", "false"))
+        elif tag == "geofencing":
+            cfg.geoFencingMode = _toBool(get("mode", "false"))
+        elif tag == "floorplan":
+            cfg.floorplanPath = get("path", "")
+            cfg.floorplanShow = _toBool(get("show", "false"))
+            cfg.floorplanTransform = tuple(
+                float(get(name, default)) for name, default in
+                (("m11", "1"), ("m12", "0"), ("m13", "0"),
+                 ("m21", "0"), ("m22", "1"), ("m23", "0"),
+                 ("m31", "0"), ("m32", "0"), ("m33", "1")))
+        elif tag == "view":
+            cfg.gridShow = _toBool(get("grid_show", "true"))
+            cfg.gridWidth = float(get("grid_width", "1"))
+            cfg.gridHeight = float(get("grid_height", "1"))
+            cfg.originShow = _toBool(get("origin_show", "true"))
+
+        # 处理完的元素立即释放，避免整棵树驻留内存
+        elem.clear()
+
+    return cfg
+
+
+def _buildXml(cfg):
+    """生成XML元素树"""
+    root = ET.Element("config")
+
+    ET.SubElement(root, "tag_cfg", size=str(cfg.tagSize), history=str(cfg.historyLength))
+
+    for tag_id, label in cfg.tagLabels.items():
+        ET.SubElement(root, "tag", ID=hex(tag_id), label=label)
+
+    for anchor in cfg.anchors:
+        ET.SubElement(root, "anchor", ID=str(anchor.anchorId), group=str(anchor.groupId),
+                      ip=anchor.ip, mac=anchor.mac,
+                      x=f"{anchor.x:.3f}", y=f"{anchor.y:.3f}", z=f"{anchor.z:.3f}")
+
+    ET.SubElement(root, "zone", id="1", radius=str(cfg.zone1Rad), red=str(cfg.zone1Red).lower())
+    ET.SubElement(root, "zone", id="2", radius=str(cfg.zone2Rad), red=str(cfg.zone2Red).lower())
+    ET.SubElement(root, "geofencing", mode=str(cfg.geoFencingMode).lower())
+
+    names = ("m11", "m12", "m13", "m21", "m22", "m23", "m31", "m32", "m33")
+    floorplan = ET.SubElement(root, "floorplan", path=cfg.floorplanPath,
+                              show=str(cfg.floorplanShow).lower())
+    for name, value in zip(names, cfg.floorplanTransform):
+        floorplan.set(name, repr(float(value)))
+
+    ET.SubElement(root, "view", grid_show=str(cfg.gridShow).lower(),
+                  grid_width=str(cfg.gridWidth), grid_height=str(cfg.gridHeight),
+                  origin_show=str(cfg.originShow).lower())
+
+    return ET.ElementTree(root)
+
+
+def _atomicWrite(filename, writer, mode="wb", encoding=None):
+    """先写入同目录下的临时文件，完成后替换目标文件（文本模式需指定encoding）"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmpPath = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        # mkstemp创建的文件只有属主可读写，保留原文件权限
+        if os.path.exists(filename):
+            shutil.copymode(filename, tmpPath)
+        else:
+            os.chmod(tmpPath, 0o644)
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            writer(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmpPath, filename)
+    except BaseException:
+        try:
+            os.unlink(tmpPath)
+        except OSError:
+            pass
+        raise
+
+
+def _cacheKey(filename):
+    """缓存校验值：文件修改时间和大小"""
+    st = os.stat(filename)
+    return st.st_mtime_ns, st.st_size
+
+
+def _readCache(filename):
+    """读取JSON缓存，失效时返回None"""
+    try:
+        with open(filename + CACHE_SUFFIX, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CACHE_VERSION:
+            return None
+        if (data.get("mtime_ns"), data.get("size")) != _cacheKey(filename):
+            return None
+        return SiteConfig.fromDict(data["config"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _writeCache(filename, cfg):
+    """写入JSON缓存，失败时忽略"""
+    try:
+        mtime_ns, size = _cacheKey(filename)
+        data = {"version": CACHE_VERSION, "mtime_ns": mtime_ns, "size": size, "config": cfg.toDict()}
+        _atomicWrite(filename + CACHE_SUFFIX,
+                     lambda f: json.dump(data, f, ensure_ascii=False), mode="w", encoding="utf-8")
+    except (OSError, ValueError) as e:
+        print(f"Error writing config cache: {e}")
+
+
+def loadSiteConfig(filename, useCache=True):
+    """加载站点配置"""
+    if useCache:
+        cfg = _readCache(filename)
+        if cfg is not None:
+            return cfg
+
+    cfg = _parseXml(filename)
+    if useCache:
+        _writeCache(filename, cfg)
+    return cfg
+
+
+def saveSiteConfig(filename, cfg, useCache=True):
+    """保存站点配置"""
+    tree = _buildXml(cfg)
+    _atomicWrite(filename, lambda f: tree.write(f, encoding="utf-8", xml_declaration=True))
+    if useCache:
+        _writeCache(filename, cfg)
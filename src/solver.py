@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Solver - 标签位置解算
+由基站坐标和测距用线性化最小二乘求初值，再用Gauss-Newton迭代求解。
+只依赖numpy，可在进程池的子进程中运行
+"""
+
+import numpy as np
+
+MIN_ANCHORS = 3  # 解算所需的最少测距数量
+
+
+def _initialGuess(anchors, ranges, fixedZ):
+    """线性化最小二乘初值：各方程减去第一个方程消去二次项"""
+    a0 = anchors[0]
+    r0 = ranges[0]
+    A = 2.0 * (anchors[1:, :2] - a0[:2])
+    zTerm = 0.0 if fixedZ is None else (anchors[1:, 2] - fixedZ) ** 2 - (a0[2] - fixedZ) ** 2
+    b = (r0 * r0 - ranges[1:] ** 2
+         + np.sum(anchors[1:, :2] ** 2, axis=1) - np.sum(a0[:2] ** 2)
+         + zTerm)
+    xy, *_ = np.linalg.lstsq(A, b, rcond=None)
+    z = fixedZ if fixedZ is not None else float(np.mean(anchors[:, 2]))
+    return np.array([xy[0], xy[1], z])
+
+
+def solvePosition(anchors, ranges, initial=None, fixedZ=None, weights=None, iterations=10):
+    """
+    解算单个标签位置
+    anchors: (N, 3) 基站坐标；ranges: (N,) 测距，NaN表示缺失
+    fixedZ: 不为None时固定标签高度，只解算x、y
+    返回 (位置(3,), 残差均方根)，测距不足时返回 (None, nan)
+    """
+    anchors = np.asarray(anchors, dtype=float)
+    ranges = np.asarray(ranges, dtype=float)
+    valid = np.isfinite(ranges) & (ranges > 0)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        valid &= weights > 0
+    if np.count_nonzero(valid) < MIN_ANCHORS:
+        return None, float("nan")
+
+    anchors = anchors[valid]
+    ranges = ranges[valid]
+    w = np.ones(len(ranges)) if weights is None else weights[valid]
+    dims = 2 if fixedZ is not None else 3
+    # 基站数量不足以确定高度时固定高度
+    if dims == 3 and len(ranges) < 4:
+        fixedZ = float(np.mean(anchors[:, 2]))
+        dims = 2
+
+    if initial is not None and np.all(np.isfinite(initial)):
+        p = np.array(initial, dtype=float)
+        if fixedZ is not None:
+            p[2] = fixedZ
+    else:
+        p = _initialGuess(anchors, ranges, fixedZ)
+
+    sw = np.sqrt(w)
+    maxStep = max(float(np.max(ranges)) * 0.5, 1.0)
+    for _ in range(iterations):
+        diff = p - anchors
+        dist = np.sqrt(np.sum(diff * diff, axis=1))
+        dist = np.maximum(dist, 1e-9)
+        residual = dist - ranges
+        J = diff[:, :dims] / dist[:, None]
+        step, *_ = np.linalg.lstsq(J * sw[:, None], -residual * sw, rcond=None)
+        # 基站接近共面时高度方向病态，限制单步长度防止发散
+        norm = np.sqrt(np.dot(step, step))
+        if norm > maxStep:
+            step *= maxStep / norm
+        p[:dims] += step
+        if np.dot(step, step) < 1e-10:
+            break
+
+    dist = np.sqrt(np.sum((p - anchors) ** 2, axis=1))
+    rms = float(np.sqrt(np.mean((dist - ranges) ** 2)))
+    return p, rms
+
+
+def solveBatch(anchors, ranges, initials=None, fixedZ=None, weights=None):
+    """
+    批量解算，供进程池调用
+    anchors: (N, 3)；ranges: (M, N)；initials: (M, 3)，NaN表示没有初值
+    weights: (M, N) 测距权重，0表示不使用该测距
+    返回 (positions(M, 3), rms(M,))，无法解算的行为NaN
+    """
+    anchors = np.asarray(anchors, dtype=float)
+    ranges = np.asarray(ranges, dtype=float)
+    count = len(ranges)
+    positions = np.full((count, 3), np.nan)
+    rms = np.full(count, np.nan)
+    for i in range(count):
+        initial = None if initials is None else initials[i]
+        w = None if weights is None else weights[i]
+        p, r = solvePosition(anchors, ranges[i], initial, fixedZ, w)
+        if p is not None:
+            positions[i] = p
+            rms[i] = r
+    return positions, rms
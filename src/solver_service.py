@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SolverService - 进程池位置解算服务
+测距批次和解算结果通过multiprocessing.shared_memory中的NumPy数组传递，
+提交给子进程的只有共享内存名称和批次大小，不序列化逐标签的对象
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+import solver
+
+MAX_BATCH = 256  # 每个缓冲区最多容纳的测距数量
+MAX_ANCHORS = 64  # 每组最多的基站数量
+
+_attached = {}  # 子进程中已打开的共享内存：名称 -> SolverBuffer
+
+
+class SolverBuffer:
+    """一块共享内存及其上的数组视图"""
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.name = shm.name
+        offset = 0
+        self.anchors, offset = self._view(shm, offset, (MAX_ANCHORS, 3))
+        self.ranges, offset = self._view(shm, offset, (MAX_BATCH, MAX_ANCHORS))
+        self.initials, offset = self._view(shm, offset, (MAX_BATCH, 3))
+        self.positions, offset = self._view(shm, offset, (MAX_BATCH, 3))
+        self.rms, offset = self._view(shm, offset, (MAX_BATCH,))
+        self.weights, offset = self._view(shm, offset, (MAX_BATCH, MAX_ANCHORS))
+
+    @staticmethod
+    def _view(shm, offset, shape):
+        """在共享内存上创建float64数组视图"""
+        count = int(np.prod(shape))
+        array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, offset=offset)
+        return array, offset + count * 8
+
+    @staticmethod
+    def size():
+        """共享内存大小（字节）"""
+        return 8 * (MAX_ANCHORS * 3 + MAX_BATCH * MAX_ANCHORS * 2 + MAX_BATCH * 3 * 2 + MAX_BATCH)
+
+    def release(self):
+        """释放数组视图，之后才能关闭共享内存"""
+        self.anchors = self.ranges = self.initials = self.positions = self.rms = self.weights = None
+
+
+def _attach(name):
+    """子进程中按名称打开共享内存，不交给resource_tracker管理（由主进程负责释放）"""
+    buf = _attached.get(name)
+    if buf is None:
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python 3.13以前没有track参数；子进程与主进程共用resource_tracker，
+            # 在子进程中注销会使主进程unlink时出错，所以打开时跳过注册
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        buf = SolverBuffer(shm)
+        _attached[name] = buf
+    return buf
+
+
+def _solveShared(name, count, anchorCount, fixedZ, weighted=False):
+    """子进程入口：解算共享内存中的一批测距，结果写回共享内存"""
+    buf = _attach(name)
+    anchors = buf.anchors[:anchorCount]
+    ranges = buf.ranges[:count, :anchorCount]
+    initials = buf.initials[:count]
+    weights = buf.weights[:count, :anchorCount] if weighted else None
+    positions, rms = solver.solveBatch(anchors, ranges, initials, fixedZ, weights)
+    buf.positions[:count] = positions
+    buf.rms[:count] = rms
+    return count
+
+
+class SolverService:
+    """进程池解算服务"""
+
+    def __init__(self, processes=None, buffers=None, useProcesses=True):
+        self._processes = processes
+        self._useProcesses = useProcesses
+        self._pool = None
+        self._lock = threading.Lock()
+        self._bufferReturned = threading.Condition(self._lock)
+        self._bufferCount = buffers
+        self._buffers = []
+        self._free = []  # 空闲的缓冲区，其余正被解算线程使用
+        self.batches = 0  # 已解算的批次数量
+
+    def _start(self):
+        """延迟创建进程池和共享内存"""
+        with self._lock:
+            if self._pool is not None or not self._useProcesses:
+                return self._pool
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self._processes)
+                count = self._bufferCount or 2 * (self._processes or os.cpu_count() or 1)
+                for _ in range(count):
+                    shm = shared_memory.SharedMemory(create=True, size=SolverBuffer.size())
+                    buf = SolverBuffer(shm)
+                    self._buffers.append(buf)
+                    self._free.append(buf)
+            except (OSError, ValueError) as e:
+                print(f"Error starting solver service, solving in thread: {e}")
+                self._useProcesses = False
+                self._shutdown()
+            return self._pool
+
+    def solve(self, anchors, ranges, initials=None, fixedZ=None, weights=None):
+        """
+        批量解算，参数和返回值与solver.solveBatch相同
+        可在多个线程中同时调用，超过MAX_BATCH的批次自动拆分
+        """
+        anchors = np.asarray(anchors, dtype=float)
+        ranges = np.asarray(ranges, dtype=float)
+        count = len(ranges)
+        if initials is None:
+            initials = np.full((count, 3), np.nan)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+
+        pool = self._start()
+        if pool is None or len(anchors) > MAX_ANCHORS:
+            return solver.solveBatch(anchors, ranges, initials, fixedZ, weights)
+
+        positions = np.empty((count, 3))
+        rms = np.empty(count)
+        for start in range(0, count, MAX_BATCH):
+            end = min(start + MAX_BATCH, count)
+            chunkWeights = None if weights is None else weights[start:end]
+            try:
+                result = self._solveChunk(
+                    pool, anchors, ranges[start:end], initials[start:end], fixedZ, chunkWeights)
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                print(f"Error in solver service, solving in thread: {e}")
+                with self._lock:
+                    # 关闭失效的进程池，之后_start()返回None，直接在线程中解算
+                    self._useProcesses = False
+                    self._shutdown()
+                result = None
+            if result is None:
+                # 进程池不可用或服务已停止，剩余部分在当前线程解算
+                positions[start:], rms[start:] = solver.solveBatch(
+                    anchors, ranges[start:], initials[start:], fixedZ,
+                    None if weights is None else weights[start:])
+                break
+            positions[start:end], rms[start:end] = result
+        return positions, rms
+
+    def _acquire(self):
+        """取一块空闲的缓冲区，服务已停止时返回None"""
+        with self._bufferReturned:
+            while self._pool is not None and not self._free:
+                self._bufferReturned.wait()
+            if self._pool is None:
+                return None
+            return self._free.pop()
+
+    def _giveBack(self, buf):
+        """归还缓冲区"""
+        with self._bufferReturned:
+            self._free.append(buf)
+            self._bufferReturned.notify_all()
+
+    def _solveChunk(self, pool, anchors, ranges, initials, fixedZ, weights=None):
+        """用一块共享内存解算不超过MAX_BATCH的测距，服务已停止时返回None"""
+        count = len(ranges)
+        anchorCount = len(anchors)
+        buf = self._acquire()
+        if buf is None:
+            return None
+        try:
+            buf.anchors[:anchorCount] = anchors
+            buf.ranges[:count, :anchorCount] = ranges
+            buf.initials[:count] = initials
+            if weights is not None:
+                buf.weights[:count, :anchorCount] = weights
+            pool.submit(_solveShared, buf.name, count, anchorCount, fixedZ, weights is not None).result()
+            self.batches += 1
+            return buf.positions[:count].copy(), buf.rms[:count].copy()
+        finally:
+            self._giveBack(buf)
+
+    def _shutdown(self):
+        """
+        关闭进程池并释放共享内存（调用时需持有锁）
+        之后的解算改在调用线程进行；先等待正在使用的缓冲区全部归还，再关闭共享内存
+        """
+        pool = self._pool
+        self._pool = None
+        self._bufferReturned.notify_all()
+        while len(self._free) < len(self._buffers):
+            self._bufferReturned.wait()
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        for buf in self._buffers:
+            shm = buf.shm
+            buf.release()
+            shm.close()
+            shm.unlink()
+        self._buffers = []
+        self._free = []
+
+    def stop(self):
+        """停止服务"""
+        with self._lock:
+            self._useProcesses = False
+            self._shutdown()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TagAccuracy - 静态标签定位精度的在线估计
+用Welford算法递推位置均值和协方差，用P²算法估计相对均值的半径分位数（R95、CEP），
+每次上报的更新为O(1)，不保存历史位置
+"""
+
+import math
+
+
+class P2Quantile:
+    """P²分位数估计器（Jain & Chlamtac），只保存5个标记点"""
+
+    def __init__(self, p):
+        self.p = p
+        self._initial = []  # 前5个样本
+        self._ready = False
+        self._q = [0.0] * 5  # 标记点高度
+        self._n = [0, 1, 2, 3, 4]  # 标记点位置
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # 期望位置
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]  # 期望位置增量
+
+    def count(self):
+        """样本数量"""
+        if not self._ready:
+            return len(self._initial)
+        return self._n[4] + 1
+
+    def add(self, x):
+        """加入一个样本"""
+        if not self._ready:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self._q = sorted(self._initial)
+                self._ready = True
+            return
+
+        q = self._q
+        n = self._n
+
+        # 找到样本所在区间并调整极值
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        # 调整中间三个标记点
+        for i in range(1, 4):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = self._parabolic(i, s)
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    def _parabolic(self, i, s):
+        """抛物线插值"""
+        q = self._q
+        n = self._n
+        return q[i] + s / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        """当前分位数估计，没有样本时返回0"""
+        if not self._ready:
+            if not self._initial:
+                return 0.0
+            samples = sorted(self._initial)
+            return samples[min(len(samples) - 1, int(round(self.p * (len(samples) - 1))))]
+        return self._q[2]
+
+
+class TagAccuracy:
+    """单个标签的静态精度统计"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """重新开始统计"""
+        self.count = 0
+        self.mean = [0.0, 0.0, 0.0]
+        self._m2 = [[0.0] * 3 for _ in range(3)]  # 离差乘积和
+        self._r95 = P2Quantile(0.95)
+        self._cep = P2Quantile(0.5)
+
+    def add(self, x, y, z):
+        """加入一个位置"""
+        self.count += 1
+        p = (x, y, z)
+        delta = [p[i] - self.mean[i] for i in range(3)]
+        for i in range(3):
+            self.mean[i] += delta[i] / self.count
+        delta2 = [p[i] - self.mean[i] for i in range(3)]
+        for i in range(3):
+            for j in range(3):
+                self._m2[i][j] += delta[i] * delta2[j]
+
+        # 水平半径相对当前均值
+        r = math.hypot(x - self.mean[0], y - self.mean[1])
+        self._r95.add(r)
+        self._cep.add(r)
+
+    def covariance(self):
+        """位置协方差矩阵（3x3）"""
+        if self.count < 2:
+            return [[0.0] * 3 for _ in range(3)]
+        return [[self._m2[i][j] / (self.count - 1) for j in range(3)] for i in range(3)]
+
+    def r95(self):
+        """95%水平误差半径（米）"""
+        return self._r95.value()
+
+    def cep(self):
+        """50%水平误差半径（米）"""
+        return self._cep.value()
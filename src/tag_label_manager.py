@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TagLabelManager - 标签文字管理
+只绘制可见区域内的标签文字，按屏幕占用网格跳过会互相重叠的文字，
+并缓存排版好的QStaticText，避免每帧重复进行文字排版
+"""
+
+import math
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QStaticText, QTransform, QPen
+
+
+class TagLabelManager:
+    """标签文字管理器"""
+
+    CELL_SIZE = 8  # 占用网格的单元大小（像素）
+    LABEL_OFFSET = QPointF(6, -18)  # 文字相对标签位置点的屏幕偏移
+    MAX_CACHE_SIZE = 2048  # 缓存的QStaticText数量上限
+
+    def __init__(self):
+        self._visibleRect = QRectF()
+        self._cache = {}  # (文字, 字体) -> QStaticText
+        self._drawn = 0
+        self._skipped = 0
+
+    def setVisibleRect(self, rect):
+        """设置可见矩形（场景坐标）"""
+        # 视图旋转后实际可见区域会超出visibleRect，按其外接圆放大
+        center = rect.center()
+        half = math.hypot(rect.width(), rect.height()) / 2
+        self._visibleRect = QRectF(center.x() - half, center.y() - half, 2 * half, 2 * half)
+
+    def visibleRect(self):
+        """获取用于裁剪的可见矩形"""
+        return QRectF(self._visibleRect)
+
+    def staticText(self, text, font):
+        """获取缓存的QStaticText"""
+        key = (text, font.key())
+        st = self._cache.get(key)
+        if st is None:
+            if len(self._cache) >= self.MAX_CACHE_SIZE:
+                self._cache.clear()
+            st = QStaticText(text)
+            st.setTextFormat(Qt.PlainText)
+            st.setPerformanceHint(QStaticText.AggressiveCaching)
+            st.prepare(QTransform(), font)
+            self._cache[key] = st
+        return st
+
+    def clearCache(self):
+        """清除文字缓存"""
+        self._cache.clear()
+
+    def statistics(self):
+        """上一帧绘制和跳过的文字数量"""
+        return self._drawn, self._skipped
+
+    def paint(self, painter, markers):
+        """绘制标签文字，markers中每项需提供p和label属性"""
+        self._drawn = 0
+        self._skipped = 0
+
+        cull = not self._visibleRect.isNull()
+        deviceTransform = painter.worldTransform()
+        font = painter.font()
+        cell = self.CELL_SIZE
+        occupied = set()
+
+        painter.save()
+        painter.setWorldTransform(QTransform())
+        painter.setPen(QPen(Qt.black))
+
+        for marker in markers:
+            if cull and not self._visibleRect.contains(marker.p):
+                continue
+
+            st = self.staticText(marker.label, font)
+            size = st.size()
+            pos = deviceTransform.map(marker.p) + self.LABEL_OFFSET
+
+            x0 = int(pos.x() // cell)
+            y0 = int(pos.y() // cell)
+            x1 = int((pos.x() + size.width()) // cell)
+            y1 = int((pos.y() + size.height()) // cell)
+            cells = [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+            if any(c in occupied for c in cells):
+                self._skipped += 1
+                continue
+
+            occupied.update(cells)
+            painter.drawStaticText(pos, st)
+            self._drawn += 1
+
+        painter.restore()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TagLayerItem - 标签图层
+用一个QGraphicsItem在一次paint()中绘制所有标签的位置点、历史轨迹、
+R95圆、定位圆和文字标签，替代每个标签十余个独立的场景图元
+"""
+
+from collections import deque
+
+from PyQt5.QtWidgets import QGraphicsObject, QGraphicsItem
+from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QPolygonF
+
+from tag_label_manager import TagLabelManager
+from range_circle_overlay import RangeCircleOverlay
+
+
+class TagMarker:
+    """标签图层中单个标签的绘制数据"""
+    def __init__(self, tag_id):
+        self.id = tag_id
+        self.p = QPointF()  # 当前位置
+        self.z = 0.0
+        self.history = deque(maxlen=20)  # 历史位置点
+        self.avgp = QPointF()  # 平均位置点
+        self.r95 = 0.0  # R95半径（米）
+        self.r95Show = False
+        self.ranges = {}  # 基站表格行 -> 测距（米）
+        self.rangesShow = True
+        self.label = ""
+        self.showLabel = False
+        self.colour = QColor(Qt.blue)
+        self.valid = False
+        self.extent = QRectF()  # 场景坐标下的包围矩形
+
+
+class TagLayerItem(QGraphicsObject):
+    """标签图层"""
+
+    # 信号定义
+    tagClicked = pyqtSignal(object)  # tag_id
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._tags = {}  # tag_id -> TagMarker
+        self._anchors = {}  # 基站表格行 -> QPointF
+        self._tagSize = 0.3
+        self._historyLength = 20
+        self._showHistory = True
+        self._labelMargin = 1.0  # 为屏幕坐标下的文字预留的场景边距
+        self._bounds = QRectF()
+        self._labelManager = TagLabelManager()
+        self._rangeCircles = RangeCircleOverlay()
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.setZValue(1)
+
+    # ========== 标签数据 ==========
+
+    def tag(self, tag_id):
+        """获取标签数据，不存在时创建"""
+        marker = self._tags.get(tag_id)
+        if marker is None:
+            marker = TagMarker(tag_id)
+            marker.history = deque(maxlen=self._historyLength)
+            self._tags[tag_id] = marker
+        return marker
+
+    def tags(self):
+        """获取所有标签数据"""
+        return self._tags
+
+    def removeTag(self, tag_id):
+        """移除标签"""
+        marker = self._tags.pop(tag_id, None)
+        if marker is not None:
+            self._rangeCircles.invalidate()
+            self._recomputeBounds()
+            self.update(marker.extent)
+
+    def clear(self):
+        """清除所有标签"""
+        self._tags.clear()
+        self._rangeCircles.invalidate()
+        self._recomputeBounds()
+        self.update()
+
+    def setTagPosition(self, tag_id, x, y, z=0.0):
+        """设置标签位置"""
+        marker = self.tag(tag_id)
+        oldExtent = QRectF(marker.extent)
+
+        if marker.valid and self._showHistory:
+            marker.history.append(QPointF(marker.p))
+        marker.p = QPointF(x, y)
+        marker.z = z
+        marker.valid = True
+
+        if self._rangeCircles.isTagShown(marker):
+            self._rangeCircles.invalidate()
+        self._updateExtent(marker)
+        self.update(oldExtent.united(marker.extent))
+
+    def hideTag(self, tag_id):
+        """隐藏标签（保留标签的显示设置），下次设置位置时重新显示"""
+        marker = self._tags.get(tag_id)
+        if marker is None or not marker.valid:
+            return
+        oldExtent = QRectF(marker.extent)
+        marker.valid = False
+        marker.history.clear()
+        self._updateExtent(marker)
+        self._rangeCircles.invalidate()
+        self.update(oldExtent)
+
+    def clearHistory(self):
+        """清除所有标签的历史轨迹（位置不连续时调用）"""
+        for marker in self._tags.values():
+            marker.history.clear()
+            self._updateExtent(marker)
+        self.update()
+
+    def setTagStats(self, tag_id, x, y, r95):
+        """设置标签平均位置和R95半径"""
+        marker = self.tag(tag_id)
+        marker.avgp = QPointF(x, y)
+        marker.r95 = r95
+        if marker.r95Show:
+            self._updateExtent(marker)
+            self.update(marker.extent)
+
+    def setTagRange(self, tag_id, anc_idx, range_val):
+        """设置标签到基站的测距，anc_idx为基站表格行"""
+        marker = self.tag(tag_id)
+        marker.ranges[anc_idx] = range_val
+        if marker.valid and self._rangeCircles.isTagShown(marker):
+            self._rangeCircles.invalidate()
+            self._updateExtent(marker)
+            self.update(marker.extent)
+
+    def clearTagRanges(self, tag_id):
+        """清除标签的所有测距（标签切换到其他组时调用）"""
+        marker = self._tags.get(tag_id)
+        if marker is None or not marker.ranges:
+            return
+        oldExtent = QRectF(marker.extent)
+        marker.ranges.clear()
+        if self._rangeCircles.isTagShown(marker):
+            self._rangeCircles.invalidate()
+        self._updateExtent(marker)
+        self.update(oldExtent)
+
+    def setTagLabel(self, tag_id, label):
+        """设置标签文字"""
+        marker = self.tag(tag_id)
+        marker.label = label
+        self.update(marker.extent)
+
+    def setTagLabelVisible(self, tag_id, visible):
+        """设置标签文字是否显示"""
+        marker = self.tag(tag_id)
+        marker.showLabel = visible
+        self._updateExtent(marker)
+        self.update()
+
+    def setTagR95Visible(self, tag_id, visible):
+        """设置R95圆是否显示"""
+        marker = self.tag(tag_id)
+        marker.r95Show = visible
+        self._updateExtent(marker)
+        self.update()
+
+    def setTagRangesVisible(self, tag_id, visible):
+        """设置定位圆是否显示"""
+        marker = self.tag(tag_id)
+        marker.rangesShow = visible
+        self._rangeCircles.invalidate()
+        self._updateExtent(marker)
+        self.update()
+
+    def setTagColour(self, tag_id, colour):
+        """设置标签颜色"""
+        self.tag(tag_id).colour = QColor(colour)
+        self.update()
+
+    def setAnchorPosition(self, anc_idx, x, y):
+        """设置基站表格第anc_idx行基站的位置（用于绘制定位圆）"""
+        self._anchors[anc_idx] = QPointF(x, y)
+        self._rangeCircles.invalidate()
+        for marker in self._tags.values():
+            self._updateExtent(marker)
+        self.update()
+
+    # ========== 显示设置 ==========
+
+    def labelManager(self):
+        """获取文字管理器"""
+        return self._labelManager
+
+    def rangeCircles(self):
+        """获取定位圆绘制器"""
+        return self._rangeCircles
+
+    def setSelectedTags(self, tag_ids):
+        """设置选中的标签，默认只为选中的标签绘制定位圆"""
+        self._rangeCircles.setSelectedTags(tag_ids)
+        self._refreshExtents()
+
+    def setShowAllRangeCircles(self, show):
+        """设置是否绘制所有标签的定位圆"""
+        self._rangeCircles.setShowAll(show)
+        self._refreshExtents()
+
+    def setVisibleRect(self, rect):
+        """设置视图可见矩形，用于裁剪文字和定位圆"""
+        self._labelManager.setVisibleRect(rect)
+        self._rangeCircles.setCullRect(self._labelManager.visibleRect())
+
+    def _refreshExtents(self):
+        """重新计算所有标签的包围矩形并重绘"""
+        for marker in self._tags.values():
+            self._updateExtent(marker)
+        self.update()
+
+    def setTagSize(self, size):
+        """设置标签大小"""
+        self._tagSize = size
+        for marker in self._tags.values():
+            self._updateExtent(marker)
+        self.update()
+
+    def setHistoryLength(self, length):
+        """设置历史轨迹长度"""
+        self._historyLength = max(0, int(length))
+        for marker in self._tags.values():
+            marker.history = deque(marker.history, maxlen=self._historyLength)
+        self.update()
+
+    def setShowHistory(self, show):
+        """设置是否显示历史轨迹"""
+        self._showHistory = show
+        if not show:
+            for marker in self._tags.values():
+                marker.history.clear()
+        self.update()
+
+    def setPixelsPerMeter(self, pixelsPerMeter):
+        """根据当前缩放更新文字边距，使包围矩形能够覆盖屏幕坐标下的文字"""
+        if pixelsPerMeter <= 0:
+            return
+        margin = 80.0 / pixelsPerMeter
+        if abs(margin - self._labelMargin) > 0.1 * self._labelMargin:
+            self._labelMargin = margin
+            for marker in self._tags.values():
+                self._updateExtent(marker)
+
+    # ========== 包围矩形 ==========
+
+    def _updateExtent(self, marker):
+        """计算单个标签的包围矩形，并按需扩大图层的包围矩形"""
+        if not marker.valid:
+            marker.extent = QRectF()
+            return
+
+        radius = self._tagSize / 2
+        extent = QRectF(marker.p.x() - radius, marker.p.y() - radius, 2 * radius, 2 * radius)
+
+        for point in marker.history:
+            extent = extent.united(QRectF(point.x() - radius, point.y() - radius, 2 * radius, 2 * radius))
+
+        if marker.r95Show and marker.r95 > 0:
+            r = marker.r95
+            extent = extent.united(QRectF(marker.avgp.x() - r, marker.avgp.y() - r, 2 * r, 2 * r))
+
+        if self._rangeCircles.isTagShown(marker):
+            for anc_idx, r in marker.ranges.items():
+                anchor = self._anchors.get(anc_idx)
+                if anchor is not None and r > 0:
+                    extent = extent.united(QRectF(anchor.x() - r, anchor.y() - r, 2 * r, 2 * r))
+
+        if marker.showLabel:
+            m = self._labelMargin
+            extent = extent.adjusted(-m, -m, m, m)
+
+        marker.extent = extent
+
+        if not self._bounds.contains(extent):
+            self.prepareGeometryChange()
+            self._bounds = self._bounds.united(extent) if not self._bounds.isNull() else QRectF(extent)
+
+    def _recomputeBounds(self):
+        """重新计算图层包围矩形（标签被移除时调用）"""
+        self.prepareGeometryChange()
+        bounds = QRectF()
+        for marker in self._tags.values():
+            if not marker.extent.isNull():
+                bounds = bounds.united(marker.extent) if not bounds.isNull() else QRectF(marker.extent)
+        self._bounds = bounds
+
+    def boundingRect(self):
+        """包围矩形"""
+        return self._bounds
+
+    # ========== 绘制 ==========
+
+    def paint(self, painter, option, widget=None):
+        """一次绘制所有标签"""
+        exposed = option.exposedRect
+        radius = self._tagSize / 2
+        labels = []
+
+        painter.setRenderHint(QPainter.Antialiasing, True)
+
+        # 定位圆合并为一条路径绘制
+        self._rangeCircles.paint(painter, self._tags.values(), self._anchors)
+
+        for marker in self._tags.values():
+            if not marker.valid or not exposed.intersects(marker.extent):
+                continue
+
+            # R95圆
+            if marker.r95Show and marker.r95 > 0:
+                painter.setPen(QPen(QBrush(marker.colour), 0))
+                painter.setBrush(Qt.NoBrush)
+                painter.drawEllipse(marker.avgp, marker.r95, marker.r95)
+
+            # 历史轨迹
+            if self._showHistory and marker.history:
+                trail = QColor(marker.colour)
+                trail.setAlphaF(0.4)
+                painter.setPen(QPen(QBrush(trail), radius, Qt.SolidLine, Qt.RoundCap))
+                painter.drawPoints(QPolygonF(list(marker.history)))
+
+            # 当前位置
+            painter.setPen(QPen(QBrush(marker.colour.darker()), 0))
+            painter.setBrush(QBrush(marker.colour))
+            painter.drawEllipse(marker.p, radius, radius)
+
+            if marker.showLabel and marker.label:
+                labels.append(marker)
+
+        # 文字标签在屏幕坐标下绘制，不随缩放变形
+        if labels:
+            self._labelManager.paint(painter, labels)
+
+    # ========== 点击测试 ==========
+
+    def tagAt(self, scenePos):
+        """返回scenePos处的标签ID，没有则返回None"""
+        hitRadius = max(self._tagSize / 2, 0.05)
+        best = None
+        bestDist = hitRadius * hitRadius
+        for marker in self._tags.values():
+            if not marker.valid:
+                continue
+            dx = marker.p.x() - scenePos.x()
+            dy = marker.p.y() - scenePos.y()
+            dist = dx * dx + dy * dy
+            if dist <= bestDist:
+                best = marker.id
+                bestDist = dist
+        return best
+
+    def mousePressEvent(self, event):
+        """鼠标按下事件，只有点中标签时才接受，否则交给视图处理平移"""
+        tag_id = self.tagAt(event.pos())
+        if tag_id is None:
+            event.ignore()
+            return
+        event.accept()
+        self.tagClicked.emit(tag_id)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TimelineWidget - 轨迹回放时间轴
+播放/暂停、拖动时间轴、回放速度、循环和返回实时显示，控制TrajectoryPlayer
+"""
+
+import time
+
+from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QToolButton, QSlider, QLabel,
+                             QComboBox, QCheckBox, QPushButton, QStyle)
+from PyQt5.QtCore import Qt, QTimer
+
+from trajectory_player import SPEEDS
+
+SLIDER_STEPS = 10000  # 时间轴滑块的刻度数
+
+
+def formatTime(t, start):
+    """显示为 时:分:秒 (+相对开始的分:秒)"""
+    clock = time.strftime("%H:%M:%S", time.localtime(t))
+    offset = max(t - start, 0.0)
+    return f"{clock} (+{int(offset // 60):02d}:{offset % 60:04.1f})"
+
+
+class TimelineWidget(QWidget):
+    """轨迹回放时间轴控件"""
+
+    def __init__(self, player, parent=None):
+        super().__init__(parent)
+        self._player = player
+        self._dragging = False
+        self._resume = False  # 拖动结束后是否继续播放
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(4, 2, 4, 2)
+
+        self.playButton = QToolButton()
+        self.playButton.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
+        self.playButton.setToolTip("播放/暂停")
+        layout.addWidget(self.playButton)
+
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, SLIDER_STEPS)
+        self.slider.setEnabled(False)
+        layout.addWidget(self.slider, 1)
+
+        self.timeLabel = QLabel("无轨迹数据")
+        self.timeLabel.setMinimumWidth(150)
+        layout.addWidget(self.timeLabel)
+
+        self.speedCombo = QComboBox()
+        for speed in SPEEDS:
+            self.speedCombo.addItem(f"{speed:g}x", speed)
+        self.speedCombo.setCurrentIndex(SPEEDS.index(1.0))
+        self.speedCombo.setToolTip("回放速度")
+        layout.addWidget(self.speedCombo)
+
+        self.loopCheck = QCheckBox("循环")
+        layout.addWidget(self.loopCheck)
+
+        self.liveButton = QPushButton("实时")
+        self.liveButton.setToolTip("停止回放，返回实时显示")
+        self.liveButton.setEnabled(False)
+        layout.addWidget(self.liveButton)
+
+        # 时间范围随实时数据增长，定时刷新
+        self._rangeTimer = QTimer(self)
+        self._rangeTimer.setInterval(1000)
+        self._rangeTimer.timeout.connect(player.refreshRange)
+        self._rangeTimer.start()
+
+        self.playButton.clicked.connect(self._on_play_clicked)
+        self.slider.sliderPressed.connect(self._on_slider_pressed)
+        self.slider.sliderReleased.connect(self._on_slider_released)
+        self.slider.valueChanged.connect(self._on_slider_value_changed)
+        self.speedCombo.currentIndexChanged.connect(self._on_speed_changed)
+        self.loopCheck.toggled.connect(player.setLoop)
+        self.liveButton.clicked.connect(player.stop)
+
+        player.positionChanged.connect(self._on_position_changed)
+        player.rangeChanged.connect(self._on_range_changed)
+        player.playingChanged.connect(self._on_playing_changed)
+        player.activeChanged.connect(self.liveButton.setEnabled)
+
+    # ========== 时间轴与时刻换算 ==========
+
+    def _sliderToTime(self, value):
+        tMin, tMax = self._player.timeRange()
+        return tMin + (tMax - tMin) * value / SLIDER_STEPS
+
+    def _timeToSlider(self, t):
+        tMin, tMax = self._player.timeRange()
+        if tMax <= tMin:
+            return 0
+        return int(round((t - tMin) / (tMax - tMin) * SLIDER_STEPS))
+
+    # ========== 控件事件 ==========
+
+    def _on_play_clicked(self):
+        if self._player.isPlaying():
+            self._player.pause()
+        else:
+            self._player.play()
+
+    def _on_slider_pressed(self):
+        # 拖动期间暂停计时器推进，松开后恢复原状态
+        self._dragging = True
+        self._resume = self._player.isPlaying()
+        self._player.pause()
+
+    def _on_slider_released(self):
+        self._dragging = False
+        if self._resume:
+            self._player.play()
+
+    def _on_slider_value_changed(self, value):
+        # 只响应用户操作（拖动、点击、键盘），回放推进时信号被屏蔽
+        self._player.seek(self._sliderToTime(value))
+
+    def _on_speed_changed(self, index):
+        self._player.setSpeed(self.speedCombo.itemData(index))
+
+    # ========== 回放状态 ==========
+
+    def _on_position_changed(self, t):
+        self.timeLabel.setText(formatTime(t, self._player.timeRange()[0]))
+        if not self._dragging:
+            self.slider.blockSignals(True)
+            self.slider.setValue(self._timeToSlider(t))
+            self.slider.blockSignals(False)
+
+    def _on_range_changed(self, tMin, tMax):
+        self.slider.setEnabled(True)
+        if not self._player.isActive():
+            self.timeLabel.setText(formatTime(tMax, tMin))
+            self.slider.blockSignals(True)
+            self.slider.setValue(SLIDER_STEPS)
+            self.slider.blockSignals(False)
+        else:
+            self._on_position_changed(self._player.position())
+
+    def _on_playing_changed(self, playing):
+        icon = QStyle.SP_MediaPause if playing else QStyle.SP_MediaPlay
+        self.playButton.setIcon(self.style().standardIcon(icon))
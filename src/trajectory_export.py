@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TrajectoryExport - 轨迹导出
+按块从TrajectoryStore读取轨迹，逐块写出为CSV、NDJSON或Parquet（需要pyarrow），
+在后台线程中运行并报告进度，内存占用只与块大小有关
+"""
+
+import math
+import os
+import threading
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+EXPORT_CSV = "csv"
+EXPORT_NDJSON = "ndjson"
+EXPORT_PARQUET = "parquet"
+
+FIELDS = ("t", "tag", "x", "y", "z", "quality")  # 导出的列，tag为标签ID
+
+
+def exportFormats():
+    """当前环境可用的导出格式"""
+    formats = [EXPORT_CSV, EXPORT_NDJSON]
+    if HAS_PYARROW:
+        formats.append(EXPORT_PARQUET)
+    return formats
+
+
+def formatForPath(path):
+    """按扩展名判断导出格式，无法判断时为CSV"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".ndjson", ".jsonl"):
+        return EXPORT_NDJSON
+    if ext in (".parquet", ".pq"):
+        return EXPORT_PARQUET
+    return EXPORT_CSV
+
+
+def _numberText(values, fmt, missing):
+    """数值格式化为字符串，NaN写为missing"""
+    return [fmt % v if not math.isnan(v) else missing for v in values.tolist()]
+
+
+class CsvWriter:
+    """CSV输出，质量未知时留空"""
+
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._file.write(",".join(FIELDS) + "\n")
+
+    def write(self, rows):
+        quality = _numberText(rows["quality"], "%.3f", "")
+        lines = ["%.3f,%d,%.3f,%.3f,%.3f,%s" % r
+                 for r in zip(rows["t"].tolist(), rows["tag"].tolist(), rows["x"].tolist(),
+                              rows["y"].tolist(), rows["z"].tolist(), quality)]
+        self._file.write("\n".join(lines) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class NdjsonWriter:
+    """每行一个JSON对象，质量未知时为null"""
+
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+
+    def write(self, rows):
+        quality = _numberText(rows["quality"], "%.3f", "null")
+        lines = ['{"t":%.3f,"tag":%d,"x":%.3f,"y":%.3f,"z":%.3f,"quality":%s}' % r
+                 for r in zip(rows["t"].tolist(), rows["tag"].tolist(), rows["x"].tolist(),
+                              rows["y"].tolist(), rows["z"].tolist(), quality)]
+        self._file.write("\n".join(lines) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Parquet输出，每块写为一个行组"""
+
+    def __init__(self, path):
+        self._schema = pa.schema([("t", pa.float64()), ("tag", pa.int64()), ("x", pa.float32()),
+                                  ("y", pa.float32()), ("z", pa.float32()), ("quality", pa.float32())])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        self._writer.write_table(pa.Table.from_pydict({name: rows[name] for name in FIELDS}, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {EXPORT_CSV: CsvWriter, EXPORT_NDJSON: NdjsonWriter, EXPORT_PARQUET: ParquetWriter}
+
+
+def chunkRows(store, chunk, t0, t1, tagIds=None):
+    """块中 [t0, t1] 内（可选只取指定标签）的行，按时间排序，返回列字典"""
+    columns = store.readChunk(chunk)
+    t = columns["t"]
+    slot = columns["slot"]
+    tagTable = np.array(store.tagIds(), dtype=np.int64)
+    mask = (t >= t0) & (t <= t1)
+    if tagIds is not None:
+        mask &= np.isin(tagTable[slot], list(tagIds))
+    rows = np.flatnonzero(mask)
+    rows = rows[np.argsort(t[rows], kind="stable")]
+    return {"t": t[rows], "tag": tagTable[slot[rows]], "x": columns["x"][rows],
+            "y": columns["y"][rows], "z": columns["z"][rows], "quality": columns["quality"][rows]}
+
+
+def exportTrajectory(store, path, fmt=None, t0=-np.inf, t1=np.inf, tagIds=None,
+                     progress=None, cancelled=None):
+    """
+    逐块导出轨迹，先写到临时文件，完成后改名为path
+    progress(已处理行数, 总行数)；cancelled()返回True时中止
+    返回导出的行数，中止时返回None
+    """
+    fmt = fmt or formatForPath(path)
+    if fmt == EXPORT_PARQUET and not HAS_PYARROW:
+        raise RuntimeError("Parquet export requires pyarrow")
+    chunks = store.chunks(t0, t1)
+    total = sum(chunk.count for chunk in chunks)
+    done = 0
+    exported = 0
+    partial = path + ".part"
+    writer = WRITERS[fmt](partial)
+    complete = False
+    try:
+        for chunk in chunks:
+            if cancelled and cancelled():
+                break
+            rows = chunkRows(store, chunk, t0, t1, tagIds)
+            if len(rows["t"]):
+                writer.write(rows)
+                exported += len(rows["t"])
+            done += chunk.count
+            if progress:
+                progress(done, total)
+        else:
+            complete = True
+    finally:
+        writer.close()
+        if not complete:
+            os.remove(partial)
+    if not complete:
+        return None
+    os.replace(partial, path)
+    return exported
+
+
+class TrajectoryExporter(QObject):
+    """在后台线程中导出轨迹"""
+
+    # 信号定义（从导出线程发出，跨线程排队传递）
+    progress = pyqtSignal(int, int)  # 已处理行数, 总行数
+    finished = pyqtSignal(str, int)  # 文件路径, 导出行数
+    failed = pyqtSignal(str)  # 错误信息
+    cancelled = pyqtSignal()
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self._store = store
+        self._thread = None
+        self._cancel = threading.Event()
+
+    def isRunning(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, path, fmt=None, t0=-np.inf, t1=np.inf, tagIds=None):
+        """开始导出，已有导出在进行时返回False"""
+        if self.isRunning():
+            return False
+        self._cancel.clear()
+        self._thread = threading.Thread(target=self._run, args=(path, fmt, t0, t1, tagIds),
+                                        name="trajectory-export", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        """请求中止导出"""
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        """等待导出线程结束"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, path, fmt, t0, t1, tagIds):
+        try:
+            rows = exportTrajectory(self._store, path, fmt, t0, t1, tagIds,
+                                    progress=self.progress.emit, cancelled=self._cancel.is_set)
+        except Exception as e:
+            print(f"Error exporting trajectory: {e}")
+            self.failed.emit(str(e))
+            return
+        if rows is None:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(path, rows)
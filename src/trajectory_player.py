@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TrajectoryPlayer - 轨迹回放
+按固定帧间隔从TrajectoryStore取出各时刻的标签位置，支持暂停、拖动、变速和循环；
+跳转时按块的时间索引二分查找，后台线程提前计算后续帧
+"""
+
+import collections
+import threading
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+FRAME_INTERVAL = 0.04  # 回放帧间隔（秒）
+PREFETCH_DEPTH = 25  # 后台提前计算的帧数
+MAX_AGE = 1.0  # 标签超过该时间（秒）没有样本时不显示
+SPEEDS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+
+
+class PlaybackFrame:
+    """某一时刻的标签位置"""
+    def __init__(self, t, tagIds, x, y, z):
+        self.t = t
+        self.tagIds = tagIds  # 标签ID列表
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def __len__(self):
+        return len(self.tagIds)
+
+
+def buildFrame(store, t, maxAge=MAX_AGE):
+    """从存储中取出时刻t的帧"""
+    snap = store.snapshot(t, maxAge)
+    tagIds = [store.tagId(int(slot)) for slot in snap["slot"]]
+    return PlaybackFrame(t, tagIds, snap["x"].astype(float), snap["y"].astype(float), snap["z"].astype(float))
+
+
+class FramePrefetcher:
+    """后台线程按播放顺序提前计算帧，帧以帧序号为键，跳转后正在计算的帧作废"""
+
+    def __init__(self, store, maxAge=MAX_AGE, depth=PREFETCH_DEPTH):
+        self._store = store
+        self._maxAge = maxAge
+        self._depth = depth
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._origin = 0.0
+        self._step = FRAME_INTERVAL
+        self._frames = {}  # 帧序号 -> PlaybackFrame
+        self._wanted = collections.deque()  # 待计算的帧序号
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="trajectory-prefetch", daemon=True)
+        self._thread.start()
+
+    def reset(self, origin, step):
+        """跳转或变速后重新开始：第k帧的时刻为 origin + k*step"""
+        with self._cond:
+            self._generation += 1
+            self._origin = origin
+            self._step = step
+            self._frames.clear()
+            self._wanted.clear()
+
+    def advance(self, index):
+        """当前播放到第index帧，丢弃之前的帧并安排之后depth帧"""
+        with self._cond:
+            for k in [k for k in self._frames if k <= index]:
+                del self._frames[k]
+            last = self._wanted[-1] if self._wanted else max(self._frames, default=index)
+            while self._wanted and self._wanted[0] <= index:
+                self._wanted.popleft()
+            for k in range(max(last, index) + 1, index + self._depth + 1):
+                self._wanted.append(k)
+            self._cond.notify()
+
+    def take(self, index):
+        """取出已计算好的第index帧，没有时返回None"""
+        with self._cond:
+            return self._frames.pop(index, None)
+
+    def stop(self):
+        """停止线程"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join(1.0)
+
+    def _run(self):
+        """线程主循环"""
+        while True:
+            with self._cond:
+                while self._running and not self._wanted:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                index = self._wanted.popleft()
+                generation = self._generation
+                t = self._origin + index * self._step
+            try:
+                frame = buildFrame(self._store, t, self._maxAge)
+            except Exception as e:
+                print(f"Error prefetching trajectory frame: {e}")
+                continue
+            with self._cond:
+                # 计算期间发生跳转的帧作废
+                if generation == self._generation:
+                    self._frames[index] = frame
+
+
+class TrajectoryPlayer(QObject):
+    """轨迹回放控制"""
+
+    # 信号定义
+    frameReady = pyqtSignal(object)  # PlaybackFrame
+    positionChanged = pyqtSignal(float)  # 当前回放时刻
+    rangeChanged = pyqtSignal(float, float)  # 存储的时间范围
+    playingChanged = pyqtSignal(bool)
+    activeChanged = pyqtSignal(bool)  # 进入/退出回放模式
+    sought = pyqtSignal()  # 发生了跳转（不连续）
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self._store = store
+        self._prefetcher = FramePrefetcher(store)
+        self._speed = 1.0
+        self._loop = False
+        self._active = False
+        self._origin = 0.0  # 第0帧的时刻
+        self._index = 0  # 当前帧序号
+        self._range = (np.nan, np.nan)
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(FRAME_INTERVAL * 1000))
+        self._timer.timeout.connect(self._tick)
+
+    # ========== 状态 ==========
+
+    def isPlaying(self):
+        return self._timer.isActive()
+
+    def isActive(self):
+        return self._active
+
+    def position(self):
+        """当前回放时刻"""
+        return self._origin + self._index * self._step()
+
+    def speed(self):
+        return self._speed
+
+    def loop(self):
+        return self._loop
+
+    def timeRange(self):
+        return self._range
+
+    def _step(self):
+        return FRAME_INTERVAL * self._speed
+
+    def refreshRange(self):
+        """重新读取存储的时间范围，返回是否有数据"""
+        tMin, tMax = self._store.timeRange()
+        if (tMin, tMax) != self._range and np.isfinite(tMin):
+            self._range = (tMin, tMax)
+            self.rangeChanged.emit(tMin, tMax)
+        return bool(np.isfinite(tMin))
+
+    def _setActive(self, active):
+        if self._active != active:
+            self._active = active
+            self.activeChanged.emit(active)
+
+    # ========== 控制 ==========
+
+    def play(self):
+        """开始回放，已在末尾时从头开始"""
+        if not self.refreshRange():
+            return
+        if not self._active or self.position() >= self._range[1]:
+            self.seek(self._range[0])
+        self._timer.start()
+        self.playingChanged.emit(True)
+
+    def pause(self):
+        """暂停"""
+        if self._timer.isActive():
+            self._timer.stop()
+            self.playingChanged.emit(False)
+
+    def stop(self):
+        """停止回放，回到实时显示"""
+        self.pause()
+        self._prefetcher.reset(self.position(), self._step())
+        self._setActive(False)
+
+    def seek(self, t):
+        """跳转到时刻t并立即显示该帧"""
+        if not self.refreshRange() or not np.isfinite(t):
+            return
+        t = min(max(t, self._range[0]), self._range[1])
+        self._setActive(True)
+        self._origin = t
+        self._index = 0
+        self._prefetcher.reset(t, self._step())
+        self._prefetcher.advance(0)
+        self.sought.emit()
+        self._show(buildFrame(self._store, t))
+
+    def setSpeed(self, speed):
+        """设置回放速度（倍数），从当前时刻按新的帧步长继续"""
+        if speed <= 0 or speed == self._speed:
+            return
+        t = self.position()
+        self._speed = speed
+        self._origin = t
+        self._index = 0
+        self._prefetcher.reset(t, self._step())
+        self._prefetcher.advance(0)
+
+    def setLoop(self, loop):
+        """设置到达末尾时是否从头循环"""
+        self._loop = loop
+
+    def close(self):
+        """停止后台线程"""
+        self._timer.stop()
+        self._prefetcher.stop()
+
+    # ========== 播放 ==========
+
+    def _tick(self):
+        """推进一帧"""
+        index = self._index + 1
+        t = self._origin + index * self._step()
+        if t > self._range[1]:
+            # 实时数据可能延长了时间范围
+            self.refreshRange()
+        if t > self._range[1]:
+            if self._loop:
+                self.seek(self._range[0])
+            else:
+                self.pause()
+            return
+        self._index = index
+        frame = self._prefetcher.take(index)
+        if frame is None:
+            frame = buildFrame(self._store, t)
+        self._prefetcher.advance(index)
+        self._show(frame)
+
+    def _show(self, frame):
+        self.frameReady.emit(frame)
+        self.positionChanged.emit(frame.t)
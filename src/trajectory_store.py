@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TrajectoryStore - 列式轨迹存储
+按 (时间, 标签槽位, x, y, z, 质量) 追加到分块的NumPy列数组中，
+写满的块按 (槽位, 时间) 排序后落盘为.npy文件并以内存映射方式重新打开，
+每块记录时间范围、坐标范围和包含的标签，用于按时间段和区域查询
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+CHUNK_SIZE = 65536  # 每块的行数
+COLUMNS = (("t", np.float64), ("slot", np.int32), ("x", np.float32),
+           ("y", np.float32), ("z", np.float32), ("quality", np.float32))
+INDEX_FILE = "index.json"
+CHUNK_FILE = re.compile(r"chunk_(\d+)_")  # 块文件名 chunk_{序号}_{列名}.npy
+
+
+def _nextChunkNumber(directory):
+    """目录中已有块文件的最大序号加一，新块不覆盖之前的文件"""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    numbers = [int(m.group(1)) for m in map(CHUNK_FILE.match, names) if m]
+    return max(numbers, default=-1) + 1
+
+
+class TrajectoryChunk:
+    """一块轨迹数据及其索引"""
+
+    def __init__(self, columns, count, sortedBySlot=False, index=None):
+        self.columns = columns  # 列名 -> 数组（内存或内存映射）
+        self.count = count
+        self.sortedBySlot = sortedBySlot
+        self.fileStem = None  # 落盘后的文件名前缀
+        if index is None:
+            self._updateIndex()
+        else:
+            self._loadIndex(index)
+
+    def indexDict(self):
+        """可写入JSON的块索引，槽位分段另存为{stem}_slots.npy，打开存储时不必扫描数据"""
+        return {"stem": self.fileStem, "count": self.count, "tMin": self.tMin, "tMax": self.tMax,
+                "bbox": self.bbox.tolist()}
+
+    def slotTable(self):
+        """槽位分段表：第一行为槽位（末尾补-1），第二行为起始行"""
+        return np.vstack([np.append(self.slots, -1), self.slotStart]).astype(np.int64)
+
+    def _loadIndex(self, index):
+        self.tMin = float(index["tMin"])
+        self.tMax = float(index["tMax"])
+        self.bbox = np.array(index["bbox"], dtype=float)
+        table = index["slotTable"]
+        self.slots = table[0, :-1].astype(np.int32)
+        self.slotStart = table[1].copy()
+
+    def _updateIndex(self):
+        """计算时间范围、坐标范围和槽位分段"""
+        n = self.count
+        if n == 0:
+            self.tMin = self.tMax = np.nan
+            self.bbox = np.array([np.nan] * 4)
+            self.slots = np.empty(0, dtype=np.int32)
+            self.slotStart = np.zeros(1, dtype=np.int64)
+            return
+        t = self.columns["t"][:n]
+        x = self.columns["x"][:n]
+        y = self.columns["y"][:n]
+        self.tMin = float(t.min())
+        self.tMax = float(t.max())
+        self.bbox = np.array([np.nanmin(x), np.nanmin(y), np.nanmax(x), np.nanmax(y)], dtype=float)
+        if self.sortedBySlot:
+            # 按槽位排序后每个槽位是连续一段，slotStart[i]:slotStart[i+1]为slots[i]的行
+            slot = self.columns["slot"][:n]
+            self.slots, starts = np.unique(slot, return_index=True)
+            self.slotStart = np.append(starts, n).astype(np.int64)
+        else:
+            self.slots = np.unique(self.columns["slot"][:n])
+            self.slotStart = None
+
+    def column(self, name):
+        """列的有效部分"""
+        return self.columns[name][:self.count]
+
+    def slotRows(self, slot, t0, t1):
+        """标签在 [t0, t1] 内的行，返回索引（切片或数组）"""
+        if self.sortedBySlot:
+            i = np.searchsorted(self.slots, slot)
+            if i >= len(self.slots) or self.slots[i] != slot:
+                return slice(0, 0)
+            start, end = self.slotStart[i], self.slotStart[i + 1]
+            t = self.columns["t"][start:end]
+            return slice(start + np.searchsorted(t, t0, "left"), start + np.searchsorted(t, t1, "right"))
+        t = self.column("t")
+        return np.flatnonzero((self.column("slot") == slot) & (t >= t0) & (t <= t1))
+
+    def latestRows(self, t0, t1):
+        """每个标签在 [t0, t1] 内最后一个样本的行号"""
+        t = self.column("t")
+        if self.sortedBySlot:
+            starts = self.slotStart[:-1]
+            ends = self.slotStart[1:]
+            rows = []
+            for start, end in zip(starts, ends):
+                k = start + np.searchsorted(t[start:end], t1, "right") - 1
+                if k >= start and t[k] >= t0:
+                    rows.append(k)
+            return np.array(rows, dtype=np.int64)
+        inside = np.flatnonzero((t >= t0) & (t <= t1))
+        if not len(inside):
+            return inside
+        order = inside[np.lexsort((t[inside], self.column("slot")[inside]))]
+        slot = self.column("slot")[order]
+        last = np.append(slot[1:] != slot[:-1], True)
+        return order[last]
+
+
+class TrajectoryStore:
+    """分块列式轨迹存储，写满的块落盘为内存映射的.npy文件"""
+
+    def __init__(self, directory=None, chunkSize=CHUNK_SIZE):
+        self._ownsDirectory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="uwb_trajectory_")
+        os.makedirs(self.directory, exist_ok=True)
+        self.chunkSize = chunkSize
+        self._lock = threading.RLock()
+        self._tagIds = []  # 槽位 -> 标签ID
+        self._slots = {}  # 标签ID -> 槽位
+        self._chunks = []  # 已落盘的块，按创建顺序
+        self._nextChunk = _nextChunkNumber(self.directory)  # 下一个块文件的序号
+        self._tMaxRunning = np.empty(0)  # 块tMax的前缀最大值，用于二分查找下界
+        self._tMinSuffix = np.empty(0)  # 块tMin的后缀最小值，用于二分查找上界
+        self._active = self._newColumns()
+        self._count = 0
+        self.total = 0  # 总行数
+
+    @classmethod
+    def exists(cls, directory):
+        """目录中是否有已落盘的存储"""
+        return bool(directory) and os.path.isfile(os.path.join(directory, INDEX_FILE))
+
+    @classmethod
+    def open(cls, directory):
+        """打开已落盘的存储（只读取索引，数据按需内存映射），之后追加的块接在原有数据之后"""
+        store = cls(directory)
+        store._ownsDirectory = False
+        path = os.path.join(directory, INDEX_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error opening trajectory store {directory}: {e}")
+            return store
+        store.chunkSize = index.get("chunkSize", CHUNK_SIZE)
+        store._tagIds = list(index.get("tags", []))
+        store._slots = {tagId: slot for slot, tagId in enumerate(store._tagIds)}
+        for entry in index.get("chunks", []):
+            stem = entry["stem"]
+            try:
+                columns = {name: np.load(os.path.join(directory, f"{stem}_{name}.npy"), mmap_mode="r")
+                           for name, _ in COLUMNS}
+                entry["slotTable"] = np.load(os.path.join(directory, f"{stem}_slots.npy"))
+            except (OSError, ValueError) as e:
+                print(f"Error opening trajectory chunk {stem}: {e}")
+                continue
+            chunk = TrajectoryChunk(columns, entry["count"], sortedBySlot=True, index=entry)
+            chunk.fileStem = stem
+            store._addChunk(chunk)
+            store.total += chunk.count
+        return store
+
+    def _newColumns(self):
+        return {name: np.empty(self.chunkSize, dtype=dtype) for name, dtype in COLUMNS}
+
+    # ========== 写入 ==========
+
+    def tagSlot(self, tagId):
+        """标签ID对应的槽位，不存在时分配"""
+        tagId = int(tagId)  # NumPy整数无法写入索引JSON
+        slot = self._slots.get(tagId)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.get(tagId)
+                if slot is None:
+                    slot = len(self._tagIds)
+                    self._tagIds.append(tagId)
+                    self._slots[tagId] = slot
+        return slot
+
+    def tagIds(self):
+        """槽位 -> 标签ID"""
+        return list(self._tagIds)
+
+    def tagId(self, slot):
+        """槽位对应的标签ID"""
+        return self._tagIds[slot]
+
+    def append(self, t, tagId, x, y, z, quality=np.nan):
+        """追加一个位置"""
+        slot = self.tagSlot(tagId)
+        with self._lock:
+            i = self._count
+            active = self._active
+            active["t"][i] = t
+            active["slot"][i] = slot
+            active["x"][i] = x
+            active["y"][i] = y
+            active["z"][i] = z
+            active["quality"][i] = quality
+            self._count = i + 1
+            self.total += 1
+            if self._count == self.chunkSize:
+                self._closeActive()
+
+    def appendBatch(self, t, tagIds, xyz, quality=None):
+        """批量追加：t (M,)、tagIds (M,)、xyz (M, 3)、quality (M,)"""
+        t = np.asarray(t, dtype=float)
+        slots = np.array([self.tagSlot(tagId) for tagId in tagIds], dtype=np.int32)
+        xyz = np.asarray(xyz, dtype=float).reshape(-1, 3)
+        quality = np.full(len(t), np.nan) if quality is None else np.asarray(quality, dtype=float)
+        start = 0
+        with self._lock:
+            while start < len(t):
+                n = min(len(t) - start, self.chunkSize - self._count)
+                i = self._count
+                active = self._active
+                active["t"][i:i + n] = t[start:start + n]
+                active["slot"][i:i + n] = slots[start:start + n]
+                active["x"][i:i + n] = xyz[start:start + n, 0]
+                active["y"][i:i + n] = xyz[start:start + n, 1]
+                active["z"][i:i + n] = xyz[start:start + n, 2]
+                active["quality"][i:i + n] = quality[start:start + n]
+                self._count += n
+                self.total += n
+                start += n
+                if self._count == self.chunkSize:
+                    self._closeActive()
+
+    def flush(self):
+        """把当前未写满的块也落盘"""
+        with self._lock:
+            if self._count:
+                self._closeActive()
+
+    def _closeActive(self):
+        """按 (槽位, 时间) 排序当前块并落盘（调用时需持有锁）"""
+        n = self._count
+        active = self._active
+        order = np.lexsort((active["t"][:n], active["slot"][:n]))
+        # 索引在内存中的排序结果上计算，落盘后不再读取映射的页面
+        chunk = TrajectoryChunk({name: active[name][:n][order] for name, _ in COLUMNS}, n, sortedBySlot=True)
+        stem = f"chunk_{self._nextChunk:06d}"
+        self._nextChunk += 1
+        try:
+            columns = {}
+            for name, _ in COLUMNS:
+                path = os.path.join(self.directory, f"{stem}_{name}.npy")
+                np.save(path, chunk.columns[name])
+                columns[name] = np.load(path, mmap_mode="r")
+            np.save(os.path.join(self.directory, f"{stem}_slots.npy"), chunk.slotTable())
+            chunk.columns = columns
+            chunk.fileStem = stem
+        except OSError as e:
+            # 磁盘不可用时保留在内存中
+            print(f"Error spilling trajectory chunk {stem}: {e}")
+        self._addChunk(chunk)
+        self._active = self._newColumns()
+        self._count = 0
+        self._writeIndex()
+
+    def _addChunk(self, chunk):
+        self._chunks.append(chunk)
+        prev = self._tMaxRunning[-1] if len(self._tMaxRunning) else -np.inf
+        self._tMaxRunning = np.append(self._tMaxRunning, max(prev, chunk.tMax))
+        # 块按时间顺序追加，通常只追加一项；乱序时把之前大于tMin的后缀最小值改小
+        tMin = np.inf if np.isnan(chunk.tMin) else chunk.tMin
+        first = int(np.searchsorted(self._tMinSuffix, tMin, "right"))
+        self._tMinSuffix = np.append(self._tMinSuffix, tMin)
+        self._tMinSuffix[first:] = tMin
+
+    def _writeIndex(self):
+        """写出块列表和标签表，供TrajectoryStore.open使用"""
+        index = {"chunkSize": self.chunkSize, "tags": self._tagIds,
+                 "chunks": [c.indexDict() for c in self._chunks if c.fileStem]}
+        path = os.path.join(self.directory, INDEX_FILE)
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(path + ".tmp", path)
+        except (OSError, TypeError) as e:
+            print(f"Error writing trajectory index: {e}")
+
+    # ========== 查询 ==========
+
+    def timeRange(self):
+        """返回 (最早时间, 最晚时间)，没有数据时为 (nan, nan)"""
+        with self._lock:
+            chunks = self._chunksSnapshot()
+        t0 = [c.tMin for c in chunks if c.count]
+        t1 = [c.tMax for c in chunks if c.count]
+        if not t0:
+            return np.nan, np.nan
+        return float(min(t0)), float(max(t1))
+
+    def _chunksSnapshot(self, t0=-np.inf, t1=np.inf):
+        """与 [t0, t1] 相交的块，当前块只复制时间段内的行（调用时需持有锁）"""
+        lo = int(np.searchsorted(self._tMaxRunning, t0, "left"))
+        hi = int(np.searchsorted(self._tMinSuffix, t1, "right"))
+        chunks = [c for c in self._chunks[lo:hi] if c.tMin <= t1 and c.tMax >= t0]
+        if self._count:
+            t = self._active["t"][:self._count]
+            rows = np.flatnonzero((t >= t0) & (t <= t1))
+            if len(rows):
+                chunks.append(TrajectoryChunk({name: self._active[name][rows] for name, _ in COLUMNS}, len(rows)))
+        return chunks
+
+    def chunks(self, t0=-np.inf, t1=np.inf):
+        """与 [t0, t1] 相交的块（当前块为副本），用于逐块遍历"""
+        with self._lock:
+            return self._chunksSnapshot(t0, t1)
+
+    def readChunk(self, chunk):
+        """
+        把块的有效部分读入内存（已落盘的块直接读文件，不经过内存映射），
+        逐块遍历全部数据时常驻内存不随已读的块增长
+        """
+        if chunk.fileStem is None:
+            return {name: chunk.column(name) for name, _ in COLUMNS}
+        return {name: np.load(os.path.join(self.directory, f"{chunk.fileStem}_{name}.npy"))
+                for name, _ in COLUMNS}
+
+    def tagTrajectory(self, tagId, t0, t1):
+        """标签在 [t0, t1] 内的全部位置，返回按时间排序的列字典"""
+        slot = self._slots.get(tagId)
+        parts = {name: [] for name, _ in COLUMNS}
+        if slot is not None:
+            for chunk in self.chunks(t0, t1):
+                if not np.isin(slot, chunk.slots):
+                    continue
+                rows = chunk.slotRows(slot, t0, t1)
+                for name, _ in COLUMNS:
+                    parts[name].append(np.asarray(chunk.columns[name][rows]))
+        result = {name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+                  for name, dtype in COLUMNS}
+        order = np.argsort(result["t"], kind="stable")
+        return {name: values[order] for name, values in result.items()}
+
+    def snapshot(self, t, maxAge=1.0):
+        """
+        时刻t各标签的位置：每个标签在 [t-maxAge, t] 内的最后一个样本
+        返回列字典，每个标签一行
+        """
+        t0 = t - maxAge
+        parts = {name: [] for name, _ in COLUMNS}
+        for chunk in self.chunks(t0, t):
+            rows = chunk.latestRows(t0, t)
+            for name, _ in COLUMNS:
+                parts[name].append(np.asarray(chunk.columns[name][rows]))
+        result = {name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+                  for name, dtype in COLUMNS}
+        if not len(result["t"]):
+            return result
+        # 同一标签可能出现在多个块中，保留时间最晚的一行
+        order = np.lexsort((result["t"], result["slot"]))
+        slot = result["slot"][order]
+        last = order[np.append(slot[1:] != slot[:-1], True)]
+        return {name: values[last] for name, values in result.items()}
+
+    def tagsInRect(self, rect, t, maxAge=1.0):
+        """
+        时刻t位于矩形内的标签，rect为 (xmin, ymin, xmax, ymax)
+        先用块的坐标范围排除不相交的块
+        """
+        xmin, ymin, xmax, ymax = rect
+        t0 = t - maxAge
+        with self._lock:
+            chunks = self._chunksSnapshot(t0, t)
+        if not any(c.bbox[0] <= xmax and c.bbox[2] >= xmin and c.bbox[1] <= ymax and c.bbox[3] >= ymin
+                   for c in chunks):
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+        snap = self.snapshot(t, maxAge)
+        inside = ((snap["x"] >= xmin) & (snap["x"] <= xmax) & (snap["y"] >= ymin) & (snap["y"] <= ymax))
+        return {name: values[inside] for name, values in snap.items()}
+
+    # ========== 清理 ==========
+
+    def clear(self):
+        """删除全部数据"""
+        with self._lock:
+            for chunk in self._chunks:
+                chunk.columns = None
+                if chunk.fileStem:
+                    for name in [name for name, _ in COLUMNS] + ["slots"]:
+                        try:
+                            os.remove(os.path.join(self.directory, f"{chunk.fileStem}_{name}.npy"))
+                        except OSError:
+                            pass
+            self._chunks = []
+            self._tMaxRunning = np.empty(0)
+            self._tMinSuffix = np.empty(0)
+            self._count = 0
+            self.total = 0
+            self._writeIndex()
+
+    def close(self):
+        """关闭存储：指定目录的存储先落盘当前块，临时目录随之删除"""
+        with self._lock:
+            if not self._ownsDirectory:
+                self.flush()
+            for chunk in self._chunks:
+                chunk.columns = None
+            self._chunks = []
+            if self._ownsDirectory:
+                shutil.rmtree(self.directory, ignore_errors=True)
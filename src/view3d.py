@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+View3D - 3D标签/基站视图
+Scene3D保存标签和基站各一块持久的坐标缓冲区，位置更新只改写对应槽位并记录脏槽位，
+坐标轴范围增量维护；Graph3D用QtDataVisualization的散点图显示，
+按帧只把脏槽位写入数据代理，不重建序列；没有OpenGL时用SoftwareGraph3D软件渲染
+"""
+
+import math
+import os
+
+import numpy as np
+from PyQt5.QtCore import QObject, QPointF, QRectF, Qt, QTimer
+from PyQt5.QtGui import (QBrush, QColor, QGuiApplication, QImage, QOpenGLContext, QPainter, QPen,
+                         QPixmap, QPolygonF, QVector3D)
+from PyQt5.QtWidgets import QWidget
+
+try:
+    from PyQt5.QtDataVisualization import (Q3DCamera, Q3DScatter, Q3DTheme, QAbstract3DGraph, QAbstract3DSeries,
+                                           QScatter3DSeries, QScatterDataItem, QScatterDataProxy)
+    HAS_DATAVIS = True
+except ImportError:
+    HAS_DATAVIS = False
+
+# 3D视图的实现方式：datavis使用QtDataVisualization（需要OpenGL），software用QPainter软件渲染
+VIEW3D_AUTO = "auto"
+VIEW3D_DATAVIS = "datavis"
+VIEW3D_SOFTWARE = "software"
+VIEW3D_BACKEND = os.environ.get("UWB_VIEW3D", VIEW3D_AUTO)
+
+AXIS_MARGIN = 0.5  # 坐标轴两端留白（米）
+HIDDEN_POS = 1.0e6  # 隐藏的点放到坐标轴范围之外
+
+
+class PointBuffer:
+    """持久的点坐标缓冲区，键（标签ID/基站行号）到槽位的映射只增不减"""
+
+    def __init__(self, capacity=64):
+        self.positions = np.full((capacity, 3), np.nan)
+        self.visible = np.zeros(capacity, dtype=bool)
+        self.keys = [None] * capacity
+        self._slots = {}  # 键 -> 槽位
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def capacity(self):
+        """缓冲区容量"""
+        return len(self.positions)
+
+    def slot(self, key):
+        """获取键对应的槽位，不存在时分配，容量不足时成倍扩容"""
+        index = self._slots.get(key)
+        if index is None:
+            index = len(self._slots)
+            if index >= self.capacity():
+                grow = self.capacity()
+                self.positions = np.vstack([self.positions, np.full((grow, 3), np.nan)])
+                self.visible = np.concatenate([self.visible, np.zeros(grow, dtype=bool)])
+                self.keys.extend([None] * grow)
+            self._slots[key] = index
+            self.keys[index] = key
+        return index
+
+    def setPoint(self, key, x, y, z, visible=True):
+        """原地更新一个点，返回槽位"""
+        index = self.slot(key)
+        self.positions[index] = (x, y, z)
+        self.visible[index] = visible
+        self._dirty.add(index)
+        return index
+
+    def hide(self, key):
+        """隐藏一个点，槽位保留"""
+        index = self._slots.get(key)
+        if index is not None and self.visible[index]:
+            self.visible[index] = False
+            self._dirty.add(index)
+
+    def clear(self):
+        """隐藏所有点"""
+        used = len(self._slots)
+        self._dirty.update(np.flatnonzero(self.visible[:used]).tolist())
+        self.visible[:used] = False
+
+    def markAllDirty(self):
+        """所有已用槽位标记为需要重绘"""
+        self._dirty.update(range(len(self._slots)))
+
+    def takeDirty(self):
+        """取出并清空脏槽位"""
+        dirty = sorted(self._dirty)
+        self._dirty.clear()
+        return dirty
+
+    def visiblePositions(self):
+        """所有可见点的坐标"""
+        used = len(self._slots)
+        return self.positions[:used][self.visible[:used]]
+
+
+class AxisBounds:
+    """增量维护的坐标范围，与原实现一致总是包含原点"""
+
+    def __init__(self):
+        self.lo = np.zeros(3)
+        self.hi = np.full(3, -np.inf)
+
+    def reset(self):
+        """清空范围"""
+        self.lo[:] = 0.0
+        self.hi[:] = -np.inf
+
+    def include(self, x, y, z):
+        """把一个点并入范围，范围改变时返回True"""
+        changed = False
+        for i, v in enumerate((x, y, z)):
+            if v < self.lo[i]:
+                self.lo[i] = v
+                changed = True
+            if v > self.hi[i]:
+                self.hi[i] = v
+                changed = True
+        return changed
+
+    def includeArray(self, points):
+        """把一组点并入范围"""
+        if len(points):
+            self.lo = np.minimum(self.lo, points.min(axis=0))
+            self.hi = np.maximum(self.hi, points.max(axis=0))
+
+    def union(self, other):
+        """两个范围的并集"""
+        out = AxisBounds()
+        out.lo = np.minimum(self.lo, other.lo)
+        out.hi = np.maximum(self.hi, other.hi)
+        return out
+
+
+class Scene3D:
+    """3D视图的数据：标签和基站缓冲区以及坐标轴范围"""
+
+    def __init__(self):
+        self.tags = PointBuffer()
+        self.anchors = PointBuffer()
+        self._anchorBounds = AxisBounds()
+        self._tagBounds = AxisBounds()
+        self.boundsChanged = True
+
+    def setTag(self, tagId, x, y, z):
+        """更新标签位置，坐标范围只在超出时扩展"""
+        self.tags.setPoint(tagId, x, y, z)
+        if self._tagBounds.include(x, y, z):
+            self.boundsChanged = True
+
+    def extendBounds(self, x, y, z):
+        """只扩展坐标范围，不显示点"""
+        if self._tagBounds.include(x, y, z):
+            self.boundsChanged = True
+
+    def clearTags(self):
+        """清除所有标签"""
+        self.tags.clear()
+        self._tagBounds.reset()
+        self.boundsChanged = True
+
+    def setAnchor(self, row, x, y, z, visible=True):
+        """更新基站位置；只有边界上的基站移动或隐藏时才从基站缓冲区重算范围（不扫描表格）"""
+        index = self.anchors.slot(row)
+        old = self.anchors.positions[index].copy()
+        wasVisible = self.anchors.visible[index]
+        self.anchors.setPoint(row, x, y, z, visible)
+        bounds = self._anchorBounds
+        if wasVisible and bool(np.any(old == bounds.lo) or np.any(old == bounds.hi)):
+            # 原位置决定着范围，移动后范围可能缩小
+            self._recomputeAnchorBounds()
+        elif visible and bounds.include(x, y, z):
+            self.boundsChanged = True
+
+    def _recomputeAnchorBounds(self):
+        """从基站缓冲区重新计算基站范围"""
+        self._anchorBounds.reset()
+        self._anchorBounds.includeArray(self.anchors.visiblePositions())
+        self.boundsChanged = True
+
+    def resetBounds(self):
+        """重新计算全部范围"""
+        self._recomputeAnchorBounds()
+        self._tagBounds.reset()
+        self._tagBounds.includeArray(self.tags.visiblePositions())
+
+    def axisRange(self, margin=AXIS_MARGIN):
+        """返回 (最小值(3,), 最大值(3,))，两端各留margin"""
+        bounds = self._anchorBounds.union(self._tagBounds)
+        hi = np.where(np.isfinite(bounds.hi), bounds.hi, bounds.lo + 1.0)
+        return bounds.lo - margin, hi + margin
+
+    def takeBoundsChanged(self):
+        """取出并清除范围改变标志"""
+        changed = self.boundsChanged
+        self.boundsChanged = False
+        return changed
+
+
+class Graph3D(QObject):
+    """QtDataVisualization散点图，按帧把Scene3D的脏槽位写入数据代理"""
+
+    FRAME_INTERVAL = 33  # 刷新间隔（毫秒）
+
+    def __init__(self, scene, parent=None, ratio=1.0):
+        super().__init__(parent)
+        self.scene = scene
+        self.ratio = ratio
+
+        self.scatter = Q3DScatter()
+        self.scatter.activeTheme().setType(Q3DTheme.ThemeStoneMoss)
+        self.scatter.setShadowQuality(QAbstract3DGraph.ShadowQualitySoftLow)
+        self.scatter.scene().activeCamera().setCameraPreset(Q3DCamera.CameraPresetFront)
+        self.scatter.axisX().setTitle("X")
+        self.scatter.axisY().setTitle("Z")
+        self.scatter.axisZ().setTitle("Y")
+        self.container = QWidget.createWindowContainer(self.scatter)
+        self.container.setMinimumSize(200, 200)
+
+        self.tagSeries = self._createSeries(QColor(40, 120, 255), QAbstract3DSeries.MeshSphere, 0.12)
+        self.anchorSeries = self._createSeries(QColor(230, 60, 60), QAbstract3DSeries.MeshPyramid, 0.18)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    def _createSeries(self, colour, mesh, size):
+        """创建一个散点序列"""
+        series = QScatter3DSeries(QScatterDataProxy())
+        series.setMesh(mesh)
+        series.setItemSize(size)
+        series.setBaseColor(colour)
+        series.setItemLabelFormat("@xLabel, @zLabel, @yLabel")
+        self.scatter.addSeries(series)
+        return series
+
+    def widget(self):
+        """显示用的容器控件"""
+        return self.container
+
+    def setActive(self, active):
+        """显示时按帧刷新，隐藏时停止刷新"""
+        if active:
+            self.scene.tags.markAllDirty()
+            self.scene.anchors.markAllDirty()
+            self.scene.boundsChanged = True
+            self.flush()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def flush(self):
+        """把脏槽位写入数据代理，坐标轴范围改变时更新坐标轴"""
+        for buffer, series in ((self.scene.tags, self.tagSeries), (self.scene.anchors, self.anchorSeries)):
+            dirty = buffer.takeDirty()
+            if not dirty:
+                continue
+            proxy = series.dataProxy()
+            missing = len(buffer) - proxy.itemCount()
+            if missing > 0:
+                proxy.addItems([QScatterDataItem(QVector3D(HIDDEN_POS, HIDDEN_POS, HIDDEN_POS))
+                                for _ in range(missing)])
+            for index in dirty:
+                proxy.setItem(index, QScatterDataItem(self._point(buffer, index)))
+
+        if self.scene.takeBoundsChanged():
+            lo, hi = self.scene.axisRange(AXIS_MARGIN * self.ratio)
+            # QtDataVisualization的Y轴竖直向上，对应场景的z
+            self.scatter.axisX().setRange(lo[0], hi[0])
+            self.scatter.axisY().setRange(lo[2], hi[2])
+            self.scatter.axisZ().setRange(lo[1], hi[1])
+
+    @staticmethod
+    def _point(buffer, index):
+        """槽位对应的显示坐标，隐藏的点放到范围之外"""
+        x, y, z = buffer.positions[index]
+        if not buffer.visible[index] or not np.isfinite(x):
+            return QVector3D(HIDDEN_POS, HIDDEN_POS, HIDDEN_POS)
+        return QVector3D(x, z, y)
+
+
+class SoftwareView3D(QWidget):
+    """
+    纯CPU的3D投影视图：用NumPy相机矩阵整体投影所有点，按深度从远到近用QPainter绘制，
+    用于没有OpenGL的虚拟机和远程桌面
+    """
+
+    TAG_COLOUR = QColor(40, 120, 255)
+    ANCHOR_COLOUR = QColor(230, 60, 60)
+    MAX_LABELS = 100  # 点数超过该值时不绘制文字标签
+
+    def __init__(self, scene, parent=None):
+        super().__init__(parent)
+        self.scene = scene
+        self.yaw = math.radians(-30.0)  # 绕竖直轴旋转
+        self.pitch = math.radians(30.0)  # 俯视角
+        self.zoom = 1.0
+        self.ratio = 1.0
+        self._dragPos = None
+        self._sprites = {}  # 半径 -> 标签图块
+        self.setMinimumSize(200, 200)
+        self.setAutoFillBackground(False)
+
+    # ========== 投影 ==========
+
+    def cameraMatrix(self):
+        """旋转矩阵：先绕z轴转yaw，再绕x轴转pitch；相机坐标x向右、y向里、z向上"""
+        cy, sy = math.cos(self.yaw), math.sin(self.yaw)
+        cp, sp = math.cos(self.pitch), math.sin(self.pitch)
+        rz = np.array([[cy, -sy, 0.0], [sy, cy, 0.0], [0.0, 0.0, 1.0]])
+        rx = np.array([[1.0, 0.0, 0.0], [0.0, cp, -sp], [0.0, sp, cp]])
+        return rx @ rz
+
+    def project(self, points, width, height):
+        """
+        投影一组世界坐标点
+        返回 (屏幕坐标(N, 2), 深度(N,), 透视缩放(N,))，深度越大越远
+        """
+        lo, hi = self.scene.axisRange(AXIS_MARGIN * self.ratio)
+        center = (lo + hi) / 2
+        extent = max(float(np.max(hi - lo)), 1e-6)
+        cam = (np.asarray(points, dtype=float).reshape(-1, 3) - center) @ self.cameraMatrix().T
+        distance = 2.5 * extent
+        scale = np.clip(distance / (distance + cam[:, 1]), 0.05, 20.0)
+        pixels = 0.8 * min(width, height) / extent * self.zoom
+        screen = np.empty((len(cam), 2))
+        screen[:, 0] = width / 2 + pixels * scale * cam[:, 0]
+        screen[:, 1] = height / 2 - pixels * scale * cam[:, 2]
+        return screen, cam[:, 1], scale
+
+    # ========== 绘制 ==========
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.render3D(painter, self.width(), self.height())
+        painter.end()
+
+    def renderImage(self, width, height):
+        """离屏绘制到QImage，可在无显示环境中做性能测试"""
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        self.render3D(painter, width, height)
+        painter.end()
+        return image
+
+    def render3D(self, painter, width, height):
+        """绘制坐标框和所有可见点"""
+        painter.fillRect(0, 0, width, height, QColor(245, 245, 240))
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        self._drawBox(painter, width, height)
+
+        tags = self.scene.tags
+        anchors = self.scene.anchors
+        tagUsed = np.flatnonzero(tags.visible[:len(tags)])
+        ancUsed = np.flatnonzero(anchors.visible[:len(anchors)])
+        points = np.vstack([tags.positions[tagUsed], anchors.positions[ancUsed]])
+        if not len(points):
+            return
+        isAnchor = np.zeros(len(points), dtype=bool)
+        isAnchor[len(tagUsed):] = True
+        keys = [tags.keys[i] for i in tagUsed] + [anchors.keys[i] for i in ancUsed]
+
+        screen, depth, scale = self.project(points, width, height)
+        finite = np.isfinite(screen).all(axis=1)
+        order = np.flatnonzero(finite)[np.argsort(-depth[finite], kind="stable")]  # 从远到近
+        # 半径按0.5像素量化，深度顺序中相邻且半径相同的标签合并为一次drawPoints
+        radius = np.round(np.clip(6.0 * scale * self.zoom, 2.0, 30.0) * 2) / 2
+        kind = np.where(isAnchor[order], -1.0, radius[order])
+        breaks = np.flatnonzero(np.diff(kind)) + 1
+        for run in np.split(order, breaks):
+            if isAnchor[run[0]]:
+                self._drawAnchors(painter, screen[run], radius[run])
+            else:
+                self._drawTags(painter, screen[run], radius[run[0]])
+
+        if len(order) <= self.MAX_LABELS:
+            painter.setPen(QPen(QColor(40, 40, 40), 1))
+            for i in order:
+                x, y = screen[i]
+                r = radius[i]
+                label = f"A{keys[i]}" if isAnchor[i] else f"{keys[i] & 0xFFFF:04X}"
+                painter.drawText(QPointF(x + r + 2, y - r), label)
+
+    def _drawTags(self, painter, screen, r):
+        """用缓存的标签图块一次画出一组同样大小的标签"""
+        sprite = self._tagSprite(r)
+        source = QRectF(sprite.rect())
+        fragments = [QPainter.PixmapFragment.create(QPointF(x, y), source) for x, y in screen]
+        painter.drawPixmapFragments(fragments, sprite)
+
+    def _tagSprite(self, r):
+        """按半径缓存预先抗锯齿绘制的标签图块"""
+        sprite = self._sprites.get(r)
+        if sprite is None:
+            size = int(math.ceil(2 * r + 4))
+            sprite = QPixmap(size, size)
+            sprite.fill(Qt.transparent)
+            p = QPainter(sprite)
+            p.setRenderHint(QPainter.Antialiasing, True)
+            p.setPen(QPen(QColor(40, 40, 40), 1))
+            p.setBrush(QBrush(self.TAG_COLOUR))
+            p.drawEllipse(QPointF(size / 2, size / 2), r, r)
+            p.end()
+            self._sprites[r] = sprite
+        return sprite
+
+    def _drawAnchors(self, painter, screen, radius):
+        """基站画成三角形"""
+        painter.setPen(QPen(QColor(40, 40, 40), 1))
+        painter.setBrush(QBrush(self.ANCHOR_COLOUR))
+        for (x, y), r in zip(screen, radius):
+            painter.drawPolygon(QPolygonF([QPointF(x, y - r * 1.3), QPointF(x - r, y + r * 0.7),
+                                           QPointF(x + r, y + r * 0.7)]))
+
+    def _drawBox(self, painter, width, height):
+        """绘制坐标范围的立方体边框和地面网格"""
+        lo, hi = self.scene.axisRange(AXIS_MARGIN * self.ratio)
+        corners = np.array([[x, y, z] for z in (lo[2], hi[2]) for y in (lo[1], hi[1]) for x in (lo[0], hi[0])])
+        screen, _, _ = self.project(corners, width, height)
+        painter.setPen(QPen(QColor(150, 150, 150), 1))
+        for a, b in ((0, 1), (2, 3), (0, 2), (1, 3), (4, 5), (6, 7), (4, 6), (5, 7),
+                     (0, 4), (1, 5), (2, 6), (3, 7)):
+            painter.drawLine(QPointF(*screen[a]), QPointF(*screen[b]))
+
+        # 地面每米一条网格线
+        painter.setPen(QPen(QColor(210, 210, 210), 1))
+        steps = []
+        for x in np.arange(math.ceil(lo[0]), hi[0], 1.0):
+            steps.append(((x, lo[1], lo[2]), (x, hi[1], lo[2])))
+        for y in np.arange(math.ceil(lo[1]), hi[1], 1.0):
+            steps.append(((lo[0], y, lo[2]), (hi[0], y, lo[2])))
+        if steps and len(steps) <= 400:
+            ends, _, _ = self.project(np.array(steps).reshape(-1, 3), width, height)
+            for k in range(0, len(ends), 2):
+                painter.drawLine(QPointF(*ends[k]), QPointF(*ends[k + 1]))
+
+    # ========== 交互 ==========
+
+    def mousePressEvent(self, event):
+        self._dragPos = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self._dragPos is None:
+            return
+        delta = event.pos() - self._dragPos
+        self._dragPos = event.pos()
+        self.yaw += delta.x() * 0.01
+        self.pitch = min(max(self.pitch + delta.y() * 0.01, -math.pi / 2), math.pi / 2)
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._dragPos = None
+
+    def wheelEvent(self, event):
+        self.zoom = min(max(self.zoom * (1.1 if event.angleDelta().y() > 0 else 1 / 1.1), 0.1), 20.0)
+        self.update()
+
+
+class SoftwareGraph3D(QObject):
+    """软件渲染的3D视图，接口与Graph3D相同"""
+
+    FRAME_INTERVAL = 33  # 刷新间隔（毫秒）
+
+    def __init__(self, scene, parent=None, ratio=1.0):
+        super().__init__(parent)
+        self.scene = scene
+        self.view = SoftwareView3D(scene)
+        self.view.ratio = ratio
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+    def widget(self):
+        """显示用的控件"""
+        return self.view
+
+    def setActive(self, active):
+        """显示时按帧刷新，隐藏时停止刷新"""
+        if active:
+            self.scene.boundsChanged = True
+            self.flush()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def flush(self):
+        """有点或坐标范围改变时重绘，每帧整体投影一次"""
+        changed = bool(self.scene.tags.takeDirty()) | bool(self.scene.anchors.takeDirty())
+        if self.scene.takeBoundsChanged() or changed:
+            self.view.update()
+
+
+def openGLAvailable():
+    """当前平台能否创建OpenGL上下文"""
+    if QGuiApplication.platformName() in ("offscreen", "minimal", "vnc"):
+        return False
+    context = QOpenGLContext()
+    return context.create()
+
+
+def createGraph3D(scene, parent=None, ratio=1.0, backend=None):
+    """
+    按VIEW3D_BACKEND创建3D视图：auto时有QtDataVisualization且能创建OpenGL上下文用Graph3D，
+    否则使用软件渲染
+    """
+    backend = backend or VIEW3D_BACKEND
+    if backend == VIEW3D_DATAVIS or (backend == VIEW3D_AUTO and HAS_DATAVIS and openGLAvailable()):
+        if HAS_DATAVIS:
+            return Graph3D(scene, parent, ratio)
+        print("Error creating 3D view: PyQt5.QtDataVisualization is not installed, using software renderer")
+    return SoftwareGraph3D(scene, parent, ratio)
+
+
+if __name__ == '__main__':
+    # 软件渲染性能测试，可在无显示环境运行：QT_QPA_PLATFORM=offscreen python view3d.py [标签数量]
+    import sys
+    import time
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rng = np.random.default_rng(0)
+    scene = Scene3D()
+    for row, (x, y, z) in enumerate([(0, 0, 2.5), (30, 0, 2.5), (30, 20, 6.0), (0, 20, 6.0)]):
+        scene.setAnchor(row, x, y, z)
+    view = SoftwareView3D(scene)
+
+    frames = 50
+    start = time.perf_counter()
+    for frame in range(frames):
+        for tagId, p in enumerate(rng.uniform((0, 0, 0), (30, 20, 8), (count, 3))):
+            scene.setTag(tagId, *p)
+        view.yaw += 0.02
+        view.renderImage(1280, 720)
+    elapsed = time.perf_counter() - start
+    print(f"{count} tags: {elapsed / frames * 1000:.1f} ms/frame")
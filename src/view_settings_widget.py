@@ -5,6 +5,7 @@ from PyQt5.QtNetwork import QUdpSocket
 from ui_py.ui_view_settings_widget import Ui_ViewSettingsWidget
 import sys
 from compile import compile_ui_file
+from view3d import Scene3D, createGraph3D
 
 # 编译UI文件
 compile_ui_file('view_settings_widget')
@@ -27,6 +28,7 @@ class ViewSettingsWidget(QWidget, Ui_ViewSettingsWidget):
     # 信号定义
     saveViewSettings = pyqtSignal()
     checktagwarn = pyqtSignal(int)
+    view3DToggled = pyqtSignal(bool)  # 3D视图显示/隐藏
     
     # 类静态成员（单例模式）
     viewsettingswidget = None
@@ -73,10 +75,9 @@ class ViewSettingsWidget(QWidget, Ui_ViewSettingsWidget):
         self.ratio = 1.0
         self.inited3d = False
         
-        # 3D图形对象（需要安装 PyQtDataVisualization）
-        self.scatter = None
-        self.series = None
-        self.ancDataArray = None
+        # 3D数据缓冲区和图形对象（图形需要安装 PyQtDataVisualization）
+        self.scene3d = Scene3D()
+        self.graph3d = None
         self.container = None
         self.seriesPoint = []  # MAX_NUM_TAGS
         self.m_labelPoint = []  # MAX_NUM_TAGS
@@ -118,7 +119,7 @@ class ViewSettingsWidget(QWidget, Ui_ViewSettingsWidget):
         # self.ui.connect_pb.clicked.connect(self.connectButtonClicked)
         # self.ui.floorplanOpen_pb.clicked.connect(self.floorplanOpenClicked)
         # ... 更多信号连接
-        pass
+        self.ui.showNavigationMode_2.toggled.connect(self.showView3DClicked)
     
     def _initializeUI(self):
         """初始化UI状态"""
@@ -475,93 +476,55 @@ class ViewSettingsWidget(QWidget, Ui_ViewSettingsWidget):
     # ========== 3D视图相关 ==========
     
     def initGraph3D(self):
-        """初始化3D图形"""
+        """初始化3D图形，没有QtDataVisualization或OpenGL时使用软件渲染"""
         if self.inited3d:
-            return
+            return True
         
-        self.inited3d = True
         # self.ratio = myGraphicsWidget._tagSize / 0.3
         
-        # 初始化范围
-        self.maxX = float('-inf')
-        self.maxY = float('-inf')
-        self.maxZ = float('-inf')
-        self.minX = 0
-        self.minY = 0
-        self.minZ = 0
-        
-        # 创建3D散点图（需要 PyQtDataVisualization）
-        # from PyQt5.QtDataVisualization import Q3DScatter, QScatter3DSeries
-        # 
-        # self.scatter = Q3DScatter()
-        # self.container = QWidget.createWindowContainer(self.scatter)
-        # # 设置容器大小
-        # # ... 更多3D设置
-        # 
-        # self.scatter.activeTheme().setType(Q3DTheme.ThemeStoneMoss)
-        # self.scatter.setShadowQuality(QAbstract3DGraph.ShadowQualitySoftLow)
-        # # ... 更多配置
+        # 标签和基站各一块持久的缓冲区，按帧只处理改变的点
+        try:
+            self.graph3d = createGraph3D(self.scene3d, self, self.ratio)
+            self.container = self.graph3d.widget()
+        except Exception as e:
+            print(f"Error creating 3D view: {e}")
+            self.graph3d = None
+            self.container = None
+            return False
         
+        self.inited3d = True
         self.updateAxisRange(False)
+        return True
+    
+    def showView3DClicked(self, checked):
+        """3D视图复选框点击"""
+        if checked and not self.initGraph3D():
+            self.ui.showNavigationMode_2.setChecked(False)
+            return
+        if self.graph3d:
+            self.graph3d.setActive(checked)
+        self.view3DToggled.emit(checked)
     
     def updateAxisRange(self, tag=False):
-        """更新坐标轴范围"""
-        if not tag:
-            # 重置最大最小值
-            self.maxX = float('-inf')
-            self.maxY = float('-inf')
-            self.maxZ = float('-inf')
-            self.minX = 0
-            self.minY = 0
-            self.minZ = 0
-        
-        # 遍历锚点表更新范围
-        # for i in range(myGraphicsWidget.ui.anchorTable.rowCount()):
-        #     if self.checkAnchorStatus(i):
-        #         x = float(myGraphicsWidget.ui.anchorTable.item(i, 3).text())
-        #         y = float(myGraphicsWidget.ui.anchorTable.item(i, 5).text())
-        #         z = float(myGraphicsWidget.ui.anchorTable.item(i, 4).text())
-        #         
-        #         self.maxX = max(self.maxX, x)
-        #         self.maxY = max(self.maxY, y)
-        #         self.maxZ = max(self.maxZ, z)
-        #         self.minX = min(self.minX, x)
-        #         self.minY = min(self.minY, y)
-        #         self.minZ = min(self.minZ, z)
-        
+        """更新坐标轴范围，由缓冲区计算，不扫描基站表格"""
         if not tag:
-            self.maxX += 0.5 * self.ratio
-            self.maxY += 0.5 * self.ratio
-            self.maxZ += 0.5 * self.ratio
-            self.minX -= 0.5 * self.ratio
-            self.minY -= 0.5 * self.ratio
-            self.minZ -= 0.5 * self.ratio
-        
-        # 更新scatter的坐标轴范围
-        # if self.scatter:
-        #     self.scatter.axisX().setRange(self.minX, self.maxX)
-        #     self.scatter.axisY().setRange(self.minY, self.maxY)
-        #     self.scatter.axisZ().setRange(self.minZ, self.maxZ)
+            self.scene3d.resetBounds()
+        lo, hi = self.scene3d.axisRange(0.5 * self.ratio)
+        self.minX, self.minY, self.minZ = lo[0], lo[2], lo[1]
+        self.maxX, self.maxY, self.maxZ = hi[0], hi[2], hi[1]
+        self.scene3d.boundsChanged = True
     
     def updateAxisRangeWithTag(self, x, y, z):
-        """使用标签位置更新坐标轴范围"""
-        self.maxX = max(self.maxX, x)
-        self.maxY = max(self.maxY, z)
-        self.maxZ = max(self.maxZ, y)
-        self.minX = min(self.minX, x)
-        self.minY = min(self.minY, z)
-        self.minZ = min(self.minZ, y)
-        
-        self.updateAxisRange(True)
+        """使用标签位置增量扩展坐标轴范围"""
+        self.scene3d.extendBounds(x, y, z)
     
     def tag3DPos(self, tagId, x, y, z):
-        """标签3D位置更新"""
-        # 在3D视图中显示标签位置
-        # if self.ui.showNavigationMode_2.checkState() == Qt.Checked:
-        #     # 更新3D散点图中的标签位置
-        #     # ... 实现3D位置更新逻辑
-        #     self.updateAxisRangeWithTag(x, y, z)
-        pass
+        """标签3D位置更新，只改写缓冲区中的一个点，由3D图形按帧刷新"""
+        self.scene3d.setTag(tagId, x, y, z)
+    
+    def clearTags3D(self):
+        """清除3D视图中的标签"""
+        self.scene3d.clearTags()
     
     def anchorTableChanged(self, r, c):
         """锚点表改变"""
@@ -597,8 +560,14 @@ class ViewSettingsWidget(QWidget, Ui_ViewSettingsWidget):
         pass
     
     def updateAnchorList3D(self, ridx, status, update, x, y, z):
-        """更新3D锚点列表"""
-        pass
+        """更新3D锚点列表，只改写该基站在缓冲区中的点"""
+        self.scene3d.setAnchor(ridx, x, y, z, bool(status))
+    
+    def applyAnchorChanges(self, changes):
+        """根据基站变化集合只更新改变的3D锚点"""
+        for row in changes.rows():
+            station = changes.stations[row]
+            self.updateAnchorList3D(row, station.status, True, station.x, station.y, station.z)
     
     def checkAnchorStatus(self, r):
         """检查锚点状态"""